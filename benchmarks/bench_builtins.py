@@ -0,0 +1,60 @@
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+sys.setrecursionlimit(100000)
+
+from evaluator.nodevisitor import evaluate  # noqa: E402
+from lexer.lexer import Lexer  # noqa: E402
+from object.environment import Environment  # noqa: E402
+from object.object import Array, new_integer  # noqa: E402
+from parser.parser import Parser  # noqa: E402
+
+MONKEY_MAP = """
+let monkey_map = fn(arr, f) {
+  let iter = fn(arr, accumulated) {
+    if (len(arr) == 0) { accumulated }
+    else { iter(rest(arr), push(accumulated, f(first(arr)))) }
+  };
+  iter(arr, [])
+};
+"""
+
+
+def measure(source, env=None):
+    program = Parser(Lexer(source)).parse_program()
+    start = time.perf_counter()
+    evaluate(program, Environment() if env is None else env)
+    return time.perf_counter() - start
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    small = min(size, 5000)
+
+    items = f"to_array(range({small}))"
+    before = measure(
+        f"{MONKEY_MAP} len(monkey_map({items}, fn(x) {{ x * 2 }}))"
+    )
+    after = measure(f"len(map({items}, fn(x) {{ x * 2 }}))")
+    print(
+        f"map      {small} elements: "
+        f"monkey {before:.3f}s, native {after:.3f}s, "
+        f"speedup {before / after:.1f}x"
+    )
+
+    values = [new_integer(random.randrange(size)) for _ in range(size)]
+    for name, call, count in [
+        ("sort", "sort(xs)", size),
+        ("sort key", "sort(xs, fn(x) { -x })", size),
+        ("sort cmp", "sort(xs, fn(a, b) { a > b })", size // 10),
+    ]:
+        env = Environment()
+        env.set("xs", Array(values[:count]))
+        print(f"{name:8} {count} elements: {measure(call, env):.2f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+
+from evaluator.nodevisitor import evaluate  # noqa: E402
+from evaluator.unboxed import evaluate as evaluate_unboxed  # noqa: E402
+from lexer.lexer import Lexer  # noqa: E402
+from object.environment import Environment  # noqa: E402
+from object.object import Error  # noqa: E402
+from parser.parser import Parser  # noqa: E402
+
+WHILE_LOOP = """
+let total = fn(a) {
+  let s = 0;
+  let i = 0;
+  while (i < len(a)) {
+    let s = s + a[i];
+    let i = i + 1;
+  };
+  s
+};
+total(xs)
+"""
+
+FOR_LOOP = """
+let total = fn(a) {
+  let s = 0;
+  for (x in a) {
+    let s = s + x;
+  };
+  s
+};
+total(xs)
+"""
+
+ENGINES = {
+    "eval": evaluate,
+    "unboxed": evaluate_unboxed,
+}
+
+
+def measure(engine, source, size):
+    env = Environment()
+    setup = f"let xs = to_array(range({size}));"
+    engine(Parser(Lexer(setup)).parse_program(), env)
+
+    program = Parser(Lexer(source)).parse_program()
+    start = time.perf_counter()
+    result = engine(program, env)
+    elapsed = time.perf_counter() - start
+    if isinstance(result, Error):
+        raise RuntimeError(result.message)
+    return elapsed
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+
+    for name, engine in ENGINES.items():
+        before = measure(engine, WHILE_LOOP, size)
+        after = measure(engine, FOR_LOOP, size)
+        print(
+            f"{name:8} {size} elements: while {before:.3f}s, "
+            f"for {after:.3f}s, speedup {before / after:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+
+from object.object import Integer, String  # noqa: E402
+
+
+class LegacyHashKey:
+    def __init__(self, obj_type, value):
+        self.type = obj_type
+        self.value = value
+
+    def __eq__(self, other):
+        if isinstance(other, LegacyHashKey):
+            if other.type == self.type and other.value == self.value:
+                return True
+
+        return False
+
+    def __hash__(self):
+        return hash(f"{self.type}-{self.value}")
+
+
+def legacy_key(obj):
+    return LegacyHashKey(obj.type(), hash(obj.value))
+
+
+def current_key(obj):
+    return obj.hash_key()
+
+
+def measure(objects, make_key):
+    table = {make_key(obj): obj for obj in objects}
+
+    start = time.perf_counter()
+    for obj in objects:
+        table[make_key(obj)]
+    return len(objects) / (time.perf_counter() - start)
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    tables = {
+        "integer": [Integer(i) for i in range(size)],
+        "string": [String(f"key-{i}") for i in range(size)],
+    }
+
+    for name, objects in tables.items():
+        before = measure(objects, legacy_key)
+        after = measure(objects, current_key)
+        print(
+            f"{name:8} {size} keys: "
+            f"before {before / 1e6:.2f}M lookups/s, "
+            f"after {after / 1e6:.2f}M lookups/s, "
+            f"speedup {after / before:.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+
+from evaluator.nodevisitor import evaluate  # noqa: E402
+from lexer.lexer import Lexer  # noqa: E402
+from object.environment import Environment  # noqa: E402
+from parser.parser import Parser  # noqa: E402
+
+
+def measure(source, env):
+    program = Parser(Lexer(source)).parse_program()
+    start = time.perf_counter()
+    result = evaluate(program, env)
+    return time.perf_counter() - start, result
+
+
+def build(source):
+    env = Environment()
+    tracemalloc.start()
+    elapsed, _ = measure(source, env)
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return env, elapsed, size
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000_000
+
+    boxed, boxed_build, boxed_size = build(
+        f"let xs = to_array(range({size}));"
+    )
+    typed, typed_build, typed_size = build(
+        f"let xs = int_array(range({size}));"
+    )
+    print(
+        f"build {size} elements: "
+        f"ARRAY {boxed_build:.2f}s {boxed_size / size:.1f} bytes/element, "
+        f"INT_ARRAY {typed_build:.2f}s {typed_size / size:.1f} bytes/element"
+    )
+
+    for name, env, source in [
+        ("sum", boxed, "sum(xs)"),
+        ("reduce", boxed, "reduce(xs, 0, fn(a, x) { a + x })"),
+        ("vsum", typed, "vsum(xs)"),
+        ("vdot", typed, "vdot(xs, xs)"),
+        ("xs + xs", typed, "xs + xs"),
+        ("vfilter_gt", typed, f"vfilter_gt(xs, {size // 2})"),
+    ]:
+        elapsed, _ = measure(source, env)
+        print(f"{name:10} {elapsed:.3f}s {size / elapsed / 1e6:.1f}M/s")
+
+
+if __name__ == "__main__":
+    main()
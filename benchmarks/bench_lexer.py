@@ -0,0 +1,58 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+
+from lexer.lexer import CharLexer, Lexer  # noqa: E402
+from tok.tok import Token  # noqa: E402
+
+CHUNK = """
+let fib_{n} = fn(n) {{
+  if (n < 2) {{ n }} else {{ fib_{n}(n - 1) + fib_{n}(n - 2) }}
+}};
+let table_{n} = {{"name": "entry {n}", "values": [{n}, {n} * 2, 3]}};
+let total_{n} = 0;
+for (x in table_{n}["values"]) {{
+  let total_{n} = total_{n} + x;
+}};
+if (total_{n} != fib_{n}(10)) {{ puts(total_{n}) }};
+"""
+
+
+def generate(size):
+    parts = []
+    length = 0
+    n = 0
+    while length < size:
+        part = CHUNK.format(n=n)
+        parts.append(part)
+        length += len(part)
+        n += 1
+    return "".join(parts)
+
+
+def measure(lexer_class, source):
+    lexer = lexer_class(source)
+    count = 0
+    start = time.perf_counter()
+    while lexer.next_token().token_type != Token.EOF:
+        count += 1
+    return time.perf_counter() - start, count
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1e6) if len(sys.argv) > 1 else 4_000_000
+    source = generate(size)
+    megabytes = len(source.encode()) / 1e6
+
+    for name, lexer_class in [("char", CharLexer), ("regex", Lexer)]:
+        elapsed, count = measure(lexer_class, source)
+        print(
+            f"{name:5} {megabytes:.1f} MB, {count} tokens: {elapsed:.2f}s "
+            f"{megabytes / elapsed:.2f} MB/s"
+        )
+
+
+if __name__ == "__main__":
+    main()
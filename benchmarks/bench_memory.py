@@ -0,0 +1,80 @@
+import os
+import sys
+
+ROOT = sys.argv[1] if len(sys.argv) > 1 else os.path.join(
+    os.path.dirname(__file__), "..", "monkey"
+)
+sys.path.insert(0, ROOT)
+
+from evaluator.nodevisitor import evaluate  # noqa: E402
+from lexer.lexer import Lexer  # noqa: E402
+from object import object as runtime  # noqa: E402
+from object.environment import Environment  # noqa: E402
+from parser.parser import Parser  # noqa: E402
+
+ITERATIONS = 10000
+
+LOOP = f"""
+let i = 0;
+let total = 0;
+while (i < {ITERATIONS}) {{
+  let total = total + i * 2 - 1;
+  let i = i + 1;
+}};
+total
+"""
+
+
+def footprint(obj):
+    size = sys.getsizeof(obj)
+    if hasattr(obj, "__dict__"):
+        size += sys.getsizeof(obj.__dict__)
+    return size
+
+
+def count_allocations(source):
+    counts = {}
+    classes = [
+        cls
+        for cls in vars(runtime).values()
+        if isinstance(cls, type) and cls.__module__ == runtime.__name__
+    ]
+
+    def counting_new(cls, *args, **kwargs):
+        counts[cls.__name__] = counts.get(cls.__name__, 0) + 1
+        return object.__new__(cls)
+
+    program = Parser(Lexer(source)).parse_program()
+    for cls in classes:
+        cls.__new__ = counting_new
+    try:
+        evaluate(program, Environment())
+    finally:
+        for cls in classes:
+            del cls.__new__
+    return counts
+
+
+def main():
+    print(f"runtime: {os.path.abspath(ROOT)}")
+
+    samples = {
+        "Integer": runtime.Integer(123456),
+        "String": runtime.String("hello"),
+        "Array": runtime.Array([]),
+        "ReturnValue": runtime.ReturnValue(runtime.NULL),
+        "HashPair": runtime.HashPair(runtime.NULL, runtime.NULL),
+        "HashKey": runtime.String("hello").hash_key(),
+    }
+    for name, obj in samples.items():
+        print(f"{name:12} {footprint(obj):4} bytes")
+
+    counts = count_allocations(LOOP)
+    total = sum(counts.values())
+    print(f"loop: {total / ITERATIONS:.2f} runtime objects per iteration")
+    for name, count in sorted(counts.items()):
+        print(f"  {name:12} {count / ITERATIONS:.2f}")
+
+
+if __name__ == "__main__":
+    main()
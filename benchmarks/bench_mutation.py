@@ -0,0 +1,76 @@
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+
+from evaluator.nodevisitor import evaluate  # noqa: E402
+from lexer.lexer import Lexer  # noqa: E402
+from object.environment import Environment  # noqa: E402
+from object.object import Error  # noqa: E402
+from parser.parser import Parser  # noqa: E402
+
+COPYING = """
+let dp = to_array(range({size}));
+let i = 2;
+while (i < {size}) {{
+  let value = (dp[i - 1] + dp[i - 2]) - dp[i - 1];
+  let dp = to_array(map(range({size}), fn(j) {{
+    if (j == i) {{ value }} else {{ dp[j] }}
+  }}));
+  let i = i + 1;
+}};
+"""
+
+IN_PLACE = """
+let dp = to_array(range({size}));
+let i = 2;
+while (i < {size}) {{
+  dp[i] = (dp[i - 1] + dp[i - 2]) - dp[i - 1];
+  let i = i + 1;
+}};
+"""
+
+HISTOGRAM = """
+let counts = {{}};
+let i = 0;
+let key = 0;
+while (i < {size}) {{
+  let c = counts[key];
+  if (c) {{ counts[key] = c + 1 }} else {{ counts[key] = 1 }};
+  let key = if (key == 99) {{ 0 }} else {{ key + 1 }};
+  let i = i + 1;
+}};
+"""
+
+
+def measure(source):
+    program = Parser(Lexer(source)).parse_program()
+    start = time.perf_counter()
+    result = evaluate(program, Environment())
+    elapsed = time.perf_counter() - start
+    if isinstance(result, Error):
+        raise RuntimeError(result.message)
+    return elapsed
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or [1000, 10_000, 100_000]
+
+    for name, template in [
+        ("copying", COPYING),
+        ("in place", IN_PLACE),
+        ("histogram", HISTOGRAM),
+    ]:
+        for size in sizes:
+            if template is COPYING and size > 1000:
+                continue
+            elapsed = measure(template.format(size=size))
+            print(
+                f"{name:9} {size:7} updates: {elapsed:.3f}s "
+                f"{elapsed / size * 1e6:.2f}us/update"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+import mmap
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "monkey"))
+
+from bench_lexer import generate  # noqa: E402
+from lexer.lexer import Lexer, StreamLexer  # noqa: E402
+from tok.tok import Token  # noqa: E402
+
+
+def read_whole(path):
+    with open(path) as f:
+        return Lexer(f.read())
+
+
+def stream_file(path):
+    return StreamLexer(open(path))
+
+
+def stream_mmap(path):
+    with open(path, "rb") as f:
+        return StreamLexer(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+
+def measure(make_lexer, path):
+    tracemalloc.start()
+    start = time.perf_counter()
+    lexer = make_lexer(path)
+    count = 0
+    while lexer.next_token().token_type != Token.EOF:
+        count += 1
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak, count
+
+
+def main():
+    size = int(float(sys.argv[1]) * 1e6) if len(sys.argv) > 1 else 4_000_000
+
+    with tempfile.NamedTemporaryFile("w", suffix=".mk", delete=False) as f:
+        f.write(generate(size))
+    try:
+        megabytes = os.path.getsize(f.name) / 1e6
+        for name, make_lexer in [
+            ("read", read_whole),
+            ("file", stream_file),
+            ("mmap", stream_mmap),
+        ]:
+            elapsed, peak, count = measure(make_lexer, f.name)
+            print(
+                f"{name:4} {megabytes:.1f} MB, {count} tokens: "
+                f"{elapsed:.2f}s peak {peak / 1e6:.2f} MB"
+            )
+    finally:
+        os.unlink(f.name)
+
+
+if __name__ == "__main__":
+    main()
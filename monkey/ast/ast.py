@@ -36,6 +36,11 @@ class Identifier(Expression):
         self.token = token
         self.value = identifier
 
+        self.scope = None
+        self.depth = 0
+        self.slot = None
+        self.fallbacks = ()
+
     def token_literal(self):
         return self.token.literal
 
@@ -49,6 +54,9 @@ class LetStatement(Statement):
         self.name = None
         self.value = None
 
+        self.scope = None
+        self.slot = None
+
     def token_literal(self):
         return self.token.literal
 
@@ -63,6 +71,8 @@ class ReturnStatement(Statement):
     def __init__(self, token):
         self.token = token
         self.return_value = None
+        self.tail = False
+        self.unwinds = True
 
     def token_literal(self):
         return self.token.literal
@@ -130,6 +140,10 @@ class InfixExpression(Expression):
         self.operator = operator
         self.right = None
 
+        self.quick = None
+        self.observed = None
+        self.deopts = 0
+
     def token_literal(self):
         return self.token.literal
 
@@ -155,6 +169,14 @@ class FunctionLiteral(Expression):
         self.params = []
         self.body = None
 
+        self.frame_size = None
+        self.has_closures = False
+        self.name = None
+        self.compiled = None
+        self.pure = False
+        self.memoize = False
+        self.builtins = ()
+
     def __str__(self):
         p = ", ".join([str(x) for x in self.params])
         return f"{self.token_literal()}({p}){str(self.body)}"
@@ -186,6 +208,9 @@ class WhileExpression(Expression):
         self.condition = None
         self.consequence = None
 
+        self.iterations = 0
+        self.compiled = None
+
     def __str__(self):
         return f"while {self.condition} {{ {self.consequence} }}"
 
@@ -193,12 +218,31 @@ class WhileExpression(Expression):
         return self.token.literal
 
 
+class ForExpression(Expression):
+    def __init__(self, token):
+        self.token = token
+        self.name = None
+        self.iterable = None
+        self.body = None
+
+        self.scope = None
+        self.slot = None
+
+    def __str__(self):
+        return f"for ({self.name} in {self.iterable}) {{ {self.body} }}"
+
+    def token_literal(self):
+        return self.token.literal
+
+
 class CallExpression(Expression):
     def __init__(self, token, function):
         self.token = token
         self.function = function
         self.args = []
 
+        self.tail = False
+
     def __str__(self):
         args = ", ".join(str(arg) for arg in self.args)
         return f"{self.function}({args})"
@@ -238,6 +282,10 @@ class IndexExpression(Expression):
         self.left = left
         self.index = None
 
+        self.quick = None
+        self.observed = None
+        self.deopts = 0
+
     def token_literal(self):
         return self.token.literal
 
@@ -245,6 +293,20 @@ class IndexExpression(Expression):
         return f"({str(self.left)}[{str(self.index)}])"
 
 
+class IndexAssignment(Expression):
+    def __init__(self, token, left, index):
+        self.token = token
+        self.left = left
+        self.index = index
+        self.value = None
+
+    def token_literal(self):
+        return self.token.literal
+
+    def __str__(self):
+        return f"{str(self.left)}[{str(self.index)}] = {str(self.value)}"
+
+
 class HashLiteral(Expression):
     def __init__(self, token):
         self.token = token
@@ -256,3 +318,51 @@ class HashLiteral(Expression):
     def __str__(self):
         pairs = [f"{str(k)}: {str(v)}" for k, v in self.pairs.items()]
         return "{" + ", ".join(pairs) + "}"
+
+
+def iter_child_nodes(node):
+    if isinstance(node, (Program, BlockStatement)):
+        yield from node.statements
+    elif isinstance(node, LetStatement):
+        yield node.name
+        yield node.value
+    elif isinstance(node, ReturnStatement):
+        yield node.return_value
+    elif isinstance(node, ExpressionStatement):
+        yield node.expression
+    elif isinstance(node, PrefixExpression):
+        yield node.right
+    elif isinstance(node, InfixExpression):
+        yield node.left
+        yield node.right
+    elif isinstance(node, FunctionLiteral):
+        yield from node.params
+        yield node.body
+    elif isinstance(node, IfExpression):
+        yield node.condition
+        yield node.consequence
+        if node.alternative is not None:
+            yield node.alternative
+    elif isinstance(node, WhileExpression):
+        yield node.condition
+        yield node.consequence
+    elif isinstance(node, ForExpression):
+        yield node.name
+        yield node.iterable
+        yield node.body
+    elif isinstance(node, CallExpression):
+        yield node.function
+        yield from node.args
+    elif isinstance(node, ArrayLiteral):
+        yield from node.elements
+    elif isinstance(node, IndexExpression):
+        yield node.left
+        yield node.index
+    elif isinstance(node, IndexAssignment):
+        yield node.left
+        yield node.index
+        yield node.value
+    elif isinstance(node, HashLiteral):
+        for key, value in node.pairs.items():
+            yield key
+            yield value
@@ -0,0 +1,123 @@
+from enum import IntEnum
+
+
+class Opcode(IntEnum):
+    CONSTANT = 0
+    POP = 1
+
+    ADD = 2
+    SUB = 3
+    MUL = 4
+    DIV = 5
+
+    EQUAL = 6
+    NOT_EQUAL = 7
+    GREATER_THAN = 8
+    LESS_THAN = 9
+
+    MINUS = 10
+    BANG = 11
+
+    TRUE = 12
+    FALSE = 13
+    NULL = 14
+    NONE = 15
+
+    JUMP = 16
+    JUMP_NOT_TRUTHY = 17
+
+    GET_GLOBAL = 18
+    SET_GLOBAL = 19
+    GET_LOCAL = 20
+    SET_LOCAL = 21
+    GET_DEREF = 22
+    SET_DEREF = 23
+    GET_FREE = 24
+    LOAD_CELL = 25
+    LOAD_FREE_CELL = 26
+
+    ARRAY = 27
+    HASH = 28
+    INDEX = 29
+
+    CALL = 30
+    RETURN_VALUE = 31
+    CLOSURE = 32
+    SET_INDEX = 33
+    GET_ITER = 34
+    FOR_ITER = 35
+
+
+class Definition:
+    def __init__(self, name, operand_count):
+        self.name = name
+        self.operand_count = operand_count
+
+
+DEFINITIONS = {
+    Opcode.CONSTANT: Definition("OpConstant", 1),
+    Opcode.POP: Definition("OpPop", 0),
+    Opcode.ADD: Definition("OpAdd", 0),
+    Opcode.SUB: Definition("OpSub", 0),
+    Opcode.MUL: Definition("OpMul", 0),
+    Opcode.DIV: Definition("OpDiv", 0),
+    Opcode.EQUAL: Definition("OpEqual", 0),
+    Opcode.NOT_EQUAL: Definition("OpNotEqual", 0),
+    Opcode.GREATER_THAN: Definition("OpGreaterThan", 0),
+    Opcode.LESS_THAN: Definition("OpLessThan", 0),
+    Opcode.MINUS: Definition("OpMinus", 0),
+    Opcode.BANG: Definition("OpBang", 0),
+    Opcode.TRUE: Definition("OpTrue", 0),
+    Opcode.FALSE: Definition("OpFalse", 0),
+    Opcode.NULL: Definition("OpNull", 0),
+    Opcode.NONE: Definition("OpNone", 0),
+    Opcode.JUMP: Definition("OpJump", 1),
+    Opcode.JUMP_NOT_TRUTHY: Definition("OpJumpNotTruthy", 1),
+    Opcode.GET_GLOBAL: Definition("OpGetGlobal", 1),
+    Opcode.SET_GLOBAL: Definition("OpSetGlobal", 1),
+    Opcode.GET_LOCAL: Definition("OpGetLocal", 1),
+    Opcode.SET_LOCAL: Definition("OpSetLocal", 1),
+    Opcode.GET_DEREF: Definition("OpGetDeref", 1),
+    Opcode.SET_DEREF: Definition("OpSetDeref", 1),
+    Opcode.GET_FREE: Definition("OpGetFree", 1),
+    Opcode.LOAD_CELL: Definition("OpLoadCell", 1),
+    Opcode.LOAD_FREE_CELL: Definition("OpLoadFreeCell", 1),
+    Opcode.ARRAY: Definition("OpArray", 1),
+    Opcode.HASH: Definition("OpHash", 1),
+    Opcode.INDEX: Definition("OpIndex", 0),
+    Opcode.CALL: Definition("OpCall", 1),
+    Opcode.RETURN_VALUE: Definition("OpReturnValue", 0),
+    Opcode.CLOSURE: Definition("OpClosure", 2),
+    Opcode.SET_INDEX: Definition("OpSetIndex", 0),
+    Opcode.GET_ITER: Definition("OpGetIter", 0),
+    Opcode.FOR_ITER: Definition("OpForIter", 1),
+}
+
+
+def lookup(op):
+    definition = DEFINITIONS.get(op)
+    if definition is None:
+        raise KeyError(f"opcode {op} undefined")
+    return definition
+
+
+def make(op, *operands):
+    definition = lookup(op)
+    if len(operands) != definition.operand_count:
+        raise ValueError(
+            f"{definition.name} takes {definition.operand_count} operands, "
+            f"got {len(operands)}"
+        )
+    return [int(op), *operands]
+
+
+def format_instructions(instructions):
+    lines = []
+    ip = 0
+    while ip < len(instructions):
+        definition = lookup(instructions[ip])
+        operands = instructions[ip + 1 : ip + 1 + definition.operand_count]
+        fmt = " ".join([definition.name] + [str(o) for o in operands])
+        lines.append(f"{ip:04d} {fmt}")
+        ip += 1 + definition.operand_count
+    return "\n".join(lines)
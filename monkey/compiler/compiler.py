@@ -0,0 +1,324 @@
+from ast.ast import (
+    ExpressionStatement,
+    ForExpression,
+    FunctionLiteral,
+    Identifier,
+    LetStatement,
+    iter_child_nodes,
+)
+from object.object import CompiledFunction, Integer, String
+from .code import Opcode, make
+from .symbol_table import Scope, SymbolTable
+
+INFIX_OPCODES = {
+    "+": Opcode.ADD,
+    "-": Opcode.SUB,
+    "*": Opcode.MUL,
+    "/": Opcode.DIV,
+    "==": Opcode.EQUAL,
+    "!=": Opcode.NOT_EQUAL,
+    ">": Opcode.GREATER_THAN,
+    "<": Opcode.LESS_THAN,
+}
+
+PREFIX_OPCODES = {
+    "-": Opcode.MINUS,
+    "!": Opcode.BANG,
+}
+
+
+class Bytecode:
+    def __init__(self, main, constants):
+        self.main = main
+        self.constants = constants
+
+    @property
+    def instructions(self):
+        return self.main.instructions
+
+
+class Compiler:
+    def __init__(self, symbol_table=None, constants=None):
+        self.symbol_table = (
+            SymbolTable() if symbol_table is None else symbol_table
+        )
+        self.constants = [] if constants is None else constants
+
+        self.scopes = {}
+        self.scope = None
+        self.instructions = []
+        self.loops = []
+        self.operands = 0
+
+    def compile(self, program):
+        self.analyze(program, None)
+        self.compile_statements(program.statements)
+        self.emit(Opcode.RETURN_VALUE)
+
+    def bytecode(self):
+        return Bytecode(CompiledFunction(self.instructions), self.constants)
+
+    # Scope analysis: every FunctionLiteral gets a Scope with its params
+    # and let-bound names hoisted into slots, and every identifier is
+    # resolved so that captured locals are known before code is emitted.
+
+    def analyze(self, node, scope):
+        if isinstance(node, FunctionLiteral):
+            self.analyze_function(node, scope)
+        elif isinstance(node, LetStatement):
+            self.analyze(node.value, scope)
+            if scope is None:
+                self.symbol_table.define(node.name.value)
+        elif isinstance(node, ForExpression):
+            self.analyze(node.iterable, scope)
+            if scope is None:
+                self.symbol_table.define(node.name.value)
+            self.analyze(node.body, scope)
+        elif isinstance(node, Identifier):
+            self.resolve(node.value, scope)
+        else:
+            for child in iter_child_nodes(node):
+                self.analyze(child, scope)
+
+    def analyze_function(self, node, parent):
+        scope = Scope(parent)
+        for param in node.params:
+            scope.define_param(param.value)
+        self.hoist(node.body, scope)
+
+        self.scopes[node] = scope
+        self.analyze(node.body, scope)
+
+    def hoist(self, node, scope):
+        if isinstance(node, FunctionLiteral):
+            return
+        if isinstance(node, LetStatement):
+            scope.define(node.name.value)
+            self.hoist(node.value, scope)
+            return
+        if isinstance(node, ForExpression):
+            scope.define(node.name.value)
+        for child in iter_child_nodes(node):
+            self.hoist(child, scope)
+
+    def resolve(self, name, scope):
+        if scope is None:
+            return Opcode.GET_GLOBAL, self.symbol_table.define(name)
+
+        owners = list(scope.owners(name))
+        if not owners:
+            return Opcode.GET_GLOBAL, self.symbol_table.define(name)
+
+        owner = owners[0]
+        if owner is scope:
+            ref = ("local", scope.locals[name])
+        else:
+            ref = ("free", scope.capture(name, owner))
+
+        if ref not in scope.fallbacks:
+            scope.fallbacks[ref] = (
+                tuple(scope.capture(name, o) for o in owners[1:]),
+                self.symbol_table.define(name),
+            )
+
+        if ref[0] == "free":
+            return Opcode.GET_FREE, ref[1]
+        elif name in scope.cells:
+            return Opcode.GET_DEREF, ref[1]
+        else:
+            return Opcode.GET_LOCAL, ref[1]
+
+    # Code generation.
+
+    def emit(self, op, *operands):
+        pos = len(self.instructions)
+        self.instructions.extend(make(op, *operands))
+        return pos
+
+    def change_operand(self, pos, operand):
+        self.instructions[pos + 1] = operand
+
+    def add_constant(self, obj):
+        self.constants.append(obj)
+        return len(self.constants) - 1
+
+    def visit(self, node):
+        method_name = "compile_" + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        raise Exception("No compile_{} method".format(type(node).__name__))
+
+    def compile_statements(self, statements):
+        if not statements:
+            self.emit(Opcode.NONE)
+            return
+
+        for stmt in statements[:-1]:
+            self.compile_statement(stmt)
+
+        last = statements[-1]
+        if isinstance(last, ExpressionStatement):
+            self.visit(last.expression)
+        else:
+            self.compile_statement(last)
+            self.emit(Opcode.NONE)
+
+    def compile_statement(self, stmt):
+        if isinstance(stmt, ExpressionStatement):
+            self.visit(stmt.expression)
+            self.emit(Opcode.POP)
+        else:
+            self.visit(stmt)
+
+    def compile_LetStatement(self, node):
+        self.visit(node.value)
+        self.compile_store(node.name.value)
+
+    def compile_store(self, name):
+        if self.scope is None:
+            self.emit(Opcode.SET_GLOBAL, self.symbol_table.define(name))
+        elif name in self.scope.cells:
+            self.emit(Opcode.SET_DEREF, self.scope.locals[name])
+        else:
+            self.emit(Opcode.SET_LOCAL, self.scope.locals[name])
+
+    def compile_ReturnStatement(self, node):
+        self.visit(node.return_value)
+
+        # As in NodeVisitor, a return inside a loop only ends the current
+        # iteration. Operands of enclosing expressions are still on the
+        # stack and must be dropped before jumping back.
+        if self.loops:
+            start, operands = self.loops[-1]
+            for _ in range(self.operands - operands + 1):
+                self.emit(Opcode.POP)
+            self.emit(Opcode.JUMP, start)
+        else:
+            self.emit(Opcode.RETURN_VALUE)
+
+    def compile_BlockStatement(self, node):
+        self.compile_statements(node.statements)
+
+    def compile_IntegerLiteral(self, node):
+        self.emit(Opcode.CONSTANT, self.add_constant(Integer(node.value)))
+
+    def compile_StringLiteral(self, node):
+        self.emit(Opcode.CONSTANT, self.add_constant(String(node.value)))
+
+    def compile_BooleanLiteral(self, node):
+        self.emit(Opcode.TRUE if node.value else Opcode.FALSE)
+
+    def compile_Identifier(self, node):
+        self.emit(*self.resolve(node.value, self.scope))
+
+    def compile_PrefixExpression(self, node):
+        self.visit(node.right)
+        self.emit(PREFIX_OPCODES[node.operator])
+
+    def compile_InfixExpression(self, node):
+        self.visit_operands((node.left, node.right))
+        self.emit(INFIX_OPCODES[node.operator])
+
+    def compile_IfExpression(self, node):
+        self.visit(node.condition)
+        jump_not_truthy = self.emit(Opcode.JUMP_NOT_TRUTHY, 0)
+
+        self.visit(node.consequence)
+        jump = self.emit(Opcode.JUMP, 0)
+
+        self.change_operand(jump_not_truthy, len(self.instructions))
+        if node.alternative is not None:
+            self.visit(node.alternative)
+        else:
+            self.emit(Opcode.NULL)
+
+        self.change_operand(jump, len(self.instructions))
+
+    def compile_WhileExpression(self, node):
+        start = len(self.instructions)
+        self.visit(node.condition)
+        jump_not_truthy = self.emit(Opcode.JUMP_NOT_TRUTHY, 0)
+
+        self.loops.append((start, self.operands))
+        for stmt in node.consequence.statements:
+            self.compile_statement(stmt)
+        self.loops.pop()
+
+        self.emit(Opcode.JUMP, start)
+        self.change_operand(jump_not_truthy, len(self.instructions))
+        self.emit(Opcode.NONE)
+
+    def compile_ForExpression(self, node):
+        self.visit(node.iterable)
+        self.emit(Opcode.GET_ITER)
+
+        start = self.emit(Opcode.FOR_ITER, 0)
+        self.compile_store(node.name.value)
+
+        self.loops.append((start, self.operands))
+        for stmt in node.body.statements:
+            self.compile_statement(stmt)
+        self.loops.pop()
+
+        self.emit(Opcode.JUMP, start)
+        self.change_operand(start, len(self.instructions))
+        self.emit(Opcode.NONE)
+
+    def visit_operands(self, nodes):
+        for node in nodes:
+            self.visit(node)
+            self.operands += 1
+        self.operands -= len(nodes)
+
+    def compile_ArrayLiteral(self, node):
+        self.visit_operands(node.elements)
+        self.emit(Opcode.ARRAY, len(node.elements))
+
+    def compile_HashLiteral(self, node):
+        self.visit_operands([n for pair in node.pairs.items() for n in pair])
+        self.emit(Opcode.HASH, len(node.pairs))
+
+    def compile_IndexExpression(self, node):
+        self.visit_operands((node.left, node.index))
+        self.emit(Opcode.INDEX)
+
+    def compile_IndexAssignment(self, node):
+        self.visit_operands((node.left, node.index, node.value))
+        self.emit(Opcode.SET_INDEX)
+
+    def compile_CallExpression(self, node):
+        self.visit_operands([node.function, *node.args])
+        self.emit(Opcode.CALL, len(node.args))
+
+    def compile_FunctionLiteral(self, node):
+        scope = self.scopes[node]
+
+        outer = (self.instructions, self.scope, self.loops, self.operands)
+        self.instructions, self.scope, self.loops = [], scope, []
+        self.operands = 0
+
+        self.visit(node.body)
+        self.emit(Opcode.RETURN_VALUE)
+
+        fn = CompiledFunction(
+            self.instructions,
+            num_locals=scope.size,
+            num_params=len(node.params),
+            cell_slots=tuple(sorted(scope.locals[n] for n in scope.cells)),
+            fallbacks=scope.fallbacks,
+            params=node.params,
+            body=node.body,
+        )
+
+        self.instructions, self.scope, self.loops, self.operands = outer
+
+        for name, owner in scope.free:
+            if owner is self.scope:
+                self.emit(Opcode.LOAD_CELL, owner.locals[name])
+            else:
+                index = self.scope.free_index[(name, id(owner))]
+                self.emit(Opcode.LOAD_FREE_CELL, index)
+
+        self.emit(Opcode.CLOSURE, self.add_constant(fn), len(scope.free))
@@ -0,0 +1,58 @@
+class SymbolTable:
+    def __init__(self):
+        self.store = {}
+        self.names = []
+
+    def define(self, name):
+        index = self.store.get(name)
+        if index is None:
+            index = len(self.names)
+            self.store[name] = index
+            self.names.append(name)
+        return index
+
+
+class Scope:
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.locals = {}
+        self.size = 0
+        self.cells = set()
+        self.free = []
+        self.free_index = {}
+        self.fallbacks = {}
+
+    def define(self, name):
+        slot = self.locals.get(name)
+        if slot is None:
+            slot = self.define_param(name)
+        return slot
+
+    def define_param(self, name):
+        slot = self.size
+        self.locals[name] = slot
+        self.size += 1
+        return slot
+
+    def owners(self, name):
+        scope = self
+        while scope is not None:
+            if name in scope.locals:
+                yield scope
+            scope = scope.parent
+
+    def capture(self, name, owner):
+        key = (name, id(owner))
+        index = self.free_index.get(key)
+        if index is not None:
+            return index
+
+        if self.parent is owner:
+            owner.cells.add(name)
+        else:
+            self.parent.capture(name, owner)
+
+        index = len(self.free)
+        self.free.append((name, owner))
+        self.free_index[key] = index
+        return index
@@ -1,4 +1,14 @@
-from object.object import Error, Integer, BuiltIn, String, Array, NULL
+import copy
+from functools import cmp_to_key
+from itertools import islice
+from operator import add, mul, sub
+
+from object.object import Error, BuiltIn, String, Array, NULL, TRUE, FALSE
+from object.object import Function, Hash, Hashable, HashPair, new_integer
+from object.object import Closure, Integer, IntArray, Sequence
+from object import numeric
+from object.object import inspect, native_hash_key, type_name
+from .memo import Memo
 
 
 def len_fn(args):
@@ -6,13 +16,11 @@ def len_fn(args):
         return Error(f"wrong number of arguments. got={len(args)}, want=1")
 
     arg = args[0]
-    if isinstance(arg, String):
-        return Integer(len(arg.value))
-    elif isinstance(arg, Array):
-        return Integer(len(arg.elements))
+    if isinstance(arg, (String, str, Array, Sequence, IntArray)):
+        return new_integer(len(arg))
     else:
         return Error(
-            f"argument to 'len' not supported, got {arg.type().value}"
+            f"argument to 'len' not supported, got {type_name(arg)}"
         )
 
 
@@ -20,14 +28,15 @@ def first_fn(args):
     if len(args) != 1:
         return Error(f"wrong number of arguments. got={len(args)}, want=1")
 
+    if isinstance(args[0], Sequence):
+        return args[0].first(NULL)
+
     if not isinstance(args[0], Array):
         return Error(
-            f"argument to 'first' must be ARRAY, got {args[0].type().value}"
+            f"argument to 'first' must be ARRAY, got {type_name(args[0])}"
         )
 
-    arr = args[0]
-
-    return arr.elements[0] if len(arr.elements) > 0 else NULL
+    return args[0].first()
 
 
 def last_fn(args):
@@ -36,13 +45,10 @@ def last_fn(args):
 
     if not isinstance(args[0], Array):
         return Error(
-            f"argument to 'last' must be ARRAY, got {args[0].type().value}"
+            f"argument to 'last' must be ARRAY, got {type_name(args[0])}"
         )
 
-    arr = args[0].elements
-    length = len(arr)
-
-    return arr.elements[length - 1] if length > 0 else NULL
+    return args[0].last()
 
 
 def rest_fn(args):
@@ -51,12 +57,10 @@ def rest_fn(args):
 
     if not isinstance(args[0], Array):
         return Error(
-            f"argument to 'rest' must be ARRAY, got {args[0].type().value}"
+            f"argument to 'rest' must be ARRAY, got {type_name(args[0])}"
         )
 
-    arr = args[0].elements
-
-    return Array(list(arr[1:])) if len(arr) > 0 else NULL
+    return args[0].rest()
 
 
 def push_fn(args):
@@ -65,24 +69,792 @@ def push_fn(args):
 
     if not isinstance(args[0], Array):
         return Error(
-            f"argument to 'push' must be ARRAY, got {args[0].type().value}"
+            f"argument to 'push' must be ARRAY, got {type_name(args[0])}"
         )
 
-    new_arr = list(args[0].elements)
-    new_arr.append(args[1])
-    return Array(new_arr)
+    return args[0].push(args[1])
+
+
+def append_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    if not isinstance(args[0], Array):
+        return Error(
+            f"argument to 'append!' must be ARRAY, got {type_name(args[0])}"
+        )
+
+    args[0].append(args[1])
+    return args[0]
+
+
+def pop_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if not isinstance(args[0], Array):
+        return Error(
+            f"argument to 'pop!' must be ARRAY, got {type_name(args[0])}"
+        )
+
+    return args[0].pop()
+
+
+def join_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    if not isinstance(args[0], Array):
+        return Error(
+            f"argument to 'join' must be ARRAY, got {type_name(args[0])}"
+        )
+
+    if not isinstance(args[1], (String, str)):
+        return Error(
+            f"separator to 'join' must be STRING, got {type_name(args[1])}"
+        )
+
+    return String(str(args[1]).join(inspect(elem) for elem in args[0]))
+
+
+def set_fn(args):
+    if len(args) != 3:
+        return Error(f"wrong number of arguments. got={len(args)}, want=3")
+
+    if not isinstance(args[0], Hash):
+        return Error(
+            f"argument to 'set' must be HASH, got {type_name(args[0])}"
+        )
+
+    key = hash_key(args[1])
+    if key is None:
+        return Error(f"unusable as hash key: {type_name(args[1])}")
+
+    pair = HashPair(args[1], args[2])
+    return Hash(hash_map=args[0].hash_map.set(key, pair))
+
+
+def delete_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    if not isinstance(args[0], Hash):
+        return Error(
+            f"argument to 'delete' must be HASH, got {type_name(args[0])}"
+        )
+
+    key = hash_key(args[1])
+    if key is None:
+        return Error(f"unusable as hash key: {type_name(args[1])}")
+
+    return Hash(hash_map=args[0].hash_map.delete(key))
+
+
+def hash_key(value):
+    if isinstance(value, Hashable):
+        return value.hash_key()
+    return native_hash_key(value)
+
+
+def keys_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if not isinstance(args[0], Hash):
+        return Error(
+            f"argument to 'keys' must be HASH, got {type_name(args[0])}"
+        )
+
+    return Array(args[0].keys())
+
+
+def values_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if not isinstance(args[0], Hash):
+        return Error(
+            f"argument to 'values' must be HASH, got {type_name(args[0])}"
+        )
+
+    return Array(args[0].values())
+
+
+def merge_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    for arg in args:
+        if not isinstance(arg, Hash):
+            return Error(
+                f"argument to 'merge' must be HASH, got {type_name(arg)}"
+            )
+
+    return args[0].merge(args[1])
 
 
 def puts_fn(args):
-    print("\n".join([str(arg) for arg in args]))
+    print("\n".join([inspect(arg) for arg in args]))
     return NULL
 
 
+def memo_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if not isinstance(args[0], (Function, Closure)):
+        return Error(
+            f"argument to 'memo' must be FUNCTION, got {type_name(args[0])}"
+        )
+
+    memoized = copy.copy(args[0])
+    memoized.memo = Memo()
+    return memoized
+
+
+def range_fn(args):
+    return range_sequence(args, new_integer)
+
+
+def range_sequence(args, box=None):
+    if not 1 <= len(args) <= 3:
+        return Error(
+            f"wrong number of arguments. got={len(args)}, want=1 to 3"
+        )
+
+    bounds = []
+    for arg in args:
+        bound = integer_arg(arg)
+        if bound is None:
+            return Error(
+                f"argument to 'range' must be INTEGER, got {type_name(arg)}"
+            )
+        bounds.append(bound)
+
+    if len(bounds) == 3 and bounds[2] == 0:
+        return Error("step to 'range' must not be zero")
+
+    values = range(*bounds)
+    if box is None:
+        return Sequence(values.__iter__, len(values), values.__getitem__)
+    return Sequence(
+        lambda: map(box, values), len(values), lambda i: box(values[i])
+    )
+
+
+def map_fn(args, apply):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    items, fn = args
+    if isinstance(items, Array):
+        return Array([apply(fn, [item]) for item in items])
+    elif isinstance(items, Sequence):
+        index = None
+        if items.index is not None:
+
+            def index(i):
+                return apply(fn, [items.index(i)])
+
+        return Sequence(
+            lambda: (apply(fn, [item]) for item in items),
+            items.length,
+            index,
+        )
+    return Error(
+        f"argument to 'map' must be ARRAY or SEQUENCE, got {type_name(items)}"
+    )
+
+
+def filter_fn(args, apply):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    items, fn = args
+    if isinstance(items, Array):
+        return Array([item for item in items if truthy(apply(fn, [item]))])
+    elif isinstance(items, Sequence):
+        return Sequence(
+            lambda: (item for item in items if truthy(apply(fn, [item])))
+        )
+    return Error(
+        "argument to 'filter' must be ARRAY or SEQUENCE, "
+        f"got {type_name(items)}"
+    )
+
+
+def reduce_fn(args, apply):
+    if len(args) != 3:
+        return Error(f"wrong number of arguments. got={len(args)}, want=3")
+
+    items, result, fn = args
+    if not isinstance(items, (Array, Sequence)):
+        return Error(
+            "argument to 'reduce' must be ARRAY or SEQUENCE, "
+            f"got {type_name(items)}"
+        )
+
+    for item in items:
+        result = apply(fn, [result, item])
+    return result
+
+
+def take_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    items = args[0]
+    count = integer_arg(args[1])
+    if count is None:
+        return Error(
+            f"argument to 'take' must be INTEGER, got {type_name(args[1])}"
+        )
+
+    count = max(count, 0)
+    if isinstance(items, Array):
+        return Array(list(islice(items, count)))
+    elif isinstance(items, Sequence):
+        length = items.length
+        return Sequence(
+            lambda: islice(items, count),
+            None if length is None else min(count, length),
+            items.index,
+        )
+    return Error(
+        f"argument to 'take' must be ARRAY or SEQUENCE, got {type_name(items)}"
+    )
+
+
+def zip_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    lengths = []
+    for arg in args:
+        if isinstance(arg, Array):
+            lengths.append(len(arg))
+        elif isinstance(arg, Sequence):
+            lengths.append(arg.length)
+        else:
+            return Error(
+                "argument to 'zip' must be ARRAY or SEQUENCE, "
+                f"got {type_name(arg)}"
+            )
+
+    left, right = args
+    if isinstance(left, Array) and isinstance(right, Array):
+        return Array([Array(pair) for pair in zip(left, right)])
+    return Sequence(
+        lambda: (Array(pair) for pair in zip(left, right)),
+        None if None in lengths else min(lengths),
+    )
+
+
+def to_array_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if isinstance(args[0], Array):
+        return args[0]
+    elif isinstance(args[0], Sequence):
+        return Array(list(args[0]))
+    return Error(
+        "argument to 'to_array' must be ARRAY or SEQUENCE, "
+        f"got {type_name(args[0])}"
+    )
+
+
+def sort_fn(args, apply):
+    if len(args) not in (1, 2):
+        return Error(
+            f"wrong number of arguments. got={len(args)}, want=1 or 2"
+        )
+
+    items = args[0]
+    if not isinstance(items, (Array, Sequence)):
+        return Error(
+            "argument to 'sort' must be ARRAY or SEQUENCE, "
+            f"got {type_name(items)}"
+        )
+
+    items = list(items)
+    if len(args) == 2 and arity(args[1]) == 2:
+        compare = args[1]
+        try:
+            items.sort(
+                key=cmp_to_key(
+                    lambda a, b: comparison(apply(compare, [a, b]))
+                )
+            )
+        except CallbackError as e:
+            return Error(f"comparator to 'sort' {e}")
+        return Array(items)
+
+    keys = sort_keys("sort", items, args[1:], apply)
+    if isinstance(keys, Error):
+        return keys
+    order = sorted(range(len(items)), key=keys.__getitem__)
+    return Array([items[i] for i in order])
+
+
+def min_fn(args, apply):
+    return extreme("min", min, args, apply)
+
+
+def max_fn(args, apply):
+    return extreme("max", max, args, apply)
+
+
+def extreme(name, pick, args, apply):
+    if len(args) not in (1, 2):
+        return Error(
+            f"wrong number of arguments. got={len(args)}, want=1 or 2"
+        )
+
+    items = args[0]
+    if not isinstance(items, (Array, Sequence)):
+        return Error(
+            f"argument to '{name}' must be ARRAY or SEQUENCE, "
+            f"got {type_name(items)}"
+        )
+
+    items = list(items)
+    if not items:
+        return NULL
+
+    keys = sort_keys(name, items, args[1:], apply)
+    if isinstance(keys, Error):
+        return keys
+    return items[pick(range(len(items)), key=keys.__getitem__)]
+
+
+def sum_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    items = args[0]
+    if not isinstance(items, (Array, Sequence)):
+        return Error(
+            "argument to 'sum' must be ARRAY or SEQUENCE, "
+            f"got {type_name(items)}"
+        )
+
+    total = 0
+    for item in items:
+        value = number_arg(item)
+        if value is None:
+            return Error(
+                f"elements of 'sum' must be INTEGER, got {type_name(item)}"
+            )
+        total += value
+    return new_integer(total)
+
+
+def any_fn(args, apply):
+    return quantify("any", any, args, apply)
+
+
+def all_fn(args, apply):
+    return quantify("all", all, args, apply)
+
+
+def quantify(name, test, args, apply):
+    if len(args) not in (1, 2):
+        return Error(
+            f"wrong number of arguments. got={len(args)}, want=1 or 2"
+        )
+
+    items = args[0]
+    if not isinstance(items, (Array, Sequence)):
+        return Error(
+            f"argument to '{name}' must be ARRAY or SEQUENCE, "
+            f"got {type_name(items)}"
+        )
+
+    if len(args) == 1:
+        return to_boolean(test(truthy(item) for item in items))
+
+    fn = args[1]
+    return to_boolean(test(truthy(apply(fn, [item])) for item in items))
+
+
+def reverse_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if not isinstance(args[0], (Array, Sequence)):
+        return Error(
+            "argument to 'reverse' must be ARRAY or SEQUENCE, "
+            f"got {type_name(args[0])}"
+        )
+
+    return Array(list(args[0])[::-1])
+
+
+def slice_fn(args):
+    if len(args) not in (2, 3):
+        return Error(
+            f"wrong number of arguments. got={len(args)}, want=2 or 3"
+        )
+
+    items = args[0]
+    bounds = []
+    for arg in args[1:]:
+        bound = integer_arg(arg)
+        if bound is None:
+            return Error(
+                f"argument to 'slice' must be INTEGER, got {type_name(arg)}"
+            )
+        bounds.append(bound)
+
+    if len(bounds) == 1:
+        bounds.append(None)
+    start, stop = bounds
+
+    if type(items) is str:
+        return items[start:stop]
+    elif isinstance(items, String):
+        return String(items.value[start:stop])
+    elif not isinstance(items, (Array, Sequence)):
+        return Error(
+            "argument to 'slice' must be ARRAY, SEQUENCE or STRING, "
+            f"got {type_name(items)}"
+        )
+
+    if isinstance(items, Sequence) and start >= 0 and (stop or 0) >= 0:
+        return Sequence(lambda: islice(items, start, stop))
+
+    indices = range(*slice(start, stop).indices(len(items)))
+    return Array([items.get(i) for i in indices])
+
+
+def int_array_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    items = args[0]
+    if isinstance(items, IntArray):
+        return items
+    elif not isinstance(items, (Array, Sequence)):
+        return Error(
+            "argument to 'int_array' must be ARRAY or SEQUENCE, "
+            f"got {type_name(items)}"
+        )
+
+    values = []
+    for item in items:
+        value = integer_arg(item)
+        if value is None:
+            return Error(
+                "elements of 'int_array' must be INTEGER, "
+                f"got {type_name(item)}"
+            )
+        values.append(value)
+
+    try:
+        return IntArray(numeric.from_values(values))
+    except OverflowError:
+        return Error("integer overflow in 'int_array'")
+
+
+def vsum_fn(args):
+    if len(args) != 1:
+        return Error(f"wrong number of arguments. got={len(args)}, want=1")
+
+    if not isinstance(args[0], IntArray):
+        return Error(
+            "argument to 'vsum' must be INT_ARRAY, "
+            f"got {type_name(args[0])}"
+        )
+
+    return new_integer(numeric.total(args[0].data))
+
+
+def vdot_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    for arg in args:
+        if not isinstance(arg, IntArray):
+            return Error(
+                f"argument to 'vdot' must be INT_ARRAY, got {type_name(arg)}"
+            )
+
+    left, right = args
+    if len(left) != len(right):
+        return Error(
+            f"length mismatch in 'vdot': {len(left)} and {len(right)}"
+        )
+    return new_integer(numeric.dot(left.data, right.data))
+
+
+def vadd_fn(args):
+    return vector_builtin("vadd", add, args)
+
+
+def vmul_fn(args):
+    return vector_builtin("vmul", mul, args)
+
+
+def vector_builtin(name, op, args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    if not isinstance(args[0], IntArray):
+        return Error(
+            f"argument to '{name}' must be INT_ARRAY, "
+            f"got {type_name(args[0])}"
+        )
+
+    return vector_operation(name, op, args[0], args[1])
+
+
+def vmap_scalar_fn(args):
+    if len(args) != 3:
+        return Error(f"wrong number of arguments. got={len(args)}, want=3")
+
+    items, operator, value = args
+    if not isinstance(items, IntArray):
+        return Error(
+            "argument to 'vmap_scalar' must be INT_ARRAY, "
+            f"got {type_name(items)}"
+        )
+
+    op = VECTOR_OPERATORS.get(string_arg(operator))
+    if op is None:
+        return Error(
+            "operator to 'vmap_scalar' must be one of "
+            f"{', '.join(VECTOR_OPERATORS)}, got {inspect(operator)}"
+        )
+
+    if integer_arg(value) is None:
+        return Error(
+            "argument to 'vmap_scalar' must be INTEGER, "
+            f"got {type_name(value)}"
+        )
+
+    return vector_operation("vmap_scalar", op, items, value)
+
+
+def vfilter_gt_fn(args):
+    if len(args) != 2:
+        return Error(f"wrong number of arguments. got={len(args)}, want=2")
+
+    items = args[0]
+    if not isinstance(items, IntArray):
+        return Error(
+            "argument to 'vfilter_gt' must be INT_ARRAY, "
+            f"got {type_name(items)}"
+        )
+
+    value = number_arg(args[1])
+    if value is None:
+        return Error(
+            "argument to 'vfilter_gt' must be INTEGER, "
+            f"got {type_name(args[1])}"
+        )
+
+    return IntArray(numeric.select_greater(items.data, value))
+
+
+def vector_operation(name, op, left, right):
+    if isinstance(right, IntArray):
+        if len(left) != len(right):
+            return Error(
+                f"length mismatch in '{name}': {len(left)} and {len(right)}"
+            )
+        compute = numeric.elementwise
+        right = right.data
+    else:
+        value = integer_arg(right)
+        if value is None:
+            return Error(
+                f"argument to '{name}' must be INT_ARRAY or INTEGER, "
+                f"got {type_name(right)}"
+            )
+        compute = numeric.broadcast
+        right = value
+
+    try:
+        return IntArray(compute(op, left.data, right))
+    except OverflowError:
+        return Error(f"integer overflow in '{name}'")
+
+
+def sort_keys(name, items, key_fn, apply):
+    values = items
+    if key_fn:
+        values = [apply(key_fn[0], [item]) for item in items]
+
+    keys = []
+    for value in values:
+        key = number_arg(value)
+        if key is None:
+            key = string_arg(value)
+            if key is None:
+                return Error(
+                    f"cannot order {type_name(value)} values in '{name}'"
+                )
+        keys.append(key)
+
+    if len({key.__class__ is str for key in keys}) > 1:
+        return Error(f"cannot order INTEGER and STRING values in '{name}'")
+    return keys
+
+
+def comparison(result):
+    if result is TRUE or result is True:
+        return -1
+    elif result is FALSE or result is False:
+        return 1
+
+    value = number_arg(result)
+    if value is None:
+        raise CallbackError(
+            f"must return INTEGER or BOOLEAN, got {type_name(result)}"
+        )
+    return value
+
+
+def arity(fn):
+    if isinstance(fn, Function):
+        return len(fn.params)
+    elif isinstance(fn, Closure):
+        return fn.fn.num_params
+    return 1
+
+
+class CallbackError(Exception):
+    pass
+
+
+def integer_arg(value):
+    if value.__class__ is Integer:
+        value = value.value
+    return value if value.__class__ is int else None
+
+
+def number_arg(value):
+    if value.__class__ is Integer:
+        value = value.value
+    return value if value.__class__ in (int, float) else None
+
+
+def string_arg(value):
+    if value.__class__ is String:
+        value = value.value
+    return value if value.__class__ is str else None
+
+
+def to_boolean(value):
+    return TRUE if value else FALSE
+
+
+def truthy(value):
+    return not (
+        value is NULL or value is FALSE or value is None or value is False
+    )
+
+
 BUILTIN = {
     "len": BuiltIn(len_fn),
     "first": BuiltIn(first_fn),
     "last": BuiltIn(last_fn),
     "rest": BuiltIn(rest_fn),
     "push": BuiltIn(push_fn),
+    "append!": BuiltIn(append_fn),
+    "pop!": BuiltIn(pop_fn),
+    "join": BuiltIn(join_fn),
+    "set": BuiltIn(set_fn),
+    "delete": BuiltIn(delete_fn),
+    "keys": BuiltIn(keys_fn),
+    "values": BuiltIn(values_fn),
+    "merge": BuiltIn(merge_fn),
     "puts": BuiltIn(puts_fn),
+    "memo": BuiltIn(memo_fn),
+    "range": BuiltIn(range_fn),
+    "map": BuiltIn(map_fn, callback=True),
+    "filter": BuiltIn(filter_fn, callback=True),
+    "reduce": BuiltIn(reduce_fn, callback=True),
+    "take": BuiltIn(take_fn),
+    "zip": BuiltIn(zip_fn),
+    "to_array": BuiltIn(to_array_fn),
+    "sort": BuiltIn(sort_fn, callback=True),
+    "any": BuiltIn(any_fn, callback=True),
+    "all": BuiltIn(all_fn, callback=True),
+    "sum": BuiltIn(sum_fn),
+    "min": BuiltIn(min_fn, callback=True),
+    "max": BuiltIn(max_fn, callback=True),
+    "reverse": BuiltIn(reverse_fn),
+    "slice": BuiltIn(slice_fn),
+    "int_array": BuiltIn(int_array_fn),
+    "vsum": BuiltIn(vsum_fn),
+    "vadd": BuiltIn(vadd_fn),
+    "vmul": BuiltIn(vmul_fn),
+    "vdot": BuiltIn(vdot_fn),
+    "vmap_scalar": BuiltIn(vmap_scalar_fn),
+    "vfilter_gt": BuiltIn(vfilter_gt_fn),
+}
+
+
+VECTOR_OPERATORS = {"+": add, "-": sub, "*": mul}
+
+
+def unboxed(function):
+    def call(args, *apply):
+        return unbox(function(args, *apply))
+
+    return call
+
+
+def unbox(value):
+    if value is NULL:
+        return None
+    elif value is TRUE or value is FALSE:
+        return value.value
+    elif value.__class__ is Integer:
+        return value.value
+    elif value.__class__ is String:
+        return value.value
+    return value
+
+
+NATIVE_BUILTIN = {
+    "len": BuiltIn(unboxed(len_fn)),
+    "first": BuiltIn(unboxed(first_fn)),
+    "last": BuiltIn(unboxed(last_fn)),
+    "rest": BuiltIn(unboxed(rest_fn)),
+    "push": BuiltIn(unboxed(push_fn)),
+    "append!": BUILTIN["append!"],
+    "pop!": BuiltIn(unboxed(pop_fn)),
+    "join": BuiltIn(unboxed(join_fn)),
+    "set": BuiltIn(unboxed(set_fn)),
+    "delete": BuiltIn(unboxed(delete_fn)),
+    "keys": BUILTIN["keys"],
+    "values": BUILTIN["values"],
+    "merge": BUILTIN["merge"],
+    "puts": BuiltIn(unboxed(puts_fn)),
+    "memo": BUILTIN["memo"],
+    "range": BuiltIn(range_sequence),
+    "map": BUILTIN["map"],
+    "filter": BUILTIN["filter"],
+    "reduce": BUILTIN["reduce"],
+    "take": BUILTIN["take"],
+    "zip": BUILTIN["zip"],
+    "to_array": BUILTIN["to_array"],
+    "sort": BUILTIN["sort"],
+    "any": BuiltIn(unboxed(any_fn), callback=True),
+    "all": BuiltIn(unboxed(all_fn), callback=True),
+    "sum": BuiltIn(unboxed(sum_fn)),
+    "min": BuiltIn(unboxed(min_fn), callback=True),
+    "max": BuiltIn(unboxed(max_fn), callback=True),
+    "reverse": BUILTIN["reverse"],
+    "slice": BUILTIN["slice"],
+    "int_array": BUILTIN["int_array"],
+    "vsum": BuiltIn(unboxed(vsum_fn)),
+    "vadd": BUILTIN["vadd"],
+    "vmul": BUILTIN["vmul"],
+    "vdot": BuiltIn(unboxed(vdot_fn)),
+    "vmap_scalar": BUILTIN["vmap_scalar"],
+    "vfilter_gt": BUILTIN["vfilter_gt"],
 }
@@ -0,0 +1,495 @@
+from object.environment import Environment
+from object.object import (
+    Integer,
+    ReturnValue,
+    Function,
+    Error,
+    String,
+    BuiltIn,
+    Array,
+    NULL,
+    TRUE,
+    FALSE,
+    Hashable,
+    HashPair,
+    Hash,
+    new_integer,
+)
+from .builtin import BUILTIN
+from .memo import MISSING, function_memo, memo_key
+from .nodevisitor import (
+    LOCAL,
+    Abort,
+    EarlyReturn,
+    TailCall,
+    assign_index,
+    check,
+    check_arity,
+    eval_identifier,
+    eval_index_expression,
+    eval_infix_expression,
+    eval_prefix_expression,
+    extend_function_env,
+    iter_object,
+)
+
+
+class ClosureCompiler:
+    def __init__(self):
+        self.bodies = {}
+
+    def compile(self, program):
+        statements = [self.visit(stmt) for stmt in program.statements]
+
+        def run(env):
+            result = None
+            try:
+                for stmt in statements:
+                    result = stmt(env)
+                    if result.__class__ is ReturnValue:
+                        return result.value
+            except EarlyReturn as e:
+                return e.value
+            except Abort as e:
+                return e.error
+            return result
+
+        return run
+
+    def visit(self, node):
+        method_name = "compile_" + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        raise Exception("No compile_{} method".format(type(node).__name__))
+
+    def compile_ExpressionStatement(self, node):
+        return self.visit(node.expression)
+
+    def compile_IntegerLiteral(self, node):
+        value = new_integer(node.value)
+        return lambda env: value
+
+    def compile_StringLiteral(self, node):
+        value = String(node.value)
+        return lambda env: value
+
+    def compile_BooleanLiteral(self, node):
+        value = TRUE if node.value else FALSE
+        return lambda env: value
+
+    def compile_LetStatement(self, node):
+        value = self.visit(node.value)
+        name = node.name.value
+        slot = node.slot
+
+        if node.scope is LOCAL:
+
+            def let(env):
+                env.slots[slot] = value(env)
+
+        else:
+
+            def let(env):
+                env.store[name] = value(env)
+
+        return let
+
+    def compile_ReturnStatement(self, node):
+        value = self.visit(node.return_value)
+        if node.unwinds:
+
+            def unwind(env):
+                raise EarlyReturn(value(env))
+
+            return unwind
+
+        return lambda env: ReturnValue(value(env))
+
+    def compile_Identifier(self, node):
+        if node.scope is not None:
+            return self.compile_resolved_identifier(node)
+
+        name = node.value
+        builtin = BUILTIN.get(name)
+
+        def identifier(env):
+            while env is not None:
+                val = env.store.get(name)
+                if val is not None:
+                    return val
+                env = env.outer
+
+            if builtin is not None:
+                return builtin
+            raise Abort(Error(f"identifier not found: {name}"))
+
+        return identifier
+
+    def compile_resolved_identifier(self, node):
+        slot = node.slot
+
+        if node.scope is LOCAL:
+
+            def identifier(env):
+                val = env.slots[slot]
+                if val is None:
+                    return check(eval_identifier(node, env))
+                return val
+
+        else:
+
+            def identifier(env):
+                return check(eval_identifier(node, env))
+
+        return identifier
+
+    def compile_BlockStatement(self, node):
+        statements = [self.visit(stmt) for stmt in node.statements]
+
+        if len(statements) == 1:
+            return statements[0]
+
+        def block(env):
+            result = None
+            for stmt in statements:
+                result = stmt(env)
+                if result.__class__ is ReturnValue:
+                    return result
+            return result
+
+        return block
+
+    def compile_IfExpression(self, node):
+        condition = self.visit(node.condition)
+        consequence = self.visit(node.consequence)
+
+        if node.alternative is None:
+
+            def if_expression(env):
+                cond = condition(env)
+                if cond is NULL or cond is FALSE:
+                    return NULL
+                return consequence(env)
+
+        else:
+            alternative = self.visit(node.alternative)
+
+            def if_expression(env):
+                cond = condition(env)
+                if cond is NULL or cond is FALSE:
+                    return alternative(env)
+                return consequence(env)
+
+        return if_expression
+
+    def compile_WhileExpression(self, node):
+        condition = self.visit(node.condition)
+        consequence = self.visit(node.consequence)
+
+        def while_expression(env):
+            while True:
+                cond = condition(env)
+                if cond is NULL or cond is FALSE:
+                    return None
+                try:
+                    consequence(env)
+                except EarlyReturn:
+                    pass
+
+        return while_expression
+
+    def compile_ForExpression(self, node):
+        iterable = self.visit(node.iterable)
+        body = self.visit(node.body)
+        name = node.name.value
+        slot = node.slot
+
+        if node.scope is LOCAL:
+
+            def for_expression(env):
+                slots = env.slots
+                for item in check(iter_object(iterable(env))):
+                    slots[slot] = item
+                    try:
+                        body(env)
+                    except EarlyReturn:
+                        pass
+
+        else:
+
+            def for_expression(env):
+                store = env.store
+                for item in check(iter_object(iterable(env))):
+                    store[name] = item
+                    try:
+                        body(env)
+                    except EarlyReturn:
+                        pass
+
+        return for_expression
+
+    def compile_PrefixExpression(self, node):
+        right = self.visit(node.right)
+        operator = node.operator
+
+        if operator == "-":
+
+            def prefix(env):
+                val = right(env)
+                if val.__class__ is Integer:
+                    return new_integer(-val.value)
+                return check(eval_prefix_expression(operator, val))
+
+        elif operator == "!":
+
+            def prefix(env):
+                val = right(env)
+                return TRUE if val is FALSE or val is NULL else FALSE
+
+        else:
+
+            def prefix(env):
+                return check(eval_prefix_expression(operator, right(env)))
+
+        return prefix
+
+    def compile_InfixExpression(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        operator = node.operator
+
+        fast = INTEGER_OPERATORS.get(operator)
+        if fast is None:
+
+            def infix(env):
+                lval = left(env)
+                rval = right(env)
+                return check(eval_infix_expression(operator, lval, rval))
+
+            return infix
+
+        return fast(left, right, operator)
+
+    def compile_IndexExpression(self, node):
+        left = self.visit(node.left)
+        index = self.visit(node.index)
+
+        def index_expression(env):
+            obj = left(env)
+            idx = index(env)
+            if obj.__class__ is Array and idx.__class__ is Integer:
+                i = idx.value
+                return obj.get(i) if 0 <= i < len(obj) else NULL
+            return check(eval_index_expression(obj, idx))
+
+        return index_expression
+
+    def compile_IndexAssignment(self, node):
+        left = self.visit(node.left)
+        index = self.visit(node.index)
+        value = self.visit(node.value)
+
+        def index_assignment(env):
+            obj = left(env)
+            idx = index(env)
+            return check(assign_index(obj, idx, value(env)))
+
+        return index_assignment
+
+    def compile_ArrayLiteral(self, node):
+        elements = [self.visit(elem) for elem in node.elements]
+        return lambda env: Array([elem(env) for elem in elements])
+
+    def compile_HashLiteral(self, node):
+        pairs = [(self.visit(k), self.visit(v)) for k, v in node.pairs.items()]
+
+        def hash_literal(env):
+            result = {}
+            for key_code, value_code in pairs:
+                key = key_code(env)
+                if not isinstance(key, Hashable):
+                    raise Abort(
+                        Error(f"unusable as hash key: {key.type().value}")
+                    )
+                result[key.hash_key()] = HashPair(key, value_code(env))
+            return Hash(result)
+
+        return hash_literal
+
+    def compile_FunctionLiteral(self, node):
+        params = node.params
+        body = node.body
+        self.body(body)
+        return lambda env: Function(params, body, env, node)
+
+    def compile_CallExpression(self, node):
+        function = self.visit(node.function)
+        args = [self.visit(arg) for arg in node.args]
+        apply_function = self.apply_function
+
+        if node.tail:
+
+            def call(env):
+                fn = function(env)
+                return TailCall(fn, [arg(env) for arg in args])
+
+        else:
+
+            def call(env):
+                fn = function(env)
+                return apply_function(fn, [arg(env) for arg in args])
+
+        return call
+
+    def body(self, block):
+        body = self.bodies.get(block)
+        if body is None:
+            body = self.bodies[block] = self.visit(block)
+        return body
+
+    def apply_function(self, fn, values):
+        if fn.__class__ is Function:
+            memo = function_memo(fn)
+            if memo is not None:
+                key = memo_key(values)
+                if key is not None:
+                    result = memo.get(key)
+                    if result is MISSING:
+                        result = self.call_function(fn, values)
+                        memo.put(key, result)
+                    return result
+
+        return self.call_function(fn, values)
+
+    def call_function(self, fn, values):
+        while True:
+            if fn.__class__ is Function:
+                literal = fn.literal
+                if literal is None or literal.frame_size is None:
+                    check_arity(fn, values)
+                    env = Environment(fn.env)
+                    store = env.store
+                    for i, param in enumerate(fn.params):
+                        store[param.value] = values[i]
+                else:
+                    env = extend_function_env(fn, values)
+
+                try:
+                    result = self.body(fn.body)(env)
+                except EarlyReturn as e:
+                    result = e.value
+                if result.__class__ is ReturnValue:
+                    result = result.value
+                if result.__class__ is not TailCall:
+                    return result
+                fn, values = result.fn, result.args
+
+            elif fn.__class__ is BuiltIn:
+                if fn.callback:
+                    return check(fn.function(values, self.apply_function))
+                return check(fn.function(values))
+
+            else:
+                raise Abort(Error(f"not a function: {fn}"))
+
+
+def integer_add(left, right, operator):
+    def add(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return new_integer(lval.value + rval.value)
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return add
+
+
+def integer_sub(left, right, operator):
+    def sub(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return new_integer(lval.value - rval.value)
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return sub
+
+
+def integer_mul(left, right, operator):
+    def mul(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return new_integer(lval.value * rval.value)
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return mul
+
+
+def integer_div(left, right, operator):
+    def div(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return Integer(lval.value / rval.value)
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return div
+
+
+def integer_lt(left, right, operator):
+    def lt(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return TRUE if lval.value < rval.value else FALSE
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return lt
+
+
+def integer_gt(left, right, operator):
+    def gt(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return TRUE if lval.value > rval.value else FALSE
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return gt
+
+
+def integer_eq(left, right, operator):
+    def eq(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return TRUE if lval.value == rval.value else FALSE
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return eq
+
+
+def integer_not_eq(left, right, operator):
+    def not_eq(env):
+        lval = left(env)
+        rval = right(env)
+        if lval.__class__ is Integer and rval.__class__ is Integer:
+            return TRUE if lval.value != rval.value else FALSE
+        return check(eval_infix_expression(operator, lval, rval))
+
+    return not_eq
+
+
+INTEGER_OPERATORS = {
+    "+": integer_add,
+    "-": integer_sub,
+    "*": integer_mul,
+    "/": integer_div,
+    "<": integer_lt,
+    ">": integer_gt,
+    "==": integer_eq,
+    "!=": integer_not_eq,
+}
@@ -0,0 +1,63 @@
+from collections import OrderedDict
+
+from object.object import Array, Boolean, Hash, Integer, String
+
+MEMO_SIZE = 1024
+
+MEMO_KEY_TYPES = (Integer, String, Boolean)
+
+CONTAINER_TYPES = (Array, Hash)
+
+
+class Memo:
+    def __init__(self, maxsize=MEMO_SIZE, builtins=()):
+        self.maxsize = maxsize
+        self.builtins = builtins
+        self.table = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        result = self.table.get(key, MISSING)
+        if result is MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self.table.move_to_end(key)
+        return result
+
+    def put(self, key, value):
+        if value.__class__ in CONTAINER_TYPES:
+            return
+        self.table[key] = value
+        if len(self.table) > self.maxsize:
+            self.table.popitem(last=False)
+
+
+MISSING = object()
+
+
+def function_memo(fn):
+    memo = fn.memo
+    if memo is None:
+        literal = fn.literal
+        if literal is None or not literal.memoize:
+            return None
+        memo = fn.memo = Memo(builtins=literal.builtins)
+    if memo.builtins and shadows_builtin(fn.env, memo.builtins):
+        return None
+    return memo
+
+
+def shadows_builtin(env, names):
+    for name in names:
+        if env.get(name) is not None:
+            return True
+    return False
+
+
+def memo_key(args):
+    for arg in args:
+        if arg.__class__ not in MEMO_KEY_TYPES:
+            return None
+    return tuple(arg.hash_key() for arg in args)
@@ -1,6 +1,6 @@
 from object.environment import Environment
 from object.object import (
-    ObjectType,
+    Boolean,
     Integer,
     ReturnValue,
     Function,
@@ -14,14 +14,49 @@ from object.object import (
     Hashable,
     HashPair,
     Hash,
+    IntArray,
+    Sequence,
+    new_integer,
 )
-from .builtin import BUILTIN
+from resolver.resolver import Resolver, SymbolScope
+from .builtin import BUILTIN, VECTOR_OPERATORS, vector_operation
+from .memo import MISSING, function_memo, memo_key
+
+LOCAL = SymbolScope.LOCAL
+FREE = SymbolScope.FREE
+
+MAX_DEOPTS = 4
+
+
+class Abort(Exception):
+    def __init__(self, error):
+        super().__init__(error.message)
+        self.error = error
+
+
+class EarlyReturn(Exception):
+    def __init__(self, value):
+        super().__init__()
+        self.value = value
+
+
+def check(obj):
+    if obj.__class__ is Error:
+        raise Abort(obj)
+    return obj
 
 
 class NodeVisitor:
+    def __init__(self, tiering=None):
+        self.visitors = {}
+        self.tiering = tiering
+
     def visit(self, node, env):
-        method_name = "visit_" + type(node).__name__
-        visitor = getattr(self, method_name, self.generic_visit)
+        visitor = self.visitors.get(node.__class__)
+        if visitor is None:
+            method_name = "visit_" + type(node).__name__
+            visitor = getattr(self, method_name, self.generic_visit)
+            self.visitors[node.__class__] = visitor
         return visitor(node, env)
 
     def generic_visit(self, node, env):
@@ -31,98 +66,65 @@ class NodeVisitor:
         return self.visit(node.expression, env)
 
     def visit_IntegerLiteral(self, node, _):
-        return Integer(node.value)
+        return new_integer(node.value)
 
     def visit_BooleanLiteral(self, node, _):
         return TRUE if node.value else FALSE
 
     def visit_LetStatement(self, node, env):
         val = self.visit(node.value, env)
-        if is_error(val):
-            return val
-
-        env.set(node.name.value, val)
+        if node.scope is LOCAL:
+            env.slots[node.slot] = val
+        else:
+            env.set(node.name.value, val)
 
     def visit_FunctionLiteral(self, node, env):
-        return Function(node.params, node.body, env)
+        return Function(node.params, node.body, env, node)
 
     def visit_StringLiteral(self, node, _):
         return String(node.value)
 
     def visit_CallExpression(self, node, env):
         function = self.visit(node.function, env)
-        if is_error(function):
-            return function
-
-        args = self.eval_expressions(node.args, env)
-
-        if len(args) == 1 and is_error(args[0]):
-            return args[0]
+        args = [self.visit(arg, env) for arg in node.args]
 
+        if node.tail:
+            return TailCall(function, args)
         return self.apply_function(function, args)
 
     def visit_PrefixExpression(self, node, env):
         right = self.visit(node.right, env)
-        if is_error(right):
-            return right
-
-        return eval_prefix_expression(node.operator, right)
+        return check(eval_prefix_expression(node.operator, right))
 
     def visit_InfixExpression(self, node, env):
         left = self.visit(node.left, env)
-        if is_error(left):
-            return left
-
         right = self.visit(node.right, env)
-        if is_error(right):
-            return right
-
-        if isinstance(left, Integer) and isinstance(right, Integer):
-            return eval_integer_infix_expression(node.operator, left, right)
-        elif isinstance(left, String) and isinstance(right, String):
-            return eval_string_infix_expression(node.operator, left, right)
-        elif node.operator == "==":
-            return to_bool(left.value == right.value)
-        elif node.operator == "!=":
-            return to_bool(left.value != right.value)
-        elif left.type() != right.type():
-            return Error(
-                f"type mismatch: {left.type().value} {node.operator} {right.type().value}"
-            )
-        else:
-            return Error(
-                f"unknown operator: {left.type().value} {node.operator} {right.type().value}"
-            )
+
+        quick = node.quick
+        if quick is not None:
+            result = quick(left, right)
+            if result is not None:
+                return result
+
+        return check(quicken_infix(node, left, right))
 
     def visit_BlockStatement(self, node, env):
         result = None
         for stmt in node.statements:
             result = self.visit(stmt, env)
-
-            if result is not None:
-                rt = result.type()
-                if rt in (ObjectType.RETURN_VALUE, ObjectType.ERROR):
-                    return result
-
         return result
 
     def visit_Identifier(self, node, env):
-        val = env.get(node.value)
-        if val is not None:
-            return val
-
-        val = BUILTIN.get(node.value)
-        if val is not None:
-            return val
-
-        return Error(f"identifier not found: {node.value}")
+        if node.scope is LOCAL:
+            val = env.slots[node.slot]
+            if val is not None:
+                return val
+        return check(eval_identifier(node, env))
 
     def visit_IfExpression(self, node, env):
         condition = self.visit(node.condition, env)
-        if is_error(condition):
-            return condition
 
-        if is_truthy(condition):
+        if condition is not NULL and condition is not FALSE:
             return self.visit(node.consequence, env)
         elif node.alternative is not None:
             return self.visit(node.alternative, env)
@@ -130,104 +132,286 @@ class NodeVisitor:
             return NULL
 
     def visit_WhileExpression(self, node, env):
+        tiering = self.tiering
         while True:
-            condition = self.visit(node.condition, env)
-            if is_error(condition):
-                return condition
+            if tiering is not None and tiering.loop_is_hot(node):
+                return node.compiled(env)
 
-            if not is_truthy(condition):
+            condition = self.visit(node.condition, env)
+            if condition is NULL or condition is FALSE:
                 return None
 
-            consequence = self.visit(node.consequence, env)
-            if is_error(consequence):
-                return consequence
+            try:
+                self.visit(node.consequence, env)
+            except EarlyReturn:
+                pass
+
+    def visit_ForExpression(self, node, env):
+        items = check(iter_object(self.visit(node.iterable, env)))
+        body = node.body
+        slot = node.slot
+        slots = env.slots
+        name = node.name.value
+        local = node.scope is LOCAL
+
+        for item in items:
+            if local:
+                slots[slot] = item
+            else:
+                env.set(name, item)
+
+            try:
+                self.visit(body, env)
+            except EarlyReturn:
+                pass
 
     def visit_ReturnStatement(self, node, env):
         val = self.visit(node.return_value, env)
-        return val if is_error(val) else ReturnValue(val)
+        if node.tail:
+            return val
+        raise EarlyReturn(val)
 
     def visit_ArrayLiteral(self, node, env):
-        elements = self.eval_expressions(node.elements, env)
-        if len(elements) == 1 and is_error(elements[0]):
-            return elements[0]
-
-        return Array(elements)
+        return Array([self.visit(elem, env) for elem in node.elements])
 
     def visit_IndexExpression(self, node, env):
         left = self.visit(node.left, env)
-        if is_error(left):
-            return left
-
         index = self.visit(node.index, env)
-        if is_error(index):
-            return index
 
-        return eval_index_expression(left, index)
+        quick = node.quick
+        if quick is not None:
+            result = quick(left, index)
+            if result is not None:
+                return result
+
+        return check(quicken_index(node, left, index))
+
+    def visit_IndexAssignment(self, node, env):
+        left = self.visit(node.left, env)
+        index = self.visit(node.index, env)
+        value = self.visit(node.value, env)
+        return check(assign_index(left, index, value))
 
     def visit_HashLiteral(self, node, env):
         pairs = {}
 
         for key_node, val_node in node.pairs.items():
             key = self.visit(key_node, env)
-            if is_error(key):
-                return key
-
             if not isinstance(key, Hashable):
-                return Error(f"unusable as hash key: {key.type().value}")
+                raise Abort(
+                    Error(f"unusable as hash key: {key.type().value}")
+                )
 
             value = self.visit(val_node, env)
-            if is_error(value):
-                return value
-
-            hashed_key = key.hash_key()
-            pairs[hashed_key] = HashPair(key, value)
+            pairs[key.hash_key()] = HashPair(key, value)
 
         return Hash(pairs)
 
-    def eval_expressions(self, exps, env):
-        result = []
-        for e in exps:
-            evaluated = self.visit(e, env)
-            if is_error(evaluated):
-                return [evaluated]
+    def apply_function(self, fn, args):
+        if fn.__class__ is Function:
+            memo = function_memo(fn)
+            if memo is not None:
+                key = memo_key(args)
+                if key is not None:
+                    result = memo.get(key)
+                    if result is MISSING:
+                        result = self.call_function(fn, args)
+                        memo.put(key, result)
+                    return result
 
-            result.append(evaluated)
+        return self.call_function(fn, args)
 
-        return result
+    def call_function(self, fn, args):
+        env = None
+        while True:
+            if fn.__class__ is Function:
+                env = extend_function_env(fn, args, env)
 
-    def apply_function(self, fn, args):
-        if isinstance(fn, Function):
-            extended_env = extend_function_env(fn, args)
-            if isinstance(extended_env, Error):
-                return extended_env
+                try:
+                    if self.tiering is None:
+                        evaluated = self.visit(fn.body, env)
+                    else:
+                        evaluated = self.tiering.call(self, fn, env)
+                except EarlyReturn as e:
+                    evaluated = e.value
 
-            evaluated = self.visit(fn.body, extended_env)
-            if evaluated is None:
-                return None
+                if evaluated.__class__ is ReturnValue:
+                    evaluated = evaluated.value
+                if evaluated.__class__ is not TailCall:
+                    return evaluated
 
-            return unwrap_return_value(evaluated)
+                if not can_reuse_frame(fn, evaluated.fn):
+                    env = None
+                fn, args = evaluated.fn, evaluated.args
 
-        elif isinstance(fn, BuiltIn):
-            return fn.function(args)
-        else:
-            return Error(f"not a function: {fn}")
+            elif fn.__class__ is BuiltIn:
+                if fn.callback:
+                    return check(fn.function(args, self.apply_function))
+                return check(fn.function(args))
+            else:
+                raise Abort(Error(f"not a function: {fn}"))
 
 
-def evaluate(program, env):
-    evaluator = NodeVisitor()
+class TailCall:
+    def __init__(self, fn, args):
+        self.fn = fn
+        self.args = args
 
-    result = None
-    for stmt in program.statements:
-        result = evaluator.visit(stmt, env)
 
-        if isinstance(result, ReturnValue):
-            return result.value
-        elif isinstance(result, Error):
-            return result
+def evaluate(program, env, tiering=None, memoize=True):
+    Resolver(memoize).resolve(program)
+    evaluator = NodeVisitor(tiering)
+
+    result = None
+    try:
+        for stmt in program.statements:
+            result = evaluator.visit(stmt, env)
+    except EarlyReturn as e:
+        return e.value
+    except Abort as e:
+        return e.error
 
     return result
 
 
+def eval_identifier(node, env):
+    scope = node.scope
+    if scope is LOCAL:
+        val = env.slots[node.slot]
+    elif scope is FREE:
+        frame = env
+        for _ in range(node.depth):
+            frame = frame.outer
+        val = frame.slots[node.slot]
+    elif scope is None:
+        val = env.get(node.value)
+    else:
+        val = env.globals.get(node.value)
+
+    if val is not None:
+        return val
+
+    for depth, slot in node.fallbacks:
+        frame = env
+        for _ in range(depth):
+            frame = frame.outer
+        val = frame.slots[slot]
+        if val is not None:
+            return val
+
+    if scope is LOCAL or scope is FREE:
+        val = env.globals.get(node.value)
+        if val is not None:
+            return val
+
+    val = BUILTIN.get(node.value)
+    if val is not None:
+        return val
+
+    return Error(f"identifier not found: {node.value}")
+
+
+def quicken_infix(node, left, right):
+    observed = (left.__class__, right.__class__, node.operator)
+    specialize(node, observed, INFIX_SPECIALIZATIONS)
+    return eval_infix_expression(node.operator, left, right)
+
+
+def quicken_index(node, left, index):
+    observed = (left.__class__, index.__class__)
+    specialize(node, observed, INDEX_SPECIALIZATIONS)
+    return eval_index_expression(left, index)
+
+
+def specialize(node, observed, specializations):
+    if node.quick is not None:
+        node.quick = None
+        node.deopts += 1
+
+    if node.deopts < MAX_DEOPTS and observed == node.observed:
+        node.quick = specializations.get(observed)
+    node.observed = observed
+
+
+def integer_add(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return new_integer(left.value + right.value)
+
+
+def integer_sub(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return new_integer(left.value - right.value)
+
+
+def integer_mul(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return new_integer(left.value * right.value)
+
+
+def integer_div(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return Integer(left.value / right.value)
+
+
+def integer_lt(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return TRUE if left.value < right.value else FALSE
+
+
+def integer_gt(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return TRUE if left.value > right.value else FALSE
+
+
+def integer_eq(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return TRUE if left.value == right.value else FALSE
+
+
+def integer_not_eq(left, right):
+    if left.__class__ is Integer and right.__class__ is Integer:
+        return TRUE if left.value != right.value else FALSE
+
+
+def string_add(left, right):
+    if left.__class__ is String and right.__class__ is String:
+        return left.concat(right)
+
+
+def array_index(left, index):
+    if left.__class__ is Array and index.__class__ is Integer:
+        i = index.value
+        return left.get(i) if 0 <= i < len(left) else NULL
+
+
+def hash_index(left, index):
+    if left.__class__ is Hash and index.__class__ in HASH_KEY_TYPES:
+        pair = left.get(index.hash_key())
+        return pair.value if pair is not None else NULL
+
+
+HASH_KEY_TYPES = (Integer, String, Boolean)
+
+INFIX_SPECIALIZATIONS = {
+    (Integer, Integer, "+"): integer_add,
+    (Integer, Integer, "-"): integer_sub,
+    (Integer, Integer, "*"): integer_mul,
+    (Integer, Integer, "/"): integer_div,
+    (Integer, Integer, "<"): integer_lt,
+    (Integer, Integer, ">"): integer_gt,
+    (Integer, Integer, "=="): integer_eq,
+    (Integer, Integer, "!="): integer_not_eq,
+    (String, String, "+"): string_add,
+}
+
+INDEX_SPECIALIZATIONS = {
+    (Array, Integer): array_index,
+    (Hash, Integer): hash_index,
+    (Hash, String): hash_index,
+    (Hash, Boolean): hash_index,
+}
+
+
 def eval_bang_operator_expression(right):
     return to_bool(right in (FALSE, NULL))
 
@@ -235,7 +419,28 @@ def eval_bang_operator_expression(right):
 def eval_minus_prefix_operator_expression(right):
     if not isinstance(right, Integer):
         return Error(f"unknown operator: -{right.type().value}")
-    return Integer(-right.value)
+    return new_integer(-right.value)
+
+
+def eval_infix_expression(operator, left, right):
+    if isinstance(left, Integer) and isinstance(right, Integer):
+        return eval_integer_infix_expression(operator, left, right)
+    elif isinstance(left, String) and isinstance(right, String):
+        return eval_string_infix_expression(operator, left, right)
+    elif isinstance(left, IntArray) and isinstance(right, IntArray):
+        return eval_int_array_infix_expression(operator, left, right)
+    elif operator == "==":
+        return to_bool(left.value == right.value)
+    elif operator == "!=":
+        return to_bool(left.value != right.value)
+    elif left.type() != right.type():
+        return Error(
+            f"type mismatch: {left.type().value} {operator} {right.type().value}"
+        )
+    else:
+        return Error(
+            f"unknown operator: {left.type().value} {operator} {right.type().value}"
+        )
 
 
 def eval_string_infix_expression(operator, left, right):
@@ -243,7 +448,16 @@ def eval_string_infix_expression(operator, left, right):
         return Error(
             f"unknown operator: {left.type().value} {operator} {right.type().value}"
         )
-    return String(left.value + right.value)
+    return left.concat(right)
+
+
+def eval_int_array_infix_expression(operator, left, right):
+    op = VECTOR_OPERATORS.get(operator)
+    if op is None:
+        return Error(
+            f"unknown operator: {left.type().value} {operator} {right.type().value}"
+        )
+    return vector_operation(operator, op, left, right)
 
 
 def eval_index_expression(left, index):
@@ -251,21 +465,58 @@ def eval_index_expression(left, index):
         return eval_array_index_expression(left, index)
     elif isinstance(left, Hash):
         return eval_hash_index_expression(left, index)
+    elif isinstance(left, Sequence) and isinstance(index, Integer):
+        return left.get(index.value, NULL)
+    elif isinstance(left, IntArray) and isinstance(index, Integer):
+        return eval_int_array_index_expression(left, index)
     else:
         return Error(f"index operator not supported {left.type().value}")
 
 
 def eval_array_index_expression(array, index):
-    if index.value < 0 or index.value >= len(array.elements):
+    if index.value < 0 or index.value >= len(array):
+        return NULL
+    return array.get(index.value)
+
+
+def eval_int_array_index_expression(array, index):
+    if index.value < 0 or index.value >= len(array):
         return NULL
-    return array.elements[index.value]
+    return new_integer(array.get(index.value))
+
+
+def assign_index(left, index, value):
+    if isinstance(left, Array) and isinstance(index, Integer):
+        i = index.value
+        if i.__class__ is not int or i < 0 or i >= len(left):
+            return Error(f"index out of range: {i}")
+        left.assign(i, value)
+        return value
+    elif isinstance(left, Hash):
+        if not isinstance(index, Hashable):
+            return Error(f"unusable as hash key: {index.type().value}")
+        left.assign(index.hash_key(), HashPair(index, value))
+        return value
+    return Error(f"index assignment not supported: {left.type().value}")
+
+
+def iter_object(iterable):
+    if isinstance(iterable, (Array, Sequence)):
+        return iter(iterable)
+    elif isinstance(iterable, Hash):
+        return (pair.key for _, pair in iterable.hash_map.items())
+    elif isinstance(iterable, String):
+        return map(String, iterable.value)
+    elif isinstance(iterable, IntArray):
+        return map(new_integer, iterable)
+    return Error(f"iteration not supported: {iterable.type().value}")
 
 
 def eval_hash_index_expression(hash_obj, index):
     if not isinstance(index, Hashable):
         return Error(f"unusable as hash key: {index.type().value}")
 
-    pair = hash_obj.pairs.get(index.hash_key())
+    pair = hash_obj.get(index.hash_key())
     return pair.value if pair is not None else NULL
 
 
@@ -274,11 +525,11 @@ def eval_integer_infix_expression(operator, left, right):
     right_val = right.value
 
     if operator == "+":
-        return Integer(left_val + right_val)
+        return new_integer(left_val + right_val)
     elif operator == "-":
-        return Integer(left_val - right_val)
+        return new_integer(left_val - right_val)
     elif operator == "*":
-        return Integer(left_val * right_val)
+        return new_integer(left_val * right_val)
     elif operator == "/":
         return Integer(left_val / right_val)
     elif operator == "<":
@@ -304,23 +555,46 @@ def eval_prefix_expression(operator, right):
         return Error(f"unknown operator: {operator}{right.type().value}")
 
 
-def extend_function_env(fn, args):
-    env = Environment(fn.env)
-    for i, param in enumerate(fn.params):
-        env.set(param.value, args[i])
-    return env
+def extend_function_env(fn, args, frame=None):
+    check_arity(fn, args)
+    literal = fn.literal
+    if literal is None or literal.frame_size is None:
+        env = Environment(fn.env)
+        for i, param in enumerate(fn.params):
+            env.set(param.value, args[i])
+        return env
 
+    if frame is None:
+        env = Environment(fn.env, literal.frame_size)
+    else:
+        env = frame
+        env.slots[:] = [None] * literal.frame_size
 
-def unwrap_return_value(obj):
-    return obj.value if isinstance(obj, ReturnValue) else obj
+    slots = env.slots
+    for i in range(len(fn.params)):
+        slots[i] = args[i]
+    return env
 
 
-def is_truthy(obj):
-    return obj not in (NULL, FALSE)
+def check_arity(fn, args):
+    if len(args) < len(fn.params):
+        raise Abort(
+            Error(
+                f"wrong number of arguments: want={len(fn.params)}, "
+                f"got={len(args)}"
+            )
+        )
 
 
-def is_error(obj):
-    return obj is not None and isinstance(obj, Error)
+def can_reuse_frame(fn, callee):
+    return (
+        callee.__class__ is Function
+        and callee.literal is fn.literal
+        and callee.env is fn.env
+        and fn.literal is not None
+        and fn.literal.frame_size is not None
+        and not fn.literal.has_closures
+    )
 
 
 def to_bool(value):
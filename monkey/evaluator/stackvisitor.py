@@ -0,0 +1,531 @@
+from ast.ast import (
+    ArrayLiteral,
+    BlockStatement,
+    BooleanLiteral,
+    CallExpression,
+    ExpressionStatement,
+    ForExpression,
+    FunctionLiteral,
+    HashLiteral,
+    Identifier,
+    IfExpression,
+    IndexAssignment,
+    IndexExpression,
+    InfixExpression,
+    IntegerLiteral,
+    LetStatement,
+    PrefixExpression,
+    ReturnStatement,
+    StringLiteral,
+    WhileExpression,
+    iter_child_nodes,
+)
+from object.object import (
+    Array,
+    BuiltIn,
+    Error,
+    Function,
+    Hash,
+    Hashable,
+    HashPair,
+    ReturnValue,
+    String,
+    NULL,
+    TRUE,
+    FALSE,
+    new_integer,
+)
+from resolver.resolver import Resolver, SymbolScope
+from .closurecompiler import ClosureCompiler
+from .memo import MISSING, function_memo, memo_key
+from .nodevisitor import (
+    LOCAL,
+    Abort,
+    EarlyReturn,
+    assign_index,
+    check,
+    eval_identifier,
+    eval_prefix_expression,
+    extend_function_env,
+    iter_object,
+    quicken_index,
+    quicken_infix,
+)
+
+MAX_DEPTH = 100000
+
+EVAL = 0
+INFIX = 1
+CALL = 2
+BLOCK = 3
+RETURN = 4
+LET = 5
+IF = 6
+WHILE = 7
+PREFIX = 8
+INDEX = 9
+ARRAY = 10
+HASH_KEY = 11
+HASH = 12
+UNWRAP = 13
+LOOP = 14
+ASSIGN = 15
+FOR = 16
+NEXT = 17
+
+STOP = object()
+
+GLOBAL = SymbolScope.GLOBAL
+
+
+class StackVisitor:
+    def __init__(self, max_depth=MAX_DEPTH, memoize=True):
+        self.max_depth = max_depth
+        self.memoize = memoize
+        self.depth = 0
+        self.compiler = ClosureCompiler()
+        self.call_free = {}
+
+    def run(self, program, env):
+        Resolver(self.memoize).resolve(program)
+        self.depth = 0
+
+        result = self.visit(program, env)
+        if result.__class__ is ReturnValue:
+            return result.value
+        return result
+
+    def apply_function(self, fn, args):
+        if fn.__class__ is Function:
+            memo = function_memo(fn)
+            key = None if memo is None else memo_key(args)
+            if key is not None:
+                result = memo.get(key)
+                if result is not MISSING:
+                    return result
+            depth = self.depth
+            if depth >= self.max_depth:
+                raise Abort(
+                    Error(f"maximum call depth exceeded: {self.max_depth}")
+                )
+            self.depth = depth + 1
+            try:
+                result = self.visit(fn.body, extend_function_env(fn, args))
+            except RecursionError:
+                result = Error(f"maximum callback depth exceeded: {depth}")
+            finally:
+                self.depth = depth
+            if result.__class__ is ReturnValue:
+                result = result.value
+            if key is not None and result.__class__ is not Error:
+                memo.put(key, result)
+        elif fn.__class__ is BuiltIn:
+            if fn.callback:
+                result = fn.function(args, self.apply_function)
+            else:
+                result = fn.function(args)
+        else:
+            result = Error(f"not a function: {fn}")
+        return check(result)
+
+    def compile_call_free(self, node):
+        compiled = self.call_free.get(node, MISSING)
+        if compiled is MISSING:
+            if contains_call(node):
+                compiled = None
+            else:
+                compiled = self.compiler.visit(node)
+            self.call_free[node] = compiled
+        return compiled
+
+    def visit(self, node, env):
+        max_depth = self.max_depth
+        depth = self.depth
+
+        todo = [(BLOCK, node, env, 0)]
+        push = todo.append
+        pop = todo.pop
+
+        values = [None]
+        push_value = values.append
+        pop_value = values.pop
+
+        while todo:
+            op, node, env, extra = pop()
+
+            if op == EVAL:
+                cls = node.__class__
+                if cls is ExpressionStatement:
+                    node = node.expression
+                    cls = node.__class__
+
+                if cls is Identifier:
+                    scope = node.scope
+                    if scope is LOCAL:
+                        val = env.slots[node.slot]
+                    elif scope is GLOBAL:
+                        val = env.globals.store.get(node.value)
+                    else:
+                        val = None
+                    if val is None:
+                        val = eval_identifier(node, env)
+                    if val.__class__ is Error:
+                        return val
+                    push_value(val)
+
+                elif cls is IntegerLiteral:
+                    push_value(new_integer(node.value))
+
+                elif cls is InfixExpression:
+                    right = node.right
+                    if right.__class__ is IntegerLiteral:
+                        push((INFIX, node, env, new_integer(right.value)))
+                    else:
+                        push((INFIX, node, env, None))
+                        push((EVAL, right, env, None))
+
+                    left = node.left
+                    if left.__class__ is Identifier:
+                        scope = left.scope
+                        if scope is LOCAL:
+                            val = env.slots[left.slot]
+                        elif scope is GLOBAL:
+                            val = env.globals.store.get(left.value)
+                        else:
+                            val = None
+                        if val is not None:
+                            push_value(val)
+                            continue
+                    push((EVAL, left, env, None))
+
+                elif cls is CallExpression:
+                    push((CALL, node, env, None))
+                    args = node.args
+                    for i in range(len(args) - 1, -1, -1):
+                        push((EVAL, args[i], env, None))
+                    push((EVAL, node.function, env, None))
+
+                elif cls is BlockStatement:
+                    statements = node.statements
+                    if len(statements) == 1:
+                        push((EVAL, statements[0], env, None))
+                    else:
+                        push_value(None)
+                        push((BLOCK, node, env, 0))
+
+                elif cls is IfExpression:
+                    push((IF, node, env, None))
+                    push((EVAL, node.condition, env, None))
+
+                elif cls is ReturnStatement:
+                    push((RETURN, node, env, None))
+                    push((EVAL, node.return_value, env, None))
+
+                elif cls is LetStatement:
+                    push((LET, node, env, None))
+                    push((EVAL, node.value, env, None))
+
+                elif cls is WhileExpression:
+                    compiled = self.compile_call_free(node)
+                    if compiled is not None:
+                        try:
+                            push_value(compiled(env))
+                        except EarlyReturn as e:
+                            if not unwind(todo, values, e.value):
+                                return e.value
+                        except Abort as e:
+                            return e.error
+                        continue
+                    push((WHILE, node, env, None))
+                    push((EVAL, node.condition, env, None))
+
+                elif cls is ForExpression:
+                    push((FOR, node, env, None))
+                    push((EVAL, node.iterable, env, None))
+
+                elif cls is PrefixExpression:
+                    push((PREFIX, node, env, None))
+                    push((EVAL, node.right, env, None))
+
+                elif cls is IndexExpression:
+                    push((INDEX, node, env, None))
+                    push((EVAL, node.index, env, None))
+                    push((EVAL, node.left, env, None))
+
+                elif cls is IndexAssignment:
+                    push((ASSIGN, node, env, None))
+                    push((EVAL, node.value, env, None))
+                    push((EVAL, node.index, env, None))
+                    push((EVAL, node.left, env, None))
+
+                elif cls is BooleanLiteral:
+                    push_value(TRUE if node.value else FALSE)
+
+                elif cls is StringLiteral:
+                    push_value(String(node.value))
+
+                elif cls is FunctionLiteral:
+                    push_value(Function(node.params, node.body, env, node))
+
+                elif cls is ArrayLiteral:
+                    elements = node.elements
+                    push((ARRAY, node, env, len(elements)))
+                    for i in range(len(elements) - 1, -1, -1):
+                        push((EVAL, elements[i], env, None))
+
+                elif cls is HashLiteral:
+                    push((HASH, node, env, len(node.pairs)))
+                    for key, value in reversed(list(node.pairs.items())):
+                        push((EVAL, value, env, None))
+                        push((HASH_KEY, node, env, None))
+                        push((EVAL, key, env, None))
+
+                else:
+                    raise Exception(f"No visit_{cls.__name__} method")
+
+            elif op == INFIX:
+                right = pop_value() if extra is None else extra
+                left = values[-1]
+                quick = node.quick
+                if quick is not None:
+                    result = quick(left, right)
+                    if result is not None:
+                        values[-1] = result
+                        continue
+
+                result = quicken_infix(node, left, right)
+                if result.__class__ is Error:
+                    return result
+                values[-1] = result
+
+            elif op == CALL:
+                count = len(node.args)
+                if count:
+                    args = values[-count:]
+                    del values[-count:]
+                else:
+                    args = []
+                fn = pop_value()
+
+                if fn.__class__ is Function:
+                    memo = function_memo(fn)
+                    key = None if memo is None else memo_key(args)
+                    if key is not None:
+                        result = memo.get(key)
+                        if result is not MISSING:
+                            push_value(result)
+                            continue
+                    if depth >= max_depth:
+                        return Error(
+                            f"maximum call depth exceeded: {max_depth}"
+                        )
+                    try:
+                        fn_env = extend_function_env(fn, args)
+                    except Abort as e:
+                        return e.error
+                    depth = self.depth = depth + 1
+                    memoize = None if key is None else (memo, key)
+                    push((UNWRAP, len(values), None, memoize))
+                    push((EVAL, fn.body, fn_env, None))
+
+                elif fn.__class__ is BuiltIn:
+                    try:
+                        if fn.callback:
+                            result = fn.function(args, self.apply_function)
+                        else:
+                            result = fn.function(args)
+                    except Abort as e:
+                        return e.error
+                    if result.__class__ is Error:
+                        return result
+                    push_value(result)
+
+                else:
+                    return Error(f"not a function: {fn}")
+
+            elif op == UNWRAP:
+                depth = self.depth = depth - 1
+                result = values[-1]
+                if result.__class__ is ReturnValue:
+                    result = values[-1] = result.value
+                if extra is not None:
+                    extra[0].put(extra[1], result)
+
+            elif op == BLOCK:
+                statements = node.statements
+                if extra < len(statements):
+                    if values[-1].__class__ is ReturnValue:
+                        continue
+                    pop_value()
+                    push((BLOCK, node, env, extra + 1))
+                    push((EVAL, statements[extra], env, None))
+
+            elif op == IF:
+                condition = pop_value()
+                if condition is not NULL and condition is not FALSE:
+                    push((EVAL, node.consequence, env, None))
+                elif node.alternative is not None:
+                    push((EVAL, node.alternative, env, None))
+                else:
+                    push_value(NULL)
+
+            elif op == RETURN:
+                if node.unwinds:
+                    value = pop_value()
+                    if not unwind(todo, values, value):
+                        return value
+                else:
+                    values[-1] = ReturnValue(values[-1])
+
+            elif op == LET:
+                if node.scope is LOCAL:
+                    env.slots[node.slot] = values[-1]
+                else:
+                    env.set(node.name.value, values[-1])
+                values[-1] = None
+
+            elif op == WHILE:
+                condition = pop_value()
+                if condition is NULL or condition is FALSE:
+                    push_value(None)
+                else:
+                    push((LOOP, node, env, len(values)))
+                    push((EVAL, node.consequence, env, None))
+
+            elif op == LOOP:
+                pop_value()
+                push((WHILE, node, env, None))
+                push((EVAL, node.condition, env, None))
+
+            elif op == FOR:
+                items = iter_object(values[-1])
+                if items.__class__ is Error:
+                    return items
+                values[-1] = None
+
+                body = self.compile_call_free(node.body)
+                if body is None:
+                    push((NEXT, node, env, (items, len(values) - 1)))
+                    continue
+
+                try:
+                    if node.scope is LOCAL:
+                        slots = env.slots
+                        slot = node.slot
+                        for item in items:
+                            slots[slot] = item
+                            try:
+                                body(env)
+                            except EarlyReturn:
+                                pass
+                    else:
+                        store = env.store
+                        name = node.name.value
+                        for item in items:
+                            store[name] = item
+                            try:
+                                body(env)
+                            except EarlyReturn:
+                                pass
+                except Abort as e:
+                    return e.error
+
+            elif op == NEXT:
+                try:
+                    item = next(extra[0], STOP)
+                except Abort as e:
+                    return e.error
+                if item is STOP:
+                    values[-1] = None
+                    continue
+
+                if node.scope is LOCAL:
+                    env.slots[node.slot] = item
+                else:
+                    env.set(node.name.value, item)
+                pop_value()
+                push((NEXT, node, env, extra))
+                push((EVAL, node.body, env, None))
+
+            elif op == PREFIX:
+                result = eval_prefix_expression(node.operator, values[-1])
+                if result.__class__ is Error:
+                    return result
+                values[-1] = result
+
+            elif op == INDEX:
+                index = pop_value()
+                left = values[-1]
+                quick = node.quick
+                if quick is not None:
+                    result = quick(left, index)
+                    if result is not None:
+                        values[-1] = result
+                        continue
+
+                result = quicken_index(node, left, index)
+                if result.__class__ is Error:
+                    return result
+                values[-1] = result
+
+            elif op == ASSIGN:
+                value = pop_value()
+                index = pop_value()
+                result = assign_index(values[-1], index, value)
+                if result.__class__ is Error:
+                    return result
+                values[-1] = result
+
+            elif op == ARRAY:
+                if extra:
+                    elements = values[-extra:]
+                    del values[-extra:]
+                else:
+                    elements = []
+                push_value(Array(elements))
+
+            elif op == HASH_KEY:
+                key = values[-1]
+                if not isinstance(key, Hashable):
+                    return Error(f"unusable as hash key: {key.type().value}")
+
+            elif op == HASH:
+                pairs = {}
+                if extra:
+                    items = values[-2 * extra :]
+                    del values[-2 * extra :]
+                    for i in range(0, len(items), 2):
+                        key = items[i]
+                        pairs[key.hash_key()] = HashPair(key, items[i + 1])
+                push_value(Hash(pairs))
+
+        return values[-1]
+
+
+def unwind(todo, values, value):
+    while todo:
+        op, node, _, extra = todo[-1]
+        if op == UNWRAP:
+            height = node
+        elif op == LOOP:
+            height = extra
+        elif op == NEXT:
+            height = extra[1]
+        else:
+            todo.pop()
+            continue
+
+        del values[height:]
+        values.append(value)
+        return True
+    return False
+
+
+def contains_call(node):
+    if isinstance(node, CallExpression):
+        return True
+    return any(contains_call(child) for child in iter_child_nodes(node))
+
+
+def evaluate(program, env, max_depth=MAX_DEPTH, memoize=True):
+    return StackVisitor(max_depth, memoize).run(program, env)
@@ -0,0 +1,55 @@
+from .closurecompiler import ClosureCompiler
+
+CALL_THRESHOLD = 50
+LOOP_THRESHOLD = 200
+
+
+class Tiering:
+    def __init__(
+        self, call_threshold=CALL_THRESHOLD, loop_threshold=LOOP_THRESHOLD
+    ):
+        self.call_threshold = call_threshold
+        self.loop_threshold = loop_threshold
+        self.compiler = ClosureCompiler()
+        self.functions = []
+        self.loops = []
+
+    def call(self, visitor, fn, env):
+        fn.calls += 1
+        literal = fn.literal
+        if literal is None:
+            return visitor.visit(fn.body, env)
+
+        compiled = literal.compiled
+        if compiled is None:
+            if fn.calls < self.call_threshold:
+                return visitor.visit(fn.body, env)
+            compiled = literal.compiled = self.compiler.body(fn.body)
+            self.functions.append((literal, fn.calls))
+
+        return compiled(env)
+
+    def loop_is_hot(self, node):
+        if node.compiled is not None:
+            return True
+
+        node.iterations += 1
+        if node.iterations < self.loop_threshold:
+            return False
+
+        node.compiled = self.compiler.visit(node)
+        self.loops.append((node, node.iterations))
+        return True
+
+    def stats(self):
+        return {
+            "functions": [
+                {"name": literal.name or "<anonymous>", "calls": calls}
+                for literal, calls in self.functions
+            ],
+            "loops": [
+                {"condition": str(node.condition), "iterations": iterations}
+                for node, iterations in self.loops
+            ],
+        }
+
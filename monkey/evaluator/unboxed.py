@@ -0,0 +1,549 @@
+from operator import add, eq, gt, lt, mul, ne, sub, truediv
+
+from object.environment import Environment
+from object.object import (
+    Array,
+    BuiltIn,
+    Error,
+    Function,
+    Hash,
+    HashPair,
+    IntArray,
+    ReturnValue,
+    Sequence,
+    String,
+    NULL,
+    TRUE,
+    FALSE,
+    inspect,
+    native_hash_key,
+    new_integer,
+    type_name,
+)
+from resolver.resolver import Resolver
+from .builtin import NATIVE_BUILTIN
+from .memo import MISSING, function_memo
+from .nodevisitor import FREE, LOCAL, Abort, EarlyReturn, TailCall, check
+from .nodevisitor import check_arity
+from .nodevisitor import eval_int_array_infix_expression
+
+NOTHING = object()
+
+NUMBER_TYPES = (int, float)
+NATIVE_TYPES = (int, float, str, bool)
+
+FAST_OPERATORS = {
+    "+": add,
+    "-": sub,
+    "*": mul,
+    "/": truediv,
+    "<": lt,
+    ">": gt,
+    "==": eq,
+    "!=": ne,
+}
+
+
+class UnboxedCompiler:
+    def __init__(self, memoize=True):
+        self.memoize = memoize
+        self.bodies = {}
+
+    def compile(self, program):
+        Resolver(self.memoize).resolve(program)
+        statements = [self.visit(stmt) for stmt in program.statements]
+
+        def run(env):
+            result = NOTHING
+            try:
+                for stmt in statements:
+                    result = stmt(env)
+                    if result.__class__ is ReturnValue:
+                        return result.value
+            except EarlyReturn as e:
+                return e.value
+            except Abort as e:
+                return e.error
+            return result
+
+        return run
+
+    def visit(self, node):
+        method_name = "compile_" + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        raise Exception("No compile_{} method".format(type(node).__name__))
+
+    def compile_ExpressionStatement(self, node):
+        return self.visit(node.expression)
+
+    def compile_IntegerLiteral(self, node):
+        value = node.value
+        return lambda env: value
+
+    def compile_StringLiteral(self, node):
+        value = node.value
+        return lambda env: value
+
+    def compile_BooleanLiteral(self, node):
+        value = node.value
+        return lambda env: value
+
+    def compile_LetStatement(self, node):
+        value = self.visit(node.value)
+        name = node.name.value
+        slot = node.slot
+
+        if node.scope is LOCAL:
+
+            def let(env):
+                env.slots[slot] = value(env)
+                return NOTHING
+
+        else:
+
+            def let(env):
+                env.store[name] = value(env)
+                return NOTHING
+
+        return let
+
+    def compile_ReturnStatement(self, node):
+        value = self.visit(node.return_value)
+        if node.unwinds:
+
+            def unwind(env):
+                raise EarlyReturn(value(env))
+
+            return unwind
+
+        return lambda env: ReturnValue(value(env))
+
+    def compile_Identifier(self, node):
+        slot = node.slot
+
+        if node.scope is LOCAL:
+
+            def identifier(env):
+                val = env.slots[slot]
+                if val is NOTHING:
+                    return lookup(node, env)
+                return val
+
+        else:
+
+            def identifier(env):
+                return lookup(node, env)
+
+        return identifier
+
+    def compile_BlockStatement(self, node):
+        statements = [self.visit(stmt) for stmt in node.statements]
+
+        if len(statements) == 1:
+            return statements[0]
+
+        def block(env):
+            result = NOTHING
+            for stmt in statements:
+                result = stmt(env)
+                if result.__class__ is ReturnValue:
+                    return result
+            return result
+
+        return block
+
+    def compile_IfExpression(self, node):
+        condition = self.visit(node.condition)
+        consequence = self.visit(node.consequence)
+
+        if node.alternative is None:
+
+            def if_expression(env):
+                cond = condition(env)
+                if cond is None or cond is False:
+                    return None
+                return consequence(env)
+
+        else:
+            alternative = self.visit(node.alternative)
+
+            def if_expression(env):
+                cond = condition(env)
+                if cond is None or cond is False:
+                    return alternative(env)
+                return consequence(env)
+
+        return if_expression
+
+    def compile_WhileExpression(self, node):
+        condition = self.visit(node.condition)
+        consequence = self.visit(node.consequence)
+
+        def while_expression(env):
+            while True:
+                cond = condition(env)
+                if cond is None or cond is False:
+                    return NOTHING
+                try:
+                    consequence(env)
+                except EarlyReturn:
+                    pass
+
+        return while_expression
+
+    def compile_ForExpression(self, node):
+        iterable = self.visit(node.iterable)
+        body = self.visit(node.body)
+        name = node.name.value
+        slot = node.slot
+
+        if node.scope is LOCAL:
+
+            def for_expression(env):
+                slots = env.slots
+                for item in check(iter_native(iterable(env))):
+                    slots[slot] = item
+                    try:
+                        body(env)
+                    except EarlyReturn:
+                        pass
+                return NOTHING
+
+        else:
+
+            def for_expression(env):
+                store = env.store
+                for item in check(iter_native(iterable(env))):
+                    store[name] = item
+                    try:
+                        body(env)
+                    except EarlyReturn:
+                        pass
+                return NOTHING
+
+        return for_expression
+
+    def compile_PrefixExpression(self, node):
+        right = self.visit(node.right)
+        operator = node.operator
+
+        if operator == "!":
+
+            def prefix(env):
+                val = right(env)
+                return val is False or val is None
+
+        else:
+
+            def prefix(env):
+                return check(eval_native_prefix(operator, right(env)))
+
+        return prefix
+
+    def compile_InfixExpression(self, node):
+        left = self.visit(node.left)
+        right = self.visit(node.right)
+        operator = node.operator
+
+        fast = FAST_OPERATORS.get(operator)
+        if fast is None:
+
+            def infix(env):
+                lval = left(env)
+                rval = right(env)
+                return check(eval_native_infix(operator, lval, rval))
+
+        else:
+
+            def infix(env):
+                lval = left(env)
+                rval = right(env)
+                if type(lval) is int and type(rval) is int:
+                    return fast(lval, rval)
+                return check(eval_native_infix(operator, lval, rval))
+
+        return infix
+
+    def compile_IndexExpression(self, node):
+        left = self.visit(node.left)
+        index = self.visit(node.index)
+
+        def index_expression(env):
+            obj = left(env)
+            idx = index(env)
+            if obj.__class__ is Array and type(idx) is int:
+                return obj.get(idx) if 0 <= idx < len(obj) else None
+            return check(eval_native_index(obj, idx))
+
+        return index_expression
+
+    def compile_IndexAssignment(self, node):
+        left = self.visit(node.left)
+        index = self.visit(node.index)
+        value = self.visit(node.value)
+
+        def index_assignment(env):
+            obj = left(env)
+            idx = index(env)
+            return check(assign_native_index(obj, idx, value(env)))
+
+        return index_assignment
+
+    def compile_ArrayLiteral(self, node):
+        elements = [self.visit(elem) for elem in node.elements]
+        return lambda env: Array([elem(env) for elem in elements])
+
+    def compile_HashLiteral(self, node):
+        pairs = [(self.visit(k), self.visit(v)) for k, v in node.pairs.items()]
+
+        def hash_literal(env):
+            result = {}
+            for key_code, value_code in pairs:
+                key = key_code(env)
+                hashed = native_hash_key(key)
+                if hashed is None:
+                    raise Abort(
+                        Error(f"unusable as hash key: {type_name(key)}")
+                    )
+                result[hashed] = HashPair(key, value_code(env))
+            return Hash(result)
+
+        return hash_literal
+
+    def compile_FunctionLiteral(self, node):
+        params = node.params
+        body = node.body
+        self.body(body)
+        return lambda env: Function(params, body, env, node)
+
+    def compile_CallExpression(self, node):
+        function = self.visit(node.function)
+        args = [self.visit(arg) for arg in node.args]
+        apply_function = self.apply_function
+
+        if node.tail:
+
+            def call(env):
+                fn = function(env)
+                return TailCall(fn, [arg(env) for arg in args])
+
+        else:
+
+            def call(env):
+                fn = function(env)
+                return apply_function(fn, [arg(env) for arg in args])
+
+        return call
+
+    def body(self, block):
+        body = self.bodies.get(block)
+        if body is None:
+            body = self.bodies[block] = self.visit(block)
+        return body
+
+    def apply_function(self, fn, values):
+        if fn.__class__ is Function:
+            memo = function_memo(fn)
+            if memo is not None:
+                key = native_memo_key(values)
+                if key is not None:
+                    result = memo.get(key)
+                    if result is MISSING:
+                        result = self.call_function(fn, values)
+                        memo.put(key, result)
+                    return result
+
+        return self.call_function(fn, values)
+
+    def call_function(self, fn, values):
+        while True:
+            if fn.__class__ is Function:
+                env = extend_native_env(fn, values)
+                try:
+                    result = self.body(fn.body)(env)
+                except EarlyReturn as e:
+                    result = e.value
+                if result.__class__ is ReturnValue:
+                    result = result.value
+                if result.__class__ is not TailCall:
+                    return result
+                fn, values = result.fn, result.args
+
+            elif fn.__class__ is BuiltIn:
+                if fn.callback:
+                    return check(fn.function(values, self.apply_function))
+                return check(fn.function(values))
+
+            else:
+                raise Abort(Error(f"not a function: {inspect(fn)}"))
+
+
+def evaluate(program, env, memoize=True):
+    return box(UnboxedCompiler(memoize).compile(program)(env))
+
+
+def box(value):
+    cls = value.__class__
+    if cls is int or cls is float:
+        return new_integer(value)
+    elif cls is str:
+        return String(value)
+    elif cls is bool:
+        return TRUE if value else FALSE
+    elif value is None:
+        return NULL
+    elif value is NOTHING:
+        return None
+    return value
+
+
+def lookup(node, env):
+    scope = node.scope
+    name = node.value
+    if scope is LOCAL:
+        val = env.slots[node.slot]
+    elif scope is FREE:
+        frame = env
+        for _ in range(node.depth):
+            frame = frame.outer
+        val = frame.slots[node.slot]
+    elif scope is None:
+        val = lookup_store(env, name)
+    else:
+        val = env.globals.store.get(name, NOTHING)
+
+    if val is not NOTHING:
+        return val
+
+    for depth, slot in node.fallbacks:
+        frame = env
+        for _ in range(depth):
+            frame = frame.outer
+        val = frame.slots[slot]
+        if val is not NOTHING:
+            return val
+
+    if scope is LOCAL or scope is FREE:
+        val = env.globals.store.get(name, NOTHING)
+        if val is not NOTHING:
+            return val
+
+    val = NATIVE_BUILTIN.get(name)
+    if val is not None:
+        return val
+
+    raise Abort(Error(f"identifier not found: {name}"))
+
+
+def lookup_store(env, name):
+    while env is not None:
+        val = env.store.get(name, NOTHING)
+        if val is not NOTHING:
+            return val
+        env = env.outer
+    return NOTHING
+
+
+def extend_native_env(fn, args):
+    check_arity(fn, args)
+    literal = fn.literal
+    if literal is None or literal.frame_size is None:
+        env = Environment(fn.env)
+        for i, param in enumerate(fn.params):
+            env.store[param.value] = args[i]
+        return env
+
+    env = Environment(fn.env, literal.frame_size, NOTHING)
+    slots = env.slots
+    for i in range(len(fn.params)):
+        slots[i] = args[i]
+    return env
+
+
+def eval_native_infix(operator, left, right):
+    left_type = left.__class__
+    right_type = right.__class__
+
+    if left_type in NUMBER_TYPES and right_type in NUMBER_TYPES:
+        fast = FAST_OPERATORS.get(operator)
+        if fast is not None:
+            return fast(left, right)
+    elif left_type is str and right_type is str:
+        if operator == "+":
+            return left + right
+    elif left_type is IntArray and right_type is IntArray:
+        return eval_int_array_infix_expression(operator, left, right)
+    elif operator == "==":
+        return native_value(left) == native_value(right)
+    elif operator == "!=":
+        return native_value(left) != native_value(right)
+    elif type_name(left) != type_name(right):
+        return Error(
+            f"type mismatch: {type_name(left)} {operator} {type_name(right)}"
+        )
+
+    return Error(
+        f"unknown operator: {type_name(left)} {operator} {type_name(right)}"
+    )
+
+
+def eval_native_prefix(operator, right):
+    if operator == "-" and right.__class__ in NUMBER_TYPES:
+        return -right
+    return Error(f"unknown operator: {operator}{type_name(right)}")
+
+
+def eval_native_index(left, index):
+    if left.__class__ is Array and index.__class__ in NUMBER_TYPES:
+        return left.get(index) if 0 <= index < len(left) else None
+    elif left.__class__ is Hash:
+        hashed = native_hash_key(index)
+        if hashed is None:
+            return Error(f"unusable as hash key: {type_name(index)}")
+        pair = left.get(hashed)
+        return pair.value if pair is not None else None
+    elif left.__class__ is Sequence and type(index) is int:
+        return left.get(index)
+    elif left.__class__ is IntArray and type(index) is int:
+        return left.get(index) if 0 <= index < len(left) else None
+    return Error(f"index operator not supported {type_name(left)}")
+
+
+def assign_native_index(left, index, value):
+    if left.__class__ is Array and type(index) is int:
+        if index < 0 or index >= len(left):
+            return Error(f"index out of range: {index}")
+        left.assign(index, value)
+        return value
+    elif left.__class__ is Hash:
+        hashed = native_hash_key(index)
+        if hashed is None:
+            return Error(f"unusable as hash key: {type_name(index)}")
+        left.assign(hashed, HashPair(index, value))
+        return value
+    return Error(f"index assignment not supported: {type_name(left)}")
+
+
+def iter_native(iterable):
+    cls = iterable.__class__
+    if cls is Array or cls is Sequence or cls is IntArray or cls is str:
+        return iter(iterable)
+    elif cls is Hash:
+        return (pair.key for _, pair in iterable.hash_map.items())
+    return Error(f"iteration not supported: {type_name(iterable)}")
+
+
+def native_value(value):
+    if value.__class__ in NATIVE_TYPES:
+        return value
+    return value.value
+
+
+def native_memo_key(args):
+    for arg in args:
+        if arg.__class__ not in NATIVE_TYPES:
+            return None
+    return tuple((arg.__class__, arg) for arg in args)
@@ -1,10 +1,166 @@
+import codecs
+import re
+
 from tok.tok import Token, lookup_identifier
 
 WHITE_SPACE = (" ", "\n", "\t", "\r")
 EOF = "\0"
 
+CHUNK_SIZE = 1 << 16
+
+TOKEN_PATTERN = re.compile(
+    r"""
+    \s*
+    (
+        (?:%s)(?![A-Za-z_\x80-\U0010ffff])
+      | [A-Za-z_]+(?![A-Za-z_\x80-\U0010ffff])(?:!(?!=))?
+      | ==|!=|[-+!*/<>;:,(){}\[\]=]
+      | [0-9]+(?![0-9\x80-\U0010ffff])
+      | "[^"\0]*["\0]?
+      | [^\sA-Za-z0-9_\x80-\U0010ffff]
+    )?
+    """
+    % "|".join(Token.KEYWORDS),
+    re.VERBOSE,
+)
+
+OPERATORS = {
+    "==": Token.EQ,
+    "!=": Token.NOT_EQ,
+    "=": Token.ASSIGN,
+    "+": Token.PLUS,
+    "-": Token.MINUS,
+    "!": Token.BANG,
+    "*": Token.ASTERISK,
+    "/": Token.SLASH,
+    "<": Token.LT,
+    ">": Token.GT,
+    ";": Token.SEMICOLON,
+    ":": Token.COLON,
+    ",": Token.COMMA,
+    "(": Token.LPAREN,
+    ")": Token.RPAREN,
+    "{": Token.LBRACE,
+    "}": Token.RBRACE,
+    "[": Token.LBRACKET,
+    "]": Token.RBRACKET,
+}
+
+TOKEN_TYPES = dict(OPERATORS, **Token.KEYWORDS)
+
+TOKENS = {text: Token(kind, text) for text, kind in TOKEN_TYPES.items()}
+TOKENS[EOF] = EOF_TOKEN = Token(Token.EOF, "")
+
 
 class Lexer:
+    def __init__(self, code):
+        self.chunks = iter((code,))
+        self.tokens = self.scan()
+
+    def next_token(self):
+        return next(self.tokens)
+
+    def scan(self):
+        chunks = self.chunks
+        tokens = TOKENS
+        code = ""
+        position = 0
+        more = True
+        refill = True
+
+        while True:
+            if refill and more:
+                chunk = next(chunks, None)
+                if chunk is None:
+                    more = False
+                else:
+                    code = code[position:] + chunk
+                    position = 0
+            limit = len(code) if more else -1
+
+            for match in TOKEN_PATTERN.finditer(code, position):
+                if match.end() == limit:
+                    position = match.start()
+                    break
+
+                text = match[1]
+                token = tokens.get(text)
+                if token is not None:
+                    yield token
+                elif text is None:
+                    position = match.end()
+                    break
+                else:
+                    yield scan_token(text)
+
+            refill = match.end() == limit
+            if refill:
+                continue
+            elif position == len(code):
+                while True:
+                    yield EOF_TOKEN
+
+            lexer = CharLexer(code)
+            lexer.read_position = position
+            lexer.read_char()
+            tok = lexer.next_token()
+
+            refill = lexer.position == limit
+            if not refill:
+                yield tok
+                position = lexer.position
+
+
+class StreamLexer(Lexer):
+    def __init__(self, source, chunk_size=CHUNK_SIZE):
+        self.chunks = decode_chunks(read_chunks(source, chunk_size))
+        self.tokens = self.scan()
+
+
+def read_chunks(source, chunk_size=CHUNK_SIZE):
+    if isinstance(source, str):
+        yield source
+        return
+
+    read = getattr(source, "read", None)
+    if read is None:
+        yield from source
+        return
+
+    while True:
+        chunk = read(chunk_size)
+        if not chunk:
+            return
+        yield chunk
+
+
+def decode_chunks(chunks):
+    decoder = None
+    for chunk in chunks:
+        if not isinstance(chunk, str):
+            if decoder is None:
+                decoder = codecs.getincrementaldecoder("utf-8")()
+            chunk = decoder.decode(chunk)
+        yield chunk
+
+    if decoder is not None:
+        yield decoder.decode(b"", True)
+
+
+def scan_token(text):
+    ch = text[0]
+    if ch.isalpha() or ch == "_":
+        return Token(Token.IDENT, text)
+    elif ch.isdigit():
+        return Token(Token.INT, text)
+    elif ch == '"':
+        if len(text) > 1 and (text[-1] == '"' or text[-1] == EOF):
+            return Token(Token.STRING, text[1:-1])
+        return Token(Token.STRING, text[1:])
+    return Token(Token.ILLEGAL, text)
+
+
+class CharLexer:
     def __init__(self, code):
         self.code = code
         self.position = 0
@@ -114,10 +270,17 @@ class Lexer:
             if self.ch == EOF:
                 break
 
+        ident = self.code[pos : self.position]
+        if ident in Token.KEYWORDS:
+            return ident
+
+        if self.ch == "!" and self.peek_char() != "=":
+            self.read_char()
+
         return self.code[pos : self.position]
 
     def peek_char(self):
-        if self.position >= len(self.code):
+        if self.read_position >= len(self.code):
             return EOF
         else:
             return self.code[self.position + 1]
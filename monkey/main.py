@@ -1,32 +1,73 @@
+import argparse
 import sys
 
-from evaluator.nodevisitor import NodeVisitor
-from lexer.lexer import Lexer
+from compiler.compiler import Compiler
+from compiler.symbol_table import SymbolTable
+from evaluator.closurecompiler import ClosureCompiler
+from evaluator.nodevisitor import evaluate
+from evaluator.stackvisitor import MAX_DEPTH, StackVisitor
+from evaluator.tiering import Tiering
+from evaluator.unboxed import evaluate as evaluate_unboxed
+from lexer.lexer import StreamLexer
 from object.environment import Environment
+from optimizer.optimizer import optimize
 from parser.parser import Parser
+from transpile.runtime import run as run_script
+from transpile.transpile import CodeCache
+from vm.vm import VM
+
+ENGINES = ("eval", "stack", "closure", "vm", "python", "unboxed")
+
+CODE_CACHE = CodeCache()
+STACK_VISITOR = StackVisitor()
+TIERING = Tiering()
+OPTIONS = {"optimize": True, "tiering": True, "memoize": True}
 
 
 def main():
-    if len(sys.argv) > 1:
-        program = open_file_or_fail(sys.argv[1])
-        run_program(program)
+    arg_parser = argparse.ArgumentParser(prog="monkey")
+    arg_parser.add_argument("file", nargs="?")
+    arg_parser.add_argument("--engine", choices=ENGINES, default="eval")
+    arg_parser.add_argument("--cache-dir")
+    arg_parser.add_argument("--max-depth", type=int, default=MAX_DEPTH)
+    arg_parser.add_argument("--no-optimize", action="store_true")
+    arg_parser.add_argument("--no-tiering", action="store_true")
+    arg_parser.add_argument("--tier-stats", action="store_true")
+    arg_parser.add_argument("--no-memo", action="store_true")
+    args = arg_parser.parse_args()
+
+    if args.cache_dir is not None:
+        CODE_CACHE.cache_dir = args.cache_dir
+    STACK_VISITOR.max_depth = args.max_depth
+    STACK_VISITOR.memoize = not args.no_memo
+    CODE_CACHE.optimize = not args.no_optimize
+    OPTIONS["optimize"] = not args.no_optimize
+    OPTIONS["tiering"] = not args.no_tiering
+    OPTIONS["memoize"] = not args.no_memo
+
+    if args.file is not None:
+        with open_file_or_fail(args.file) as f:
+            program = f.read() if args.engine == "python" else f
+            run_program(program, engine=args.engine)
     else:
-        repl()
+        repl(engine=args.engine)
+
+    if args.tier_stats:
+        print_tier_stats()
 
 
 def open_file_or_fail(file):
     try:
-        with open(file, "r") as f:
-            return f.read()
+        return open(file, "r")
     except OSError as e:
         print(f"Could not open {file}!")
         sys.exit(e.errno)
 
 
-def repl():
+def repl(engine="eval"):
     print("Use exit() or Ctrl-D (i.e. EOF) to exit")
 
-    env = Environment()
+    env = new_environment(engine)
 
     while True:
         try:
@@ -37,14 +78,37 @@ def repl():
         if i == "exit()":
             return
 
-        run_program(i, env)
+        run_program(i, env, engine)
+
+
+def new_environment(engine):
+    if engine == "vm":
+        return VMState()
+    return Environment()
+
+
+class VMState:
+    def __init__(self):
+        self.symbol_table = SymbolTable()
+        self.constants = []
+        self.globals = []
 
 
-def run_program(p, env=None):
-    env = Environment() if env is None else env
+def run_program(p, env=None, engine="eval"):
+    env = new_environment(engine) if env is None else env
 
-    evaluator = NodeVisitor()
-    lexer = Lexer(p)
+    if engine == "python":
+        script = CODE_CACHE.load(p)
+        if script is None:
+            CODE_CACHE.print_errors()
+            return
+
+        evaluated = run_script(script, env)
+        if evaluated is not None:
+            print(evaluated)
+        return
+
+    lexer = StreamLexer(p)
     parser = Parser(lexer)
     program = parser.parse_program()
 
@@ -52,11 +116,38 @@ def run_program(p, env=None):
         parser.print_errors()
         return
 
-    evaluated = evaluator.evaluate(program, env)
+    if OPTIONS["optimize"]:
+        program = optimize(program)
+
+    if engine == "vm":
+        compiler = Compiler(env.symbol_table, env.constants)
+        compiler.compile(program)
+        machine = VM(compiler.bytecode(), env.symbol_table, env.globals)
+        evaluated = machine.run()
+    elif engine == "stack":
+        evaluated = STACK_VISITOR.run(program, env)
+    elif engine == "closure":
+        evaluated = ClosureCompiler().compile(program)(env)
+    elif engine == "unboxed":
+        evaluated = evaluate_unboxed(program, env, OPTIONS["memoize"])
+    else:
+        tiering = TIERING if OPTIONS["tiering"] else None
+        evaluated = evaluate(program, env, tiering, OPTIONS["memoize"])
 
     if evaluated is not None:
         print(evaluated)
 
 
+def print_tier_stats():
+    stats = TIERING.stats()
+    for fn in stats["functions"]:
+        print(f"promoted function {fn['name']} after {fn['calls']} calls")
+    for loop in stats["loops"]:
+        print(
+            f"promoted loop {loop['condition']} "
+            f"after {loop['iterations']} iterations"
+        )
+
+
 if __name__ == "__main__":
     main()
@@ -1,8 +1,17 @@
 class Environment:
-    def __init__(self, outer=None):
+    __slots__ = ("store", "outer", "slots", "globals")
+
+    def __init__(self, outer=None, size=None, fill=None):
         self.store = {}
         self.outer = outer
 
+        if size is None:
+            self.slots = None
+            self.globals = self
+        else:
+            self.slots = [fill] * size
+            self.globals = self if outer is None else outer.globals
+
     def get(self, name):
         result = self.store.get(name)
         if result is None and self.outer is not None:
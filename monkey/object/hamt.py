@@ -0,0 +1,183 @@
+BITS = 5
+MASK = (1 << BITS) - 1
+
+
+class BitmapNode:
+    __slots__ = ("bitmap", "array")
+
+    def __init__(self, bitmap=0, array=()):
+        self.bitmap = bitmap
+        self.array = array
+
+    def find(self, shift, h, key):
+        bit = 1 << ((h >> shift) & MASK)
+        if not self.bitmap & bit:
+            return None
+
+        child = self.array[bin(self.bitmap & (bit - 1)).count("1")]
+        if child.__class__ is tuple:
+            return child if child[0] == key else None
+        return child.find(shift + BITS, h, key)
+
+    def set(self, shift, h, entry):
+        bit = 1 << ((h >> shift) & MASK)
+        index = bin(self.bitmap & (bit - 1)).count("1")
+        array = self.array
+
+        if not self.bitmap & bit:
+            array = array[:index] + (entry,) + array[index:]
+            return BitmapNode(self.bitmap | bit, array), True
+
+        child = array[index]
+        if child.__class__ is tuple:
+            if child[0] == entry[0]:
+                child = (entry[0], entry[1], child[2])
+                added = False
+            else:
+                child = merge_entries(shift + BITS, child, entry)
+                added = True
+        else:
+            child, added = child.set(shift + BITS, h, entry)
+
+        array = array[:index] + (child,) + array[index + 1 :]
+        return BitmapNode(self.bitmap, array), added
+
+    def delete(self, shift, h, key):
+        bit = 1 << ((h >> shift) & MASK)
+        if not self.bitmap & bit:
+            return self
+
+        index = bin(self.bitmap & (bit - 1)).count("1")
+        array = self.array
+        child = array[index]
+        if child.__class__ is tuple:
+            if child[0] != key:
+                return self
+            child = None
+        else:
+            new_child = child.delete(shift + BITS, h, key)
+            if new_child is child:
+                return self
+            child = new_child
+
+        if child is not None:
+            array = array[:index] + (child,) + array[index + 1 :]
+            return BitmapNode(self.bitmap, array)
+        if self.bitmap == bit:
+            return None
+        array = array[:index] + array[index + 1 :]
+        return BitmapNode(self.bitmap ^ bit, array)
+
+    def entries(self):
+        for child in self.array:
+            if child.__class__ is tuple:
+                yield child
+            else:
+                yield from child.entries()
+
+
+class CollisionNode:
+    __slots__ = ("hash", "array")
+
+    def __init__(self, h, array):
+        self.hash = h
+        self.array = array
+
+    def find(self, shift, h, key):
+        for entry in self.array:
+            if entry[0] == key:
+                return entry
+        return None
+
+    def set(self, shift, h, entry):
+        if h != self.hash:
+            bit = 1 << ((self.hash >> shift) & MASK)
+            return BitmapNode(bit, (self,)).set(shift, h, entry)
+
+        array = self.array
+        for i, old in enumerate(array):
+            if old[0] == entry[0]:
+                entry = (entry[0], entry[1], old[2])
+                array = array[:i] + (entry,) + array[i + 1 :]
+                return CollisionNode(h, array), False
+        return CollisionNode(h, array + (entry,)), True
+
+    def delete(self, shift, h, key):
+        array = tuple(entry for entry in self.array if entry[0] != key)
+        if len(array) == len(self.array):
+            return self
+        if not array:
+            return None
+        return CollisionNode(self.hash, array)
+
+    def entries(self):
+        return iter(self.array)
+
+
+class PersistentHashMap:
+    __slots__ = ("count", "root", "order", "ordered")
+
+    def __init__(self, count=0, root=None, order=0):
+        self.count = count
+        self.root = root
+        self.order = order
+        self.ordered = None
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        return (key for key, _ in self.items())
+
+    def items(self):
+        if self.ordered is None:
+            if self.root is None:
+                self.ordered = ()
+            else:
+                entries = sorted(
+                    self.root.entries(), key=lambda entry: entry[2]
+                )
+                self.ordered = tuple(
+                    (key, value) for key, value, _ in entries
+                )
+        return self.ordered
+
+    def get(self, key, default=None):
+        if self.root is None:
+            return default
+        entry = self.root.find(0, hash(key), key)
+        return default if entry is None else entry[1]
+
+    def set(self, key, value):
+        root = self.root if self.root is not None else BitmapNode()
+        entry = (key, value, self.order)
+        root, added = root.set(0, hash(key), entry)
+        if not added:
+            return PersistentHashMap(self.count, root, self.order)
+        return PersistentHashMap(self.count + 1, root, self.order + 1)
+
+    def delete(self, key):
+        if self.root is None:
+            return self
+        root = self.root.delete(0, hash(key), key)
+        if root is self.root:
+            return self
+        return PersistentHashMap(self.count - 1, root, self.order)
+
+
+def merge_entries(shift, first, second):
+    first_hash = hash(first[0])
+    second_hash = hash(second[0])
+    if first_hash == second_hash:
+        return CollisionNode(first_hash, (first, second))
+
+    node, _ = BitmapNode().set(shift, first_hash, first)
+    node, _ = node.set(shift, second_hash, second)
+    return node
+
+
+def map_from_dict(pairs):
+    hash_map = PersistentHashMap()
+    for key, value in pairs.items():
+        hash_map = hash_map.set(key, value)
+    return hash_map
@@ -0,0 +1,71 @@
+from array import array
+from itertools import compress, repeat
+from operator import mul
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+TYPECODE = "q"
+INT64_MAX = (1 << 63) - 1
+
+
+def from_values(values):
+    data = array(TYPECODE, values)
+    if numpy is not None:
+        return numpy.frombuffer(data, dtype=numpy.int64)
+    return data
+
+
+def magnitude(data):
+    if len(data) == 0:
+        return 0
+    return max(-int(data.min()), int(data.max()))
+
+
+def exact(data):
+    return data.astype(object)
+
+
+def total(data):
+    if numpy is not None:
+        if len(data) * magnitude(data) > INT64_MAX:
+            data = exact(data)
+        return int(data.sum())
+    return sum(data)
+
+
+def dot(left, right):
+    if numpy is not None:
+        bound = len(left) * magnitude(left) * magnitude(right)
+        if bound > INT64_MAX:
+            left, right = exact(left), exact(right)
+        return int(numpy.dot(left, right))
+    return sum(map(mul, left, right))
+
+
+def fits(op, left, right):
+    return max(abs(op(left, right)), abs(op(left, -right))) <= INT64_MAX
+
+
+def elementwise(op, left, right):
+    if numpy is not None:
+        if fits(op, magnitude(left), magnitude(right)):
+            return op(left, right)
+        return from_values(op(exact(left), exact(right)))
+    return array(TYPECODE, map(op, left, right))
+
+
+def broadcast(op, data, value):
+    if numpy is not None:
+        if fits(op, magnitude(data), abs(value)):
+            return op(data, value)
+        return from_values(op(exact(data), value))
+    return array(TYPECODE, map(op, data, repeat(value, len(data))))
+
+
+def select_greater(data, value):
+    if numpy is not None:
+        return data[data > value]
+    return array(TYPECODE, compress(data, map(value.__lt__, data)))
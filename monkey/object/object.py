@@ -1,4 +1,13 @@
 from enum import Enum
+from itertools import islice
+
+from .hamt import map_from_dict
+from .vector import vector_from_list
+
+
+FLAT_STRING_LENGTH = 64
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 1024
 
 
 class ObjectType(Enum):
@@ -10,24 +19,33 @@ class ObjectType(Enum):
 
     ARRAY = "ARRAY"
     HASH = "HASH"
+    SEQUENCE = "SEQUENCE"
+    INT_ARRAY = "INT_ARRAY"
 
     RETURN_VALUE = "RETURN_VALUE"
     FUNCTION = "FUNCTION"
     BUILTIN = "BUILTIN"
+    COMPILED_FUNCTION = "COMPILED_FUNCTION"
     ERROR = "ERROR"
 
 
 class Object:
+    __slots__ = ()
+
     def type(self):
         raise NotImplementedError()
 
 
 class Hashable:
+    __slots__ = ()
+
     def hash_key(self):
         raise NotImplementedError()
 
 
 class Integer(Object, Hashable):
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -38,12 +56,18 @@ class Integer(Object, Hashable):
         return str(self.value)
 
     def hash_key(self):
-        return HashKey(self.type(), hash(self.value))
+        key = INTEGER_KEYS.get(self.value)
+        if key is None:
+            return HashKey(ObjectType.INTEGER, self.value)
+        return key
 
 
 class Boolean(Object, Hashable):
+    __slots__ = ("value", "key")
+
     def __init__(self, value):
         self.value = value
+        self.key = HashKey(ObjectType.BOOLEAN, 1 if value else 0)
 
     def type(self):
         return ObjectType.BOOLEAN
@@ -52,11 +76,12 @@ class Boolean(Object, Hashable):
         return str(self.value).lower()
 
     def hash_key(self):
-        value = 1 if self.value else 0
-        return HashKey(self.type(), value)
+        return self.key
 
 
 class Null(Object):
+    __slots__ = ()
+
     def type(self):
         return ObjectType.NULL
 
@@ -65,6 +90,8 @@ class Null(Object):
 
 
 class ReturnValue(Object):
+    __slots__ = ("value",)
+
     def __init__(self, value):
         self.value = value
 
@@ -76,6 +103,8 @@ class ReturnValue(Object):
 
 
 class Error(Object):
+    __slots__ = ("message",)
+
     def __init__(self, message):
         self.message = message
 
@@ -87,10 +116,15 @@ class Error(Object):
 
 
 class Function(Object):
-    def __init__(self, params, body, env):
+    __slots__ = ("params", "body", "env", "literal", "calls", "memo")
+
+    def __init__(self, params, body, env, literal=None):
         self.params = params
         self.body = body
         self.env = env
+        self.literal = literal
+        self.calls = 0
+        self.memo = None
 
     def type(self):
         return ObjectType.FUNCTION
@@ -103,10 +137,115 @@ class Function(Object):
         return fn
 
 
-class String(Object, Hashable):
-    def __init__(self, value):
+class CompiledFunction(Object):
+    __slots__ = (
+        "instructions",
+        "num_locals",
+        "num_params",
+        "cell_slots",
+        "fallbacks",
+        "params",
+        "body",
+    )
+
+    def __init__(
+        self,
+        instructions,
+        num_locals=0,
+        num_params=0,
+        cell_slots=(),
+        fallbacks=None,
+        params=(),
+        body=None,
+    ):
+        self.instructions = instructions
+        self.num_locals = num_locals
+        self.num_params = num_params
+        self.cell_slots = cell_slots
+        self.fallbacks = fallbacks if fallbacks is not None else {}
+        self.params = params
+        self.body = body
+
+    def type(self):
+        return ObjectType.COMPILED_FUNCTION
+
+    def __str__(self):
+        return f"CompiledFunction[{id(self)}]"
+
+
+class Closure(Object):
+    __slots__ = ("fn", "free", "memo")
+
+    def __init__(self, fn, free):
+        self.fn = fn
+        self.free = free
+        self.memo = None
+
+    def type(self):
+        return ObjectType.FUNCTION
+
+    def __str__(self):
+        fn = f"fn({', '.join(str(p) for p in self.fn.params)}) "
+        fn += "{"
+        fn += f"  {str(self.fn.body)}  "
+        fn += "}"
+        return fn
+
+
+class Cell:
+    __slots__ = ("value",)
+
+    def __init__(self, value=None):
         self.value = value
 
+
+class String(Object, Hashable):
+    __slots__ = ("flat", "left", "right", "length", "key")
+
+    def __init__(self, value="", left=None, right=None):
+        self.left = left
+        self.right = right
+        self.key = None
+        if left is None:
+            self.flat = value
+            self.length = len(value)
+        else:
+            self.flat = None
+            self.length = left.length + right.length
+
+    @property
+    def value(self):
+        if self.flat is None:
+            self.flatten()
+        return self.flat
+
+    def __len__(self):
+        return self.length
+
+    def concat(self, other):
+        if other.length == 0:
+            return self
+        if self.length == 0:
+            return other
+        if self.length + other.length <= FLAT_STRING_LENGTH:
+            return String(self.value + other.value)
+        return String(left=self, right=other)
+
+    def flatten(self):
+        parts = []
+        todo = [self]
+        while todo:
+            node = todo.pop()
+            if node.flat is not None:
+                parts.append(node.flat)
+            else:
+                todo.append(node.right)
+                todo.append(node.left)
+
+        self.flat = "".join(parts)
+        self.left = None
+        self.right = None
+
     def type(self):
         return ObjectType.STRING
 
@@ -114,12 +253,18 @@ class String(Object, Hashable):
         return self.value
 
     def hash_key(self):
-        return HashKey(self.type(), hash(self.value))
+        key = self.key
+        if key is None:
+            key = self.key = HashKey(ObjectType.STRING, self.value)
+        return key
 
 
 class BuiltIn(Object):
-    def __init__(self, function):
+    __slots__ = ("function", "callback")
+
+    def __init__(self, function, callback=False):
         self.function = function
+        self.callback = callback
 
     def type(self):
         return ObjectType.BUILTIN
@@ -129,66 +274,269 @@ class BuiltIn(Object):
 
 
 class Array(Object):
-    def __init__(self, elements):
-        self.elements = elements
+    __slots__ = ("vector", "start")
+
+    def __init__(self, elements=(), vector=None, start=0):
+        self.vector = vector_from_list(elements) if vector is None else vector
+        self.start = start
+
+    @property
+    def elements(self):
+        return list(self)
+
+    def __len__(self):
+        return self.vector.count - self.start
+
+    def __iter__(self):
+        vector = self.vector
+        if self.start == 0:
+            return iter(vector)
+        return (vector.get(i) for i in range(self.start, vector.count))
+
+    def get(self, i):
+        return self.vector.get(self.start + i)
+
+    def first(self):
+        if len(self) == 0:
+            return NULL
+        return self.vector.get(self.start)
+
+    def last(self):
+        if len(self) == 0:
+            return NULL
+        return self.vector.get(self.vector.count - 1)
+
+    def rest(self):
+        if len(self) == 0:
+            return NULL
+        return Array(vector=self.vector, start=self.start + 1)
+
+    def push(self, value):
+        return Array(vector=self.vector.push(value), start=self.start)
+
+    def assign(self, i, value):
+        self.vector = self.vector.set(self.start + i, value)
+
+    def append(self, value):
+        self.vector = self.vector.push(value)
+
+    def pop(self):
+        if len(self) == 0:
+            return NULL
+        value = self.last()
+        self.vector = self.vector.pop()
+        return value
 
     def type(self):
         return ObjectType.ARRAY
 
     def __str__(self):
-        elements = [str(e) for e in self.elements]
+        elements = [inspect(e) for e in self]
         return f"[{', '.join(elements)}]"
 
 
+class Sequence(Object):
+    __slots__ = ("source", "length", "index")
+
+    def __init__(self, source, length=None, index=None):
+        self.source = source
+        self.length = length
+        self.index = index
+
+    def __len__(self):
+        if self.length is None:
+            self.length = sum(1 for _ in self)
+        return self.length
+
+    def __iter__(self):
+        return self.source()
+
+    def get(self, i, default=None):
+        if i < 0:
+            return default
+        if self.index is not None:
+            return self.index(i) if i < len(self) else default
+        for value in islice(self, i, i + 1):
+            return value
+        return default
+
+    def first(self, default=None):
+        return self.get(0, default)
+
+    def type(self):
+        return ObjectType.SEQUENCE
+
+    def __str__(self):
+        return "sequence"
+
+
+class IntArray(Object):
+    __slots__ = ("data",)
+
+    def __init__(self, data):
+        self.data = data
+
+    def __len__(self):
+        return len(self.data)
+
+    def __iter__(self):
+        return map(int, self.data)
+
+    def get(self, i):
+        return int(self.data[i])
+
+    def type(self):
+        return ObjectType.INT_ARRAY
+
+    def __str__(self):
+        return f"int_array([{', '.join(str(value) for value in self)}])"
+
+
 class HashKey:
+    __slots__ = ("type", "value", "key", "hash")
+
     def __init__(self, obj_type, value):
         self.type = obj_type
         self.value = value
+        self.key = (obj_type, value)
+        self.hash = hash(self.key)
 
     def __eq__(self, other) -> bool:
-        if isinstance(other, HashKey):
-            if other.type == self.type and other.value == self.value:
-                return True
-
+        if self is other:
+            return True
+        if other.__class__ is HashKey:
+            return self.hash == other.hash and self.key == other.key
         return False
 
     def __ne__(self, other) -> bool:
-        if isinstance(other, HashKey):
-            if other.type == self.type and other.value == self.value:
-                return False
-
-        return True
+        return not self.__eq__(other)
 
     def __hash__(self) -> int:
-        return hash(f"{self.type}-{self.value}")
+        return self.hash
 
 
 class HashPair:
+    __slots__ = ("key", "value")
+
     def __init__(self, key, value):
         self.key = key
         self.value = value
 
 
 class Hash(Object):
-    def __init__(self, pairs):
-        self.pairs = pairs
+    __slots__ = ("hash_map",)
 
-    def type(self):
-        return ObjectType.HASH
+    def __init__(self, pairs=None, hash_map=None):
+        if hash_map is None:
+            hash_map = map_from_dict(pairs or {})
+        self.hash_map = hash_map
+
+    @property
+    def pairs(self):
+        return dict(self.hash_map.items())
 
     def __len__(self):
-        return len(self.pairs)
+        return len(self.hash_map)
+
+    def get(self, key):
+        return self.hash_map.get(key)
+
+    def set(self, key, value):
+        pair = HashPair(key, value)
+        return Hash(hash_map=self.hash_map.set(key.hash_key(), pair))
+
+    def assign(self, hashed, pair):
+        self.hash_map = self.hash_map.set(hashed, pair)
+
+    def delete(self, key):
+        return Hash(hash_map=self.hash_map.delete(key.hash_key()))
+
+    def merge(self, other):
+        hash_map = self.hash_map
+        for hashed_key, pair in other.hash_map.items():
+            hash_map = hash_map.set(hashed_key, pair)
+        return Hash(hash_map=hash_map)
+
+    def keys(self):
+        return [pair.key for _, pair in self.hash_map.items()]
+
+    def values(self):
+        return [pair.value for _, pair in self.hash_map.items()]
+
+    def type(self):
+        return ObjectType.HASH
 
     def __str__(self):
         fmt = "{"
         pairs = [
-            f"{str(pair.key)}: {str(pair.value)}"
-            for pair in self.pairs.values()
+            f"{inspect(pair.key)}: {inspect(pair.value)}"
+            for _, pair in self.hash_map.items()
         ]
         fmt += ", ".join(pairs) + "}"
         return fmt
 
 
+def inspect(value):
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if value is None:
+        return "null"
+    return str(value)
+
+
+def type_name(value):
+    name = NATIVE_TYPE_NAMES.get(value.__class__)
+    if name is None:
+        return value.type().value
+    return name
+
+
+def native_hash_key(value):
+    cls = value.__class__
+    if cls is int:
+        key = INTEGER_KEYS.get(value)
+        if key is None:
+            return HashKey(ObjectType.INTEGER, value)
+        return key
+    if cls is str:
+        return HashKey(ObjectType.STRING, value)
+    if cls is bool:
+        return TRUE.key if value else FALSE.key
+    if cls is float:
+        return HashKey(ObjectType.INTEGER, value)
+    return None
+
+
+def new_integer(value):
+    if value.__class__ is int:
+        cached = SMALL_INTS.get(value)
+        if cached is not None:
+            return cached
+    return Integer(value)
+
+
+def cache_small_ints(low=SMALL_INT_MIN, high=SMALL_INT_MAX):
+    SMALL_INTS.clear()
+    INTEGER_KEYS.clear()
+    for value in range(low, high + 1):
+        SMALL_INTS[value] = Integer(value)
+        INTEGER_KEYS[value] = HashKey(ObjectType.INTEGER, value)
+
+
+NATIVE_TYPE_NAMES = {
+    int: ObjectType.INTEGER.value,
+    float: ObjectType.INTEGER.value,
+    str: ObjectType.STRING.value,
+    bool: ObjectType.BOOLEAN.value,
+    type(None): ObjectType.NULL.value,
+}
+
+SMALL_INTS = {}
+INTEGER_KEYS = {}
+cache_small_ints()
+
 NULL = Null()
 TRUE = Boolean(True)
 FALSE = Boolean(False)
@@ -0,0 +1,140 @@
+BITS = 5
+WIDTH = 1 << BITS
+MASK = WIDTH - 1
+
+
+class PersistentVector:
+    __slots__ = ("count", "shift", "root", "tail")
+
+    def __init__(self, count=0, shift=BITS, root=None, tail=None):
+        self.count = count
+        self.shift = shift
+        self.root = [] if root is None else root
+        self.tail = [] if tail is None else tail
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for i in range(0, self.tail_offset(), WIDTH):
+            yield from self.leaf_for(i)
+        yield from self.tail
+
+    def tail_offset(self):
+        if self.count < WIDTH:
+            return 0
+        return ((self.count - 1) >> BITS) << BITS
+
+    def leaf_for(self, i):
+        if i >= self.tail_offset():
+            return self.tail
+
+        node = self.root
+        for level in range(self.shift, 0, -BITS):
+            node = node[(i >> level) & MASK]
+        return node
+
+    def get(self, i):
+        return self.leaf_for(i)[i & MASK]
+
+    def set(self, i, value):
+        if i >= self.tail_offset():
+            tail = list(self.tail)
+            tail[i & MASK] = value
+            return PersistentVector(self.count, self.shift, self.root, tail)
+
+        root = assoc_path(self.shift, self.root, i, value)
+        return PersistentVector(self.count, self.shift, root, self.tail)
+
+    def push(self, value):
+        if self.count - self.tail_offset() < WIDTH:
+            tail = self.tail + [value]
+            return PersistentVector(
+                self.count + 1, self.shift, self.root, tail
+            )
+
+        shift = self.shift
+        if (self.count >> BITS) > (1 << shift):
+            root = [self.root, new_path(shift, self.tail)]
+            shift += BITS
+        else:
+            root = self.push_tail(shift, self.root, self.tail)
+
+        return PersistentVector(self.count + 1, shift, root, [value])
+
+    def push_tail(self, level, parent, tail):
+        index = ((self.count - 1) >> level) & MASK
+        node = list(parent)
+
+        if level == BITS:
+            child = tail
+        elif index < len(parent):
+            child = self.push_tail(level - BITS, parent[index], tail)
+        else:
+            child = new_path(level - BITS, tail)
+
+        if index < len(node):
+            node[index] = child
+        else:
+            node.append(child)
+        return node
+
+    def pop(self):
+        if self.count <= 1:
+            return PersistentVector()
+
+        if self.count - self.tail_offset() > 1:
+            tail = self.tail[:-1]
+            return PersistentVector(
+                self.count - 1, self.shift, self.root, tail
+            )
+
+        tail = self.leaf_for(self.count - 2)
+        root = self.pop_tail(self.shift, self.root) or []
+        shift = self.shift
+        if shift > BITS and len(root) == 1:
+            root = root[0]
+            shift -= BITS
+        return PersistentVector(self.count - 1, shift, root, tail)
+
+    def pop_tail(self, level, node):
+        index = ((self.count - 2) >> level) & MASK
+        if level > BITS:
+            child = self.pop_tail(level - BITS, node[index])
+            if child is None:
+                return node[:index] or None
+            return node[:index] + [child]
+        return node[:index] or None
+
+
+def assoc_path(level, node, i, value):
+    node = list(node)
+    if level == 0:
+        node[i & MASK] = value
+    else:
+        index = (i >> level) & MASK
+        node[index] = assoc_path(level - BITS, node[index], i, value)
+    return node
+
+
+def new_path(level, node):
+    while level > 0:
+        node = [node]
+        level -= BITS
+    return node
+
+
+def vector_from_list(elements):
+    count = len(elements)
+    if count <= WIDTH:
+        return PersistentVector(count, BITS, [], list(elements))
+
+    tail_offset = ((count - 1) >> BITS) << BITS
+    nodes = [elements[i : i + WIDTH] for i in range(0, tail_offset, WIDTH)]
+    shift = BITS
+    while len(nodes) > WIDTH:
+        nodes = [nodes[i : i + WIDTH] for i in range(0, len(nodes), WIDTH)]
+        shift += BITS
+
+    tail = list(elements[tail_offset:])
+    return PersistentVector(count, shift, nodes, tail)
@@ -0,0 +1,183 @@
+from ast.ast import (
+    BooleanLiteral,
+    ExpressionStatement,
+    IfExpression,
+    IntegerLiteral,
+    ReturnStatement,
+    StringLiteral,
+)
+from evaluator.nodevisitor import eval_infix_expression, eval_prefix_expression
+from object.object import Integer, String, TRUE, FALSE
+from tok.tok import Token
+
+
+class Optimizer:
+    def visit(self, node):
+        method_name = "visit_" + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(node)
+
+    def generic_visit(self, node):
+        return node
+
+    def visit_Program(self, node):
+        node.statements = self.visit_statements(node.statements)
+        return node
+
+    def visit_BlockStatement(self, node):
+        node.statements = self.visit_statements(node.statements)
+        return node
+
+    def visit_statements(self, statements):
+        result = []
+        last = len(statements) - 1
+
+        for i, stmt in enumerate(statements):
+            stmt = self.visit(stmt)
+            for s in self.constant_branch(stmt, i == last):
+                result.append(s)
+                if isinstance(s, ReturnStatement):
+                    return result
+
+        return result
+
+    def constant_branch(self, stmt, is_last):
+        if not isinstance(stmt, ExpressionStatement):
+            return [stmt]
+
+        expression = stmt.expression
+        if not isinstance(expression, IfExpression):
+            return [stmt]
+
+        truthy = constant_truthiness(expression.condition)
+        if truthy is None:
+            return [stmt]
+
+        branch = expression.consequence if truthy else expression.alternative
+        if branch is None:
+            return [stmt] if is_last else []
+        if not branch.statements and is_last:
+            return [stmt]
+        return branch.statements
+
+    def visit_ExpressionStatement(self, node):
+        node.expression = self.visit(node.expression)
+        return node
+
+    def visit_LetStatement(self, node):
+        node.value = self.visit(node.value)
+        return node
+
+    def visit_ReturnStatement(self, node):
+        node.return_value = self.visit(node.return_value)
+        return node
+
+    def visit_PrefixExpression(self, node):
+        node.right = self.visit(node.right)
+
+        right = to_object(node.right)
+        if right is None:
+            return node
+
+        return to_literal(eval_prefix_expression(node.operator, right), node)
+
+    def visit_InfixExpression(self, node):
+        node.left = self.visit(node.left)
+        node.right = self.visit(node.right)
+
+        left = to_object(node.left)
+        right = to_object(node.right)
+        if left is None or right is None:
+            return node
+
+        try:
+            result = eval_infix_expression(node.operator, left, right)
+        except ArithmeticError:
+            return node
+
+        return to_literal(result, node)
+
+    def visit_IfExpression(self, node):
+        node.condition = self.visit(node.condition)
+        node.consequence = self.visit(node.consequence)
+        if node.alternative is not None:
+            node.alternative = self.visit(node.alternative)
+
+        if constant_truthiness(node.condition):
+            node.alternative = None
+        return node
+
+    def visit_WhileExpression(self, node):
+        node.condition = self.visit(node.condition)
+        node.consequence = self.visit(node.consequence)
+        return node
+
+    def visit_ForExpression(self, node):
+        node.iterable = self.visit(node.iterable)
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_FunctionLiteral(self, node):
+        node.body = self.visit(node.body)
+        return node
+
+    def visit_CallExpression(self, node):
+        node.function = self.visit(node.function)
+        node.args = [self.visit(arg) for arg in node.args]
+        return node
+
+    def visit_ArrayLiteral(self, node):
+        node.elements = [self.visit(elem) for elem in node.elements]
+        return node
+
+    def visit_IndexExpression(self, node):
+        node.left = self.visit(node.left)
+        node.index = self.visit(node.index)
+        return node
+
+    def visit_IndexAssignment(self, node):
+        node.left = self.visit(node.left)
+        node.index = self.visit(node.index)
+        node.value = self.visit(node.value)
+        return node
+
+    def visit_HashLiteral(self, node):
+        node.pairs = {
+            self.visit(key): self.visit(value)
+            for key, value in node.pairs.items()
+        }
+        return node
+
+
+def optimize(program):
+    return Optimizer().visit(program)
+
+
+def to_object(node):
+    if isinstance(node, IntegerLiteral):
+        return Integer(node.value)
+    elif isinstance(node, StringLiteral):
+        return String(node.value)
+    elif isinstance(node, BooleanLiteral):
+        return TRUE if node.value else FALSE
+    return None
+
+
+def to_literal(obj, node):
+    if isinstance(obj, Integer):
+        return IntegerLiteral(Token(Token.INT, str(obj.value)), obj.value)
+    elif isinstance(obj, String):
+        return StringLiteral(Token(Token.STRING, obj.value), obj.value)
+    elif obj is TRUE:
+        return BooleanLiteral(Token(Token.TRUE, "true"), True)
+    elif obj is FALSE:
+        return BooleanLiteral(Token(Token.FALSE, "false"), False)
+    return node
+
+
+def constant_truthiness(node):
+    if isinstance(node, BooleanLiteral):
+        return node.value
+    elif isinstance(node, (IntegerLiteral, StringLiteral)):
+        return True
+    return None
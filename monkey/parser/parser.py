@@ -15,10 +15,12 @@ from ast.ast import (
     StringLiteral,
     ArrayLiteral,
     IndexExpression,
+    IndexAssignment,
     HashLiteral,
     WhileExpression,
+    ForExpression,
 )
-from tok.tok import Token, PRECEDENCES, Precedence
+from tok.tok import Token, PRECEDENCE_TABLE, Precedence
 
 
 class Parser:
@@ -46,6 +48,7 @@ class Parser:
         self.register_prefix(Token.LBRACKET, self.parse_array_literal)
         self.register_prefix(Token.LBRACE, self.parse_hash_literal)
         self.register_prefix(Token.WHILE, self.parse_while_expression)
+        self.register_prefix(Token.FOR, self.parse_for_expression)
 
         self.register_infix(Token.PLUS, self.parse_infix_expression)
         self.register_infix(Token.MINUS, self.parse_infix_expression)
@@ -57,6 +60,7 @@ class Parser:
         self.register_infix(Token.GT, self.parse_infix_expression)
         self.register_infix(Token.LPAREN, self.parse_call_expression)
         self.register_infix(Token.LBRACKET, self.parse_index_expression)
+        self.register_infix(Token.ASSIGN, self.parse_index_assignment)
 
     def parse_program(self):
         program = Program()
@@ -134,7 +138,7 @@ class Parser:
 
         while (
             not self.is_peek(Token.SEMICOLON)
-            and precedence.value < self.peek_precedence().value
+            and precedence < PRECEDENCE_TABLE[self.peek_token.token_type]
         ):
 
             infix = self.infix_parse_fns.get(self.peek_token.token_type)
@@ -198,7 +202,7 @@ class Parser:
     def parse_function_parameters(self):
         identifiers = []
 
-        if self.peek_token.token_type == Token.RPAREN:
+        if self.is_peek(Token.RPAREN):
             self.next_token()
             return identifiers
 
@@ -207,7 +211,7 @@ class Parser:
         ident = Identifier(self.curr_token, self.curr_token.literal)
         identifiers.append(ident)
 
-        while self.peek_token.token_type == Token.COMMA:
+        while self.is_peek(Token.COMMA):
             self.next_token()
             self.next_token()
 
@@ -288,6 +292,34 @@ class Parser:
 
         return exp
 
+    def parse_for_expression(self):
+        exp = ForExpression(self.curr_token)
+
+        if not self.expect_peek(Token.LPAREN):
+            return None
+
+        if not self.expect_peek(Token.IDENT):
+            return None
+
+        exp.name = Identifier(self.curr_token, self.curr_token.literal)
+
+        if not self.expect_peek(Token.IN):
+            return None
+
+        self.next_token()
+
+        exp.iterable = self.parse_expression(Precedence.LOWEST)
+
+        if not self.expect_peek(Token.RPAREN):
+            return None
+
+        if not self.expect_peek(Token.LBRACE):
+            return None
+
+        exp.body = self.parse_block_statement()
+
+        return exp
+
     def parse_array_literal(self):
         array = ArrayLiteral(self.curr_token)
         elems = self.parse_expression_list(Token.RBRACKET)
@@ -317,6 +349,16 @@ class Parser:
         exp.index = self.parse_expression(Precedence.LOWEST)
         return exp if self.expect_peek(Token.RBRACKET) else None
 
+    def parse_index_assignment(self, target):
+        if not isinstance(target, IndexExpression):
+            self.errors.append(f"Cannot assign to '{target}'")
+            return None
+
+        exp = IndexAssignment(self.curr_token, target.left, target.index)
+        self.next_token()
+        exp.value = self.parse_expression(Precedence.LOWEST)
+        return exp
+
     def parse_hash_literal(self):
         hsh = HashLiteral(self.curr_token)
 
@@ -352,7 +394,7 @@ class Parser:
 
     def parse_boolean_literal(self):
         return BooleanLiteral(
-            self.curr_token, Token.TRUE == self.curr_token.token_type
+            self.curr_token, self.is_current(Token.TRUE)
         )
 
     def is_current(self, token_type):
@@ -362,19 +404,19 @@ class Parser:
         return self.peek_token.token_type == token_type
 
     def peek_error(self, token_type):
-        self.errors.append(
-            f"Expected '{token_type}', got '{self.peek_token.token_type}'"
-        )
+        expected = Token.NAMES[token_type]
+        got = Token.NAMES[self.peek_token.token_type]
+        self.errors.append(f"Expected '{expected}', got '{got}'")
 
     def peek_precedence(self):
-        return PRECEDENCES.get(self.peek_token.token_type, Precedence.LOWEST)
+        return PRECEDENCE_TABLE[self.peek_token.token_type]
 
     def curr_precedence(self):
-        precedence = PRECEDENCES.get(self.curr_token.token_type)
-        return precedence if precedence is not None else Precedence.LOWEST
+        return PRECEDENCE_TABLE[self.curr_token.token_type]
 
     def no_prefix_parse_fn_error(self, token_type):
-        msg = f"No prefix parse function for '{token_type}' found"
+        name = Token.NAMES[token_type]
+        msg = f"No prefix parse function for '{name}' found"
         self.errors.append(msg)
 
     def next_token(self):
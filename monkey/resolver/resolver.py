@@ -0,0 +1,260 @@
+from enum import Enum
+
+from ast.ast import (
+    CallExpression,
+    ExpressionStatement,
+    ForExpression,
+    FunctionLiteral,
+    IndexAssignment,
+    Identifier,
+    IfExpression,
+    LetStatement,
+    ReturnStatement,
+    iter_child_nodes,
+)
+from evaluator.builtin import BUILTIN
+
+
+class SymbolScope(Enum):
+    LOCAL = "LOCAL"
+    FREE = "FREE"
+    GLOBAL = "GLOBAL"
+    BUILTIN = "BUILTIN"
+
+
+class FunctionScope:
+    def __init__(self, parent=None):
+        self.parent = parent
+        self.slots = {}
+        self.bindings = {}
+        self.size = 0
+
+    def define(self, name, count=1):
+        self.bindings[name] = self.bindings.get(name, 0) + count
+        slot = self.slots.get(name)
+        if slot is None:
+            slot = self.allocate(name)
+        return slot
+
+    def define_param(self, name):
+        self.bindings[name] = self.bindings.get(name, 0) + 1
+        return self.allocate(name)
+
+    def allocate(self, name):
+        slot = self.size
+        self.slots[name] = slot
+        self.size += 1
+        return slot
+
+    def owners(self, name):
+        depth = 0
+        scope = self
+        while scope is not None:
+            slot = scope.slots.get(name)
+            if slot is not None:
+                yield depth, slot
+            scope = scope.parent
+            depth += 1
+
+
+class Resolver:
+    def __init__(self, memoize=False):
+        self.globals = {}
+        self.memoize = memoize
+
+    def resolve(self, program):
+        self.hoist(program, self.globals)
+        self.visit(program, None)
+        return program
+
+    def hoist(self, node, names):
+        if isinstance(node, FunctionLiteral):
+            return
+        if isinstance(node, (LetStatement, ForExpression)):
+            names[node.name.value] = names.get(node.name.value, 0) + 1
+        for child in iter_child_nodes(node):
+            self.hoist(child, names)
+
+    def visit(self, node, scope):
+        if isinstance(node, Identifier):
+            self.resolve_identifier(node, scope)
+        elif isinstance(node, LetStatement):
+            literal = node.value
+            if isinstance(literal, FunctionLiteral):
+                literal.name = node.name.value
+            self.visit(node.value, scope)
+            if isinstance(literal, FunctionLiteral):
+                bindings = self.globals if scope is None else scope.bindings
+                if bindings[literal.name] == 1:
+                    self.mark_pure(literal, literal.name)
+            self.bind(node, scope)
+        elif isinstance(node, ForExpression):
+            self.visit(node.iterable, scope)
+            self.bind(node, scope)
+            self.visit(node.body, scope)
+        elif isinstance(node, FunctionLiteral):
+            self.resolve_function(node, scope)
+        else:
+            for child in iter_child_nodes(node):
+                self.visit(child, scope)
+
+    def bind(self, node, scope):
+        if scope is None:
+            node.scope = SymbolScope.GLOBAL
+            node.slot = None
+        else:
+            node.scope = SymbolScope.LOCAL
+            node.slot = scope.slots[node.name.value]
+
+    def resolve_function(self, node, parent):
+        scope = FunctionScope(parent)
+        for param in node.params:
+            param.scope = SymbolScope.LOCAL
+            param.slot = scope.define_param(param.value)
+
+        names = {}
+        self.hoist(node.body, names)
+        for name, count in names.items():
+            scope.define(name, count)
+
+        node.frame_size = scope.size
+        node.has_closures = contains_function(node.body)
+        mark_tail_calls(node.body, True)
+        self.visit(node.body, scope)
+        self.mark_pure(node, None)
+
+    def mark_pure(self, node, name):
+        node.pure = is_pure(node, name)
+        node.memoize = self.memoize and node.pure
+        if node.pure:
+            node.builtins = tuple(set(builtin_names(node.body)))
+
+    def resolve_identifier(self, node, scope):
+        name = node.value
+        owners = [] if scope is None else list(scope.owners(name))
+
+        if owners:
+            depth, slot = owners[0]
+            node.scope = SymbolScope.LOCAL if depth == 0 else SymbolScope.FREE
+            node.depth = depth
+            node.slot = slot
+            node.fallbacks = tuple(owners[1:])
+        else:
+            if name not in self.globals and name in BUILTIN:
+                node.scope = SymbolScope.BUILTIN
+            else:
+                node.scope = SymbolScope.GLOBAL
+            node.depth = 0
+            node.slot = None
+            node.fallbacks = ()
+
+
+PURE_BUILTINS = (
+    "len",
+    "first",
+    "last",
+    "rest",
+    "push",
+    "join",
+    "set",
+    "delete",
+    "keys",
+    "values",
+    "merge",
+    "range",
+    "map",
+    "filter",
+    "reduce",
+    "take",
+    "zip",
+    "to_array",
+    "sort",
+    "any",
+    "all",
+    "sum",
+    "min",
+    "max",
+    "reverse",
+    "slice",
+    "int_array",
+    "vsum",
+    "vadd",
+    "vmul",
+    "vdot",
+    "vmap_scalar",
+    "vfilter_gt",
+)
+
+
+def is_pure(literal, name):
+    params = len(literal.params)
+    return is_pure_node(literal.body, params, name)
+
+
+def is_pure_node(node, params, name):
+    if isinstance(node, (FunctionLiteral, IndexAssignment)):
+        return False
+    elif isinstance(node, LetStatement):
+        return is_pure_node(node.value, params, name)
+    elif isinstance(node, ForExpression):
+        return is_pure_node(node.iterable, params, name) and is_pure_node(
+            node.body, params, name
+        )
+    elif isinstance(node, CallExpression):
+        return is_pure_callee(node.function, name) and all(
+            is_pure_node(arg, params, name) for arg in node.args
+        )
+    elif isinstance(node, Identifier):
+        if node.scope is SymbolScope.LOCAL:
+            return node.slot < params or not node.fallbacks
+        return is_pure_callee(node, name)
+
+    return all(
+        is_pure_node(child, params, name) for child in iter_child_nodes(node)
+    )
+
+
+def is_pure_callee(node, name):
+    if not isinstance(node, Identifier):
+        return False
+    elif node.scope is SymbolScope.BUILTIN:
+        return node.value in PURE_BUILTINS
+    elif node.value != name or node.fallbacks:
+        return False
+    elif node.scope is SymbolScope.GLOBAL:
+        return True
+    return node.scope is SymbolScope.FREE and node.depth == 1
+
+
+def builtin_names(node):
+    if isinstance(node, Identifier):
+        if node.scope is SymbolScope.BUILTIN:
+            yield node.value
+    else:
+        for child in iter_child_nodes(node):
+            yield from builtin_names(child)
+
+
+def contains_function(node):
+    if isinstance(node, FunctionLiteral):
+        return True
+    return any(contains_function(child) for child in iter_child_nodes(node))
+
+
+def mark_tail_calls(block, tail):
+    last = len(block.statements) - 1
+    for i, stmt in enumerate(block.statements):
+        if isinstance(stmt, ReturnStatement):
+            stmt.tail = tail and i == last
+            stmt.unwinds = False
+            if isinstance(stmt.return_value, CallExpression):
+                stmt.return_value.tail = True
+        elif isinstance(stmt, ExpressionStatement):
+            expression = stmt.expression
+            in_tail = tail and i == last
+            if isinstance(expression, IfExpression):
+                mark_tail_calls(expression.consequence, in_tail)
+                if expression.alternative is not None:
+                    mark_tail_calls(expression.alternative, in_tail)
+            elif isinstance(expression, CallExpression):
+                expression.tail = in_tail
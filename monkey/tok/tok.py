@@ -1,45 +1,87 @@
-from enum import Enum
+from enum import IntEnum
 
 
 class Token:
-    ILLEGAL = "ILLEGAL"
-    EOF = "EOF"
-
-    IDENT = "IDENT"
-    INT = "INT"
-    STRING = "STRING"
-
-    ASSIGN = "="
-    PLUS = "+"
-    MINUS = "-"
-    BANG = "!"
-    ASTERISK = "*"
-    SLASH = "/"
-
-    LT = "<"
-    GT = ">"
-
-    COMMA = ","
-    SEMICOLON = ";"
-    COLON = ":"
-
-    LPAREN = "("
-    RPAREN = ")"
-    LBRACE = "{"
-    RBRACE = "}"
-    LBRACKET = "["
-    RBRACKET = "]"
-
-    FUNCTION = "FUNCTION"
-    LET = "LET"
-    TRUE = "TRUE"
-    FALSE = "FALSE"
-    IF = "IF"
-    ELSE = "ELSE"
-    RETURN = "RETURN"
-    EQ = "=="
-    NOT_EQ = "!="
-    WHILE = "WHILE"
+    __slots__ = ("token_type", "literal")
+
+    ILLEGAL = 0
+    EOF = 1
+    IDENT = 2
+    INT = 3
+    STRING = 4
+
+    ASSIGN = 5
+    PLUS = 6
+    MINUS = 7
+    BANG = 8
+    ASTERISK = 9
+    SLASH = 10
+
+    LT = 11
+    GT = 12
+
+    COMMA = 13
+    SEMICOLON = 14
+    COLON = 15
+
+    LPAREN = 16
+    RPAREN = 17
+    LBRACE = 18
+    RBRACE = 19
+    LBRACKET = 20
+    RBRACKET = 21
+
+    FUNCTION = 22
+    LET = 23
+    TRUE = 24
+    FALSE = 25
+    IF = 26
+    ELSE = 27
+    RETURN = 28
+
+    EQ = 29
+    NOT_EQ = 30
+
+    WHILE = 31
+    FOR = 32
+    IN = 33
+
+    NAMES = (
+        "ILLEGAL",
+        "EOF",
+        "IDENT",
+        "INT",
+        "STRING",
+        "=",
+        "+",
+        "-",
+        "!",
+        "*",
+        "/",
+        "<",
+        ">",
+        ",",
+        ";",
+        ":",
+        "(",
+        ")",
+        "{",
+        "}",
+        "[",
+        "]",
+        "FUNCTION",
+        "LET",
+        "TRUE",
+        "FALSE",
+        "IF",
+        "ELSE",
+        "RETURN",
+        "==",
+        "!=",
+        "WHILE",
+        "FOR",
+        "IN",
+    )
 
     KEYWORDS = {
         "fn": FUNCTION,
@@ -50,6 +92,8 @@ class Token:
         "else": ELSE,
         "return": RETURN,
         "while": WHILE,
+        "for": FOR,
+        "in": IN,
     }
 
     def __init__(self, token_type, literal):
@@ -62,18 +106,20 @@ def lookup_identifier(ident):
     return Token.IDENT if keyword is None else keyword
 
 
-class Precedence(Enum):
+class Precedence(IntEnum):
     LOWEST = 0
-    EQUALS = 1
-    LESSGREATER = 2
-    SUM = 3
-    PRODUCT = 4
-    PREFIX = 5
-    CALL = 6
-    INDEX = 7
+    ASSIGN = 1
+    EQUALS = 2
+    LESSGREATER = 3
+    SUM = 4
+    PRODUCT = 5
+    PREFIX = 6
+    CALL = 7
+    INDEX = 8
 
 
 PRECEDENCES = {
+    Token.ASSIGN: Precedence.ASSIGN,
     Token.EQ: Precedence.EQUALS,
     Token.NOT_EQ: Precedence.EQUALS,
     Token.LT: Precedence.LESSGREATER,
@@ -85,3 +131,8 @@ PRECEDENCES = {
     Token.LPAREN: Precedence.CALL,
     Token.LBRACKET: Precedence.INDEX,
 }
+
+PRECEDENCE_TABLE = tuple(
+    PRECEDENCES.get(token_type, Precedence.LOWEST)
+    for token_type in range(len(Token.NAMES))
+)
@@ -0,0 +1,138 @@
+from evaluator.builtin import BUILTIN
+from evaluator.nodevisitor import (
+    Abort,
+    assign_index,
+    check,
+    check_arity,
+    eval_index_expression,
+    eval_infix_expression,
+    eval_prefix_expression,
+    iter_object,
+)
+from evaluator.memo import MISSING, memo_key
+from object.environment import Environment
+from object.object import (
+    Array,
+    BuiltIn,
+    Error,
+    Function,
+    Hash,
+    Hashable,
+    HashPair,
+    Integer,
+    String,
+    NULL,
+    TRUE,
+    FALSE,
+    new_integer,
+)
+
+
+class TranspiledFunction(Function):
+    __slots__ = ("code",)
+
+    def __init__(self, params, body, env, code):
+        super().__init__(params, body, env)
+        self.code = code
+
+
+def lookup(env, name):
+    while env is not None:
+        val = env.store.get(name)
+        if val is not None:
+            return val
+        env = env.outer
+
+    val = BUILTIN.get(name)
+    if val is not None:
+        return val
+
+    raise Abort(Error(f"identifier not found: {name}"))
+
+
+def call(fn, args):
+    if fn.__class__ is TranspiledFunction:
+        memo = fn.memo
+        if memo is not None:
+            key = memo_key(args)
+            if key is not None:
+                result = memo.get(key)
+                if result is MISSING:
+                    result = call_function(fn, args)
+                    memo.put(key, result)
+                return result
+        return call_function(fn, args)
+    elif fn.__class__ is BuiltIn:
+        if fn.callback:
+            return check(fn.function(args, call))
+        return check(fn.function(args))
+
+    raise Abort(Error(f"not a function: {fn}"))
+
+
+def call_function(fn, args):
+    check_arity(fn, args)
+    env = Environment(fn.env)
+    store = env.store
+    for i, param in enumerate(fn.params):
+        store[param] = args[i]
+    return fn.code(env)
+
+
+def infix(operator, left, right):
+    return check(eval_infix_expression(operator, left, right))
+
+
+def prefix(operator, right):
+    return check(eval_prefix_expression(operator, right))
+
+
+def index(left, idx):
+    if left.__class__ is Array and idx.__class__ is Integer:
+        i = idx.value
+        return left.get(i) if 0 <= i < len(left) else NULL
+    return check(eval_index_expression(left, idx))
+
+
+def assign(left, idx, value):
+    return check(assign_index(left, idx, value))
+
+
+def iterate(iterable):
+    return check(iter_object(iterable))
+
+
+def hash_key(key):
+    if not isinstance(key, Hashable):
+        raise Abort(Error(f"unusable as hash key: {key.type().value}"))
+    return key.hash_key()
+
+
+def run(main, env):
+    try:
+        return main(env)
+    except Abort as e:
+        return e.error
+
+
+NAMESPACE = {
+    "Abort": Abort,
+    "Array": Array,
+    "Hash": Hash,
+    "HashPair": HashPair,
+    "Integer": Integer,
+    "String": String,
+    "TranspiledFunction": TranspiledFunction,
+    "NULL": NULL,
+    "TRUE": TRUE,
+    "FALSE": FALSE,
+    "assign": assign,
+    "call": call,
+    "hash_key": hash_key,
+    "index": index,
+    "infix": infix,
+    "iterate": iterate,
+    "lookup": lookup,
+    "new_integer": new_integer,
+    "prefix": prefix,
+}
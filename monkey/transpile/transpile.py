@@ -0,0 +1,336 @@
+import hashlib
+import importlib.util
+import marshal
+import os
+
+from ast.ast import ExpressionStatement, LetStatement, ReturnStatement
+from lexer.lexer import Lexer
+from optimizer.optimizer import optimize
+from parser.parser import Parser
+from .runtime import NAMESPACE, run
+
+VERSION = 3
+
+INTEGER_OPERATORS = ("+", "-", "*", "/")
+BOOLEAN_OPERATORS = ("<", ">", "==", "!=")
+
+
+class Writer:
+    def __init__(self):
+        self.lines = []
+        self.level = 0
+
+    def line(self, text):
+        self.lines.append("    " * self.level + text)
+
+    def indent(self):
+        self.level += 1
+
+    def dedent(self):
+        self.level -= 1
+
+
+class Transpiler:
+    def __init__(self):
+        self.header = []
+        self.functions = []
+        self.constants = 0
+        self.function_count = 0
+        self.temps = 0
+        self.loops = 0
+
+    def transpile(self, program):
+        self.function("main", program.statements)
+        return "\n".join(self.header + self.functions) + "\n"
+
+    def constant(self, expression):
+        name = f"K{self.constants}"
+        self.constants += 1
+        self.header.append(f"{name} = {expression}")
+        return name
+
+    def temp(self):
+        name = f"t{self.temps}"
+        self.temps += 1
+        return name
+
+    def function(self, name, statements):
+        out = Writer()
+        out.line(f"def {name}(env):")
+        out.indent()
+        out.line("store = env.store")
+
+        outer = (self.temps, self.loops)
+        self.temps, self.loops = 0, 0
+
+        result = self.statements(out, statements)
+        out.line(f"return {result}")
+
+        self.temps, self.loops = outer
+        self.functions.extend(out.lines + [""])
+
+    def statements(self, out, statements):
+        result = "None"
+        for stmt in statements:
+            if isinstance(stmt, ExpressionStatement):
+                result = self.visit(out, stmt.expression)
+            elif isinstance(stmt, LetStatement):
+                value = self.visit(out, stmt.value)
+                out.line(f"store[{stmt.name.value!r}] = {value}")
+                result = "None"
+            elif isinstance(stmt, ReturnStatement):
+                value = self.visit(out, stmt.return_value)
+                # NodeVisitor.visit_WhileExpression swallows a ReturnValue
+                # coming out of the loop body, so it only ends the
+                # current iteration there.
+                out.line("continue" if self.loops else f"return {value}")
+                result = "None"
+            else:
+                raise Exception(f"Cannot transpile {type(stmt).__name__}")
+        return result
+
+    def visit(self, out, node):
+        method_name = "visit_" + type(node).__name__
+        visitor = getattr(self, method_name, self.generic_visit)
+        return visitor(out, node)
+
+    def generic_visit(self, out, node):
+        raise Exception("No visit_{} method".format(type(node).__name__))
+
+    def visit_IntegerLiteral(self, out, node):
+        return self.constant(f"new_integer({node.value!r})")
+
+    def visit_StringLiteral(self, out, node):
+        return self.constant(f"String({node.value!r})")
+
+    def visit_BooleanLiteral(self, out, node):
+        return "TRUE" if node.value else "FALSE"
+
+    def visit_Identifier(self, out, node):
+        t = self.temp()
+        out.line(f"{t} = store.get({node.value!r})")
+        out.line(f"if {t} is None:")
+        out.line(f"    {t} = lookup(env, {node.value!r})")
+        return t
+
+    def visit_PrefixExpression(self, out, node):
+        right = self.visit(out, node.right)
+        t = self.temp()
+        if node.operator == "!":
+            out.line(
+                f"{t} = TRUE if {right} is FALSE or {right} is NULL else FALSE"
+            )
+        elif node.operator == "-":
+            out.line(
+                f"{t} = new_integer(-{right}.value) "
+                f"if {right}.__class__ is Integer else prefix('-', {right})"
+            )
+        else:
+            out.line(f"{t} = prefix({node.operator!r}, {right})")
+        return t
+
+    def visit_InfixExpression(self, out, node):
+        left = self.visit(out, node.left)
+        right = self.visit(out, node.right)
+        op = node.operator
+        t = self.temp()
+
+        guard = f"{left}.__class__ is Integer and {right}.__class__ is Integer"
+        fallback = f"infix({op!r}, {left}, {right})"
+        if op == "/":
+            fast = f"Integer({left}.value / {right}.value)"
+        elif op in INTEGER_OPERATORS:
+            fast = f"new_integer({left}.value {op} {right}.value)"
+        elif op in BOOLEAN_OPERATORS:
+            fast = f"(TRUE if {left}.value {op} {right}.value else FALSE)"
+        else:
+            out.line(f"{t} = {fallback}")
+            return t
+
+        out.line(f"{t} = {fast} if {guard} else {fallback}")
+        return t
+
+    def visit_IfExpression(self, out, node):
+        condition = self.visit(out, node.condition)
+        t = self.temp()
+
+        out.line(f"if {condition} is NULL or {condition} is FALSE:")
+        out.indent()
+        if node.alternative is not None:
+            value = self.statements(out, node.alternative.statements)
+            out.line(f"{t} = {value}")
+        else:
+            out.line(f"{t} = NULL")
+        out.dedent()
+
+        out.line("else:")
+        out.indent()
+        value = self.statements(out, node.consequence.statements)
+        out.line(f"{t} = {value}")
+        out.dedent()
+        return t
+
+    def visit_WhileExpression(self, out, node):
+        out.line("while True:")
+        out.indent()
+        condition = self.visit(out, node.condition)
+        out.line(f"if {condition} is NULL or {condition} is FALSE:")
+        out.line("    break")
+
+        self.loops += 1
+        self.statements(out, node.consequence.statements)
+        self.loops -= 1
+
+        out.dedent()
+        return "None"
+
+    def visit_ForExpression(self, out, node):
+        iterable = self.visit(out, node.iterable)
+        item = self.temp()
+        out.line(f"for {item} in iterate({iterable}):")
+        out.indent()
+        out.line(f"store[{node.name.value!r}] = {item}")
+
+        self.loops += 1
+        self.statements(out, node.body.statements)
+        self.loops -= 1
+
+        out.dedent()
+        return "None"
+
+    def visit_FunctionLiteral(self, out, node):
+        name = f"fn{self.function_count}"
+        self.function_count += 1
+        params = self.constant(repr(tuple(p.value for p in node.params)))
+        body = self.constant(repr(str(node.body)))
+
+        self.function(name, node.body.statements)
+
+        t = self.temp()
+        out.line(f"{t} = TranspiledFunction({params}, {body}, env, {name})")
+        return t
+
+    def visit_CallExpression(self, out, node):
+        function = self.visit(out, node.function)
+        args = [self.visit(out, arg) for arg in node.args]
+        t = self.temp()
+        out.line(f"{t} = call({function}, [{', '.join(args)}])")
+        return t
+
+    def visit_ArrayLiteral(self, out, node):
+        elements = [self.visit(out, elem) for elem in node.elements]
+        t = self.temp()
+        out.line(f"{t} = Array([{', '.join(elements)}])")
+        return t
+
+    def visit_HashLiteral(self, out, node):
+        pairs = []
+        for key_node, value_node in node.pairs.items():
+            key = self.visit(out, key_node)
+            hashed = self.temp()
+            out.line(f"{hashed} = hash_key({key})")
+            value = self.visit(out, value_node)
+            pairs.append(f"{hashed}: HashPair({key}, {value})")
+
+        t = self.temp()
+        out.line(f"{t} = Hash({{{', '.join(pairs)}}})")
+        return t
+
+    def visit_IndexExpression(self, out, node):
+        left = self.visit(out, node.left)
+        idx = self.visit(out, node.index)
+        t = self.temp()
+        out.line(f"{t} = index({left}, {idx})")
+        return t
+
+    def visit_IndexAssignment(self, out, node):
+        left = self.visit(out, node.left)
+        idx = self.visit(out, node.index)
+        value = self.visit(out, node.value)
+        t = self.temp()
+        out.line(f"{t} = assign({left}, {idx}, {value})")
+        return t
+
+
+def transpile(program):
+    return Transpiler().transpile(program)
+
+
+class CodeCache:
+    def __init__(self, cache_dir=None, optimize=True):
+        self.cache_dir = cache_dir
+        self.optimize = optimize
+        self.scripts = {}
+        self.errors = []
+
+    def load(self, source):
+        self.errors = []
+        tag = f"{VERSION}:{int(self.optimize)}:{source}"
+        key = hashlib.sha256(tag.encode()).hexdigest()
+
+        main = self.scripts.get(key)
+        if main is not None:
+            return main
+
+        code = self.read(key)
+        if code is None:
+            parser = Parser(Lexer(source))
+            program = parser.parse_program()
+            if parser.errors:
+                self.errors = parser.errors
+                return None
+
+            if self.optimize:
+                program = optimize(program)
+            code = compile(transpile(program), f"<monkey {key[:12]}>", "exec")
+            self.write(key, code)
+
+        namespace = dict(NAMESPACE)
+        exec(code, namespace)
+        main = self.scripts[key] = namespace["main"]
+        return main
+
+    def run(self, source, env):
+        main = self.load(source)
+        return None if main is None else run(main, env)
+
+    def path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.monkeyc")
+
+    def read(self, key):
+        if self.cache_dir is None:
+            return None
+
+        try:
+            with open(self.path(key), "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+
+        magic = importlib.util.MAGIC_NUMBER
+        if not data.startswith(magic):
+            return None
+
+        try:
+            return marshal.loads(data[len(magic) :])
+        except (EOFError, ValueError, TypeError):
+            return None
+
+    def write(self, key, code):
+        if self.cache_dir is None:
+            return
+
+        data = importlib.util.MAGIC_NUMBER + marshal.dumps(code)
+        path = self.path(key)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(tmp, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            pass
+
+    def print_errors(self):
+        for err in self.errors:
+            print(f"\t{err}")
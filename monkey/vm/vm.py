@@ -0,0 +1,432 @@
+from compiler.code import Opcode
+from evaluator.builtin import BUILTIN
+from evaluator.nodevisitor import (
+    Abort,
+    assign_index,
+    check,
+    eval_index_expression,
+    eval_infix_expression,
+    eval_prefix_expression,
+    iter_object,
+)
+from evaluator.memo import MISSING, memo_key
+from object.object import (
+    Array,
+    BuiltIn,
+    Cell,
+    Closure,
+    Error,
+    Hash,
+    Hashable,
+    HashPair,
+    Integer,
+    NULL,
+    TRUE,
+    FALSE,
+    new_integer,
+)
+
+CONSTANT = Opcode.CONSTANT.value
+POP = Opcode.POP.value
+ADD = Opcode.ADD.value
+SUB = Opcode.SUB.value
+MUL = Opcode.MUL.value
+DIV = Opcode.DIV.value
+EQUAL = Opcode.EQUAL.value
+NOT_EQUAL = Opcode.NOT_EQUAL.value
+GREATER_THAN = Opcode.GREATER_THAN.value
+LESS_THAN = Opcode.LESS_THAN.value
+MINUS = Opcode.MINUS.value
+BANG = Opcode.BANG.value
+PUSH_TRUE = Opcode.TRUE.value
+PUSH_FALSE = Opcode.FALSE.value
+PUSH_NULL = Opcode.NULL.value
+PUSH_NONE = Opcode.NONE.value
+JUMP = Opcode.JUMP.value
+JUMP_NOT_TRUTHY = Opcode.JUMP_NOT_TRUTHY.value
+GET_GLOBAL = Opcode.GET_GLOBAL.value
+SET_GLOBAL = Opcode.SET_GLOBAL.value
+GET_LOCAL = Opcode.GET_LOCAL.value
+SET_LOCAL = Opcode.SET_LOCAL.value
+GET_DEREF = Opcode.GET_DEREF.value
+SET_DEREF = Opcode.SET_DEREF.value
+GET_FREE = Opcode.GET_FREE.value
+LOAD_CELL = Opcode.LOAD_CELL.value
+LOAD_FREE_CELL = Opcode.LOAD_FREE_CELL.value
+ARRAY = Opcode.ARRAY.value
+HASH = Opcode.HASH.value
+INDEX = Opcode.INDEX.value
+CALL = Opcode.CALL.value
+RETURN_VALUE = Opcode.RETURN_VALUE.value
+CLOSURE = Opcode.CLOSURE.value
+SET_INDEX = Opcode.SET_INDEX.value
+GET_ITER = Opcode.GET_ITER.value
+FOR_ITER = Opcode.FOR_ITER.value
+
+STOP = object()
+
+INFIX_OPERATORS = {
+    ADD: "+",
+    SUB: "-",
+    MUL: "*",
+    DIV: "/",
+    EQUAL: "==",
+    NOT_EQUAL: "!=",
+    GREATER_THAN: ">",
+    LESS_THAN: "<",
+}
+
+
+class VM:
+    def __init__(self, bytecode, symbol_table, globals_store=None):
+        self.main = bytecode.main
+        self.constants = bytecode.constants
+        self.names = symbol_table.names
+
+        self.globals = [] if globals_store is None else globals_store
+        self.globals.extend([None] * (len(self.names) - len(self.globals)))
+
+    def run(self):
+        return self.execute(self.main, [], ())
+
+    def apply(self, callee, args):
+        if callee.__class__ is Closure:
+            memo = callee.memo
+            if memo is not None:
+                key = memo_key(args)
+                if key is not None:
+                    result = memo.get(key)
+                    if result is MISSING:
+                        result = self.call_closure(callee, args)
+                        memo.put(key, result)
+                    return result
+            return self.call_closure(callee, args)
+
+        elif callee.__class__ is BuiltIn:
+            if callee.callback:
+                return check(callee.function(args, self.apply))
+            return check(callee.function(args))
+
+        raise Abort(Error(f"not a function: {callee}"))
+
+    def call_closure(self, callee, args):
+        compiled = callee.fn
+        num_params = compiled.num_params
+        if len(args) < num_params:
+            raise Abort(
+                Error(
+                    f"wrong number of arguments: want={num_params}, "
+                    f"got={len(args)}"
+                )
+            )
+
+        slots = list(args[:num_params])
+        slots.extend([None] * (compiled.num_locals - num_params))
+        for slot in compiled.cell_slots:
+            slots[slot] = Cell(slots[slot])
+        return check(self.execute(compiled, slots, callee.free))
+
+    def execute(self, fn, slots, free):
+        constants = self.constants
+        globals_store = self.globals
+
+        stack = []
+        push = stack.append
+        pop = stack.pop
+
+        frames = []
+        ins = fn.instructions
+        ip = 0
+        base = 0
+
+        while True:
+            op = ins[ip]
+
+            if op == GET_LOCAL:
+                val = slots[ins[ip + 1]]
+                if val is None:
+                    val = self.fallback(fn, ("local", ins[ip + 1]), free)
+                    if val.__class__ is Error:
+                        return val
+                push(val)
+                ip += 2
+
+            elif op == CONSTANT:
+                push(constants[ins[ip + 1]])
+                ip += 2
+
+            elif op == GET_GLOBAL:
+                val = globals_store[ins[ip + 1]]
+                if val is None:
+                    val = self.load_global(ins[ip + 1])
+                    if val.__class__ is Error:
+                        return val
+                push(val)
+                ip += 2
+
+            elif op == SET_GLOBAL:
+                globals_store[ins[ip + 1]] = pop()
+                ip += 2
+
+            elif op == SET_LOCAL:
+                slots[ins[ip + 1]] = pop()
+                ip += 2
+
+            elif op <= LESS_THAN and op >= ADD:
+                right = pop()
+                left = pop()
+                if left.__class__ is Integer and right.__class__ is Integer:
+                    if op == ADD:
+                        push(new_integer(left.value + right.value))
+                    elif op == SUB:
+                        push(new_integer(left.value - right.value))
+                    elif op == LESS_THAN:
+                        push(TRUE if left.value < right.value else FALSE)
+                    elif op == GREATER_THAN:
+                        push(TRUE if left.value > right.value else FALSE)
+                    elif op == EQUAL:
+                        push(TRUE if left.value == right.value else FALSE)
+                    elif op == NOT_EQUAL:
+                        push(TRUE if left.value != right.value else FALSE)
+                    elif op == MUL:
+                        push(new_integer(left.value * right.value))
+                    else:
+                        push(Integer(left.value / right.value))
+                else:
+                    operator = INFIX_OPERATORS[op]
+                    result = eval_infix_expression(operator, left, right)
+                    if result.__class__ is Error:
+                        return result
+                    push(result)
+                ip += 1
+
+            elif op == JUMP_NOT_TRUTHY:
+                val = pop()
+                if val is NULL or val is FALSE:
+                    ip = ins[ip + 1]
+                else:
+                    ip += 2
+
+            elif op == JUMP:
+                ip = ins[ip + 1]
+
+            elif op == POP:
+                pop()
+                ip += 1
+
+            elif op == CALL:
+                num_args = ins[ip + 1]
+                callee = stack[-1 - num_args]
+
+                if callee.__class__ is Closure and callee.memo is None:
+                    compiled = callee.fn
+                    num_params = compiled.num_params
+                    if num_args < num_params:
+                        return Error(
+                            f"wrong number of arguments: want={num_params}, "
+                            f"got={num_args}"
+                        )
+
+                    start = len(stack) - num_args
+                    new_slots = stack[start : start + num_params]
+                    del stack[start - 1 :]
+                    new_slots.extend(
+                        [None] * (compiled.num_locals - num_params)
+                    )
+                    for slot in compiled.cell_slots:
+                        new_slots[slot] = Cell(new_slots[slot])
+
+                    frames.append((fn, ins, ip + 2, slots, free, base))
+                    fn = compiled
+                    ins = compiled.instructions
+                    ip = 0
+                    slots = new_slots
+                    free = callee.free
+                    base = start - 1
+
+                elif callee.__class__ is BuiltIn:
+                    args = stack[len(stack) - num_args :]
+                    del stack[-1 - num_args :]
+                    try:
+                        if callee.callback:
+                            result = callee.function(args, self.apply)
+                        else:
+                            result = callee.function(args)
+                    except Abort as e:
+                        return e.error
+                    if result.__class__ is Error:
+                        return result
+                    push(result)
+                    ip += 2
+
+                elif callee.__class__ is Closure:
+                    args = stack[len(stack) - num_args :]
+                    del stack[-1 - num_args :]
+                    try:
+                        push(self.apply(callee, args))
+                    except Abort as e:
+                        return e.error
+                    ip += 2
+
+                else:
+                    return Error(f"not a function: {callee}")
+
+            elif op == RETURN_VALUE:
+                val = pop()
+                if not frames:
+                    return val
+                del stack[base:]
+                push(val)
+                fn, ins, ip, slots, free, base = frames.pop()
+
+            elif op == GET_DEREF:
+                val = slots[ins[ip + 1]].value
+                if val is None:
+                    val = self.fallback(fn, ("local", ins[ip + 1]), free)
+                    if val.__class__ is Error:
+                        return val
+                push(val)
+                ip += 2
+
+            elif op == SET_DEREF:
+                slots[ins[ip + 1]].value = pop()
+                ip += 2
+
+            elif op == GET_FREE:
+                val = free[ins[ip + 1]].value
+                if val is None:
+                    val = self.fallback(fn, ("free", ins[ip + 1]), free)
+                    if val.__class__ is Error:
+                        return val
+                push(val)
+                ip += 2
+
+            elif op == INDEX:
+                index = pop()
+                left = pop()
+                result = eval_index_expression(left, index)
+                if result.__class__ is Error:
+                    return result
+                push(result)
+                ip += 1
+
+            elif op == PUSH_TRUE:
+                push(TRUE)
+                ip += 1
+
+            elif op == PUSH_FALSE:
+                push(FALSE)
+                ip += 1
+
+            elif op == PUSH_NULL:
+                push(NULL)
+                ip += 1
+
+            elif op == PUSH_NONE:
+                push(None)
+                ip += 1
+
+            elif op == MINUS or op == BANG:
+                right = pop()
+                operator = "-" if op == MINUS else "!"
+                result = eval_prefix_expression(operator, right)
+                if result.__class__ is Error:
+                    return result
+                push(result)
+                ip += 1
+
+            elif op == ARRAY:
+                count = ins[ip + 1]
+                elements = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                push(Array(elements))
+                ip += 2
+
+            elif op == HASH:
+                count = ins[ip + 1] * 2
+                items = stack[len(stack) - count :]
+                del stack[len(stack) - count :]
+                result = build_hash(items)
+                if result.__class__ is Error:
+                    return result
+                push(result)
+                ip += 2
+
+            elif op == LOAD_CELL:
+                push(slots[ins[ip + 1]])
+                ip += 2
+
+            elif op == LOAD_FREE_CELL:
+                push(free[ins[ip + 1]])
+                ip += 2
+
+            elif op == SET_INDEX:
+                value = pop()
+                index = pop()
+                left = pop()
+                result = assign_index(left, index, value)
+                if result.__class__ is Error:
+                    return result
+                push(result)
+                ip += 1
+
+            elif op == GET_ITER:
+                items = iter_object(pop())
+                if items.__class__ is Error:
+                    return items
+                push(items)
+                ip += 1
+
+            elif op == FOR_ITER:
+                try:
+                    item = next(stack[-1], STOP)
+                except Abort as e:
+                    return e.error
+                if item is STOP:
+                    pop()
+                    ip = ins[ip + 1]
+                else:
+                    push(item)
+                    ip += 2
+
+            elif op == CLOSURE:
+                count = ins[ip + 2]
+                cells = tuple(stack[len(stack) - count :])
+                del stack[len(stack) - count :]
+                push(Closure(constants[ins[ip + 1]], cells))
+                ip += 3
+
+            else:
+                raise Exception(f"unknown opcode {op}")
+
+    def fallback(self, fn, ref, free):
+        free_chain, global_index = fn.fallbacks[ref]
+        for index in free_chain:
+            val = free[index].value
+            if val is not None:
+                return val
+        return self.load_global(global_index)
+
+    def load_global(self, index):
+        val = self.globals[index]
+        if val is not None:
+            return val
+
+        name = self.names[index]
+        val = BUILTIN.get(name)
+        if val is not None:
+            return val
+
+        return Error(f"identifier not found: {name}")
+
+
+def build_hash(items):
+    pairs = {}
+    for i in range(0, len(items), 2):
+        key = items[i]
+        if not isinstance(key, Hashable):
+            return Error(f"unusable as hash key: {key.type().value}")
+
+        pairs[key.hash_key()] = HashPair(key, items[i + 1])
+
+    return Hash(pairs)
@@ -0,0 +1,66 @@
+import unittest
+
+import test_evaluator
+from evaluator.closurecompiler import ClosureCompiler
+from lexer.lexer import Lexer
+from object.environment import Environment
+from object.object import Integer, Error
+from parser.parser import Parser
+
+
+class TestClosureCompiler(test_evaluator.TestEvaluator):
+    def test_compiles_once_and_reruns(self):
+        program = Parser(Lexer("let x = 2 * 21; x")).parse_program()
+        run = ClosureCompiler().compile(program)
+
+        for _ in range(2):
+            actual = run(Environment())
+            self.assertIsInstance(actual, Integer)
+            self.assertEqual(42, actual.value)
+
+    def test_recursive_functions(self):
+        test = """
+        let fib = fn(n) {
+            if (n < 2) { n } else { fib(n - 1) + fib(n - 2) }
+        };
+        fib(15);
+        """
+
+        self.assert_integer_object(610, self.eval(test))
+
+    def test_return_inside_while_ends_iteration(self):
+        test = """
+        let f = fn() {
+            let i = 0;
+            while (i < 3) { let i = i + 1; return i; };
+            i
+        };
+        f();
+        """
+
+        self.assert_integer_object(3, self.eval(test))
+
+    def test_errors_abort_program(self):
+        tests = [
+            [
+                "let f = fn(x) { x + true }; f(1); 5",
+                "type mismatch: INTEGER + BOOLEAN",
+            ],
+            ["let a = [1]; a(1)", "not a function: [1]"],
+        ]
+
+        for tt in tests:
+            actual = self.eval(tt[0])
+            self.assertIsInstance(actual, Error)
+            self.assertEqual(tt[1], actual.message)
+
+    @staticmethod
+    def eval(test_input):
+        lexer = Lexer(test_input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        return ClosureCompiler().compile(program)(Environment())
+
+
+if __name__ == "__main__":
+    unittest.main()
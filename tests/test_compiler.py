@@ -0,0 +1,301 @@
+import unittest
+
+from compiler.code import Opcode, make, format_instructions
+from compiler.compiler import Compiler
+from lexer.lexer import Lexer
+from object.object import CompiledFunction, Integer, String
+from parser.parser import Parser
+
+
+class TestCompiler(unittest.TestCase):
+    def test_make(self):
+        tests = [
+            [Opcode.CONSTANT, [65534], [Opcode.CONSTANT, 65534]],
+            [Opcode.ADD, [], [Opcode.ADD]],
+            [Opcode.CLOSURE, [2, 1], [Opcode.CLOSURE, 2, 1]],
+        ]
+
+        for tt in tests:
+            self.assertEqual(tt[2], make(tt[0], *tt[1]))
+
+    def test_format_instructions(self):
+        instructions = (
+            make(Opcode.ADD)
+            + make(Opcode.GET_LOCAL, 1)
+            + make(Opcode.CONSTANT, 2)
+            + make(Opcode.CLOSURE, 65535, 255)
+        )
+
+        expected = (
+            "0000 OpAdd\n"
+            "0001 OpGetLocal 1\n"
+            "0003 OpConstant 2\n"
+            "0005 OpClosure 65535 255"
+        )
+
+        self.assertEqual(expected, format_instructions(instructions))
+
+    def test_integer_arithmetic(self):
+        tests = [
+            [
+                "1 + 2",
+                [1, 2],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.CONSTANT, 1),
+                    make(Opcode.ADD),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+            [
+                "1; 2",
+                [1, 2],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.POP),
+                    make(Opcode.CONSTANT, 1),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+            [
+                "2 < 1",
+                [2, 1],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.CONSTANT, 1),
+                    make(Opcode.LESS_THAN),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+            [
+                "-1",
+                [1],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.MINUS),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_conditionals(self):
+        tests = [
+            [
+                "if (true) { 10 }; 3333;",
+                [10, 3333],
+                [
+                    make(Opcode.TRUE),
+                    make(Opcode.JUMP_NOT_TRUTHY, 7),
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.JUMP, 8),
+                    make(Opcode.NULL),
+                    make(Opcode.POP),
+                    make(Opcode.CONSTANT, 1),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_while_expressions(self):
+        tests = [
+            [
+                "while (true) { 1 }",
+                [1],
+                [
+                    make(Opcode.TRUE),
+                    make(Opcode.JUMP_NOT_TRUTHY, 8),
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.POP),
+                    make(Opcode.JUMP, 0),
+                    make(Opcode.NONE),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_for_expressions(self):
+        tests = [
+            [
+                "for (x in [1]) { x }",
+                [1],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.ARRAY, 1),
+                    make(Opcode.GET_ITER),
+                    make(Opcode.FOR_ITER, 14),
+                    make(Opcode.SET_GLOBAL, 0),
+                    make(Opcode.GET_GLOBAL, 0),
+                    make(Opcode.POP),
+                    make(Opcode.JUMP, 5),
+                    make(Opcode.NONE),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_global_let_statements(self):
+        tests = [
+            [
+                "let one = 1; let two = one; two;",
+                [1],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.SET_GLOBAL, 0),
+                    make(Opcode.GET_GLOBAL, 0),
+                    make(Opcode.SET_GLOBAL, 1),
+                    make(Opcode.GET_GLOBAL, 1),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_string_expressions(self):
+        tests = [
+            [
+                '"mon" + "key"',
+                ["mon", "key"],
+                [
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.CONSTANT, 1),
+                    make(Opcode.ADD),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_functions(self):
+        tests = [
+            [
+                "fn(a) { let b = a; b }",
+                [
+                    [
+                        make(Opcode.GET_LOCAL, 0),
+                        make(Opcode.SET_LOCAL, 1),
+                        make(Opcode.GET_LOCAL, 1),
+                        make(Opcode.RETURN_VALUE),
+                    ],
+                ],
+                [
+                    make(Opcode.CLOSURE, 0, 0),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+            [
+                "fn() { }",
+                [
+                    [
+                        make(Opcode.NONE),
+                        make(Opcode.RETURN_VALUE),
+                    ],
+                ],
+                [
+                    make(Opcode.CLOSURE, 0, 0),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def test_closures(self):
+        tests = [
+            [
+                "fn(a) { fn(b) { a + b } }",
+                [
+                    [
+                        make(Opcode.GET_FREE, 0),
+                        make(Opcode.GET_LOCAL, 0),
+                        make(Opcode.ADD),
+                        make(Opcode.RETURN_VALUE),
+                    ],
+                    [
+                        make(Opcode.LOAD_CELL, 0),
+                        make(Opcode.CLOSURE, 0, 1),
+                        make(Opcode.RETURN_VALUE),
+                    ],
+                ],
+                [
+                    make(Opcode.CLOSURE, 1, 0),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+        compiler = self.compile("fn(a) { fn(b) { a + b } }")
+        outer = compiler.bytecode().constants[1]
+        self.assertEqual((0,), outer.cell_slots)
+
+    def test_return_inside_while_ends_iteration(self):
+        tests = [
+            [
+                "while (true) { return 1; }",
+                [1],
+                [
+                    make(Opcode.TRUE),
+                    make(Opcode.JUMP_NOT_TRUTHY, 10),
+                    make(Opcode.CONSTANT, 0),
+                    make(Opcode.POP),
+                    make(Opcode.JUMP, 0),
+                    make(Opcode.JUMP, 0),
+                    make(Opcode.NONE),
+                    make(Opcode.RETURN_VALUE),
+                ],
+            ],
+        ]
+
+        self.run_compiler_tests(tests)
+
+    def run_compiler_tests(self, tests):
+        for tt in tests:
+            compiler = self.compile(tt[0])
+            bytecode = compiler.bytecode()
+
+            self.assert_instructions(tt[2], bytecode.instructions)
+            self.assert_constants(tt[1], bytecode.constants)
+
+    def assert_instructions(self, expected, actual):
+        concatted = [i for ins in expected for i in ins]
+        self.assertEqual(
+            format_instructions(concatted), format_instructions(actual)
+        )
+
+    def assert_constants(self, expected, actual):
+        self.assertEqual(len(expected), len(actual))
+
+        for exp, act in zip(expected, actual):
+            if isinstance(exp, int):
+                self.assertIsInstance(act, Integer)
+                self.assertEqual(exp, act.value)
+            elif isinstance(exp, str):
+                self.assertIsInstance(act, String)
+                self.assertEqual(exp, act.value)
+            else:
+                self.assertIsInstance(act, CompiledFunction)
+                self.assert_instructions(exp, act.instructions)
+
+    @staticmethod
+    def compile(test_input):
+        lexer = Lexer(test_input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        compiler = Compiler()
+        compiler.compile(program)
+        return compiler
+
+
+if __name__ == "__main__":
+    unittest.main()
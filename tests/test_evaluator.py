@@ -1,10 +1,14 @@
+import contextlib
+import io
 import unittest
 
-from evaluator.nodevisitor import NodeVisitor, evaluate
+from evaluator import nodevisitor
+from evaluator.nodevisitor import evaluate
 from lexer.lexer import Lexer
 from object.environment import Environment
-from object.object import Integer, Boolean, Null
+from object.object import Integer, Boolean, Null, NULL
 from object.object import String, Error, Function, Array, TRUE, FALSE, Hash
+from object.object import BuiltIn
 from parser.parser import Parser
 
 
@@ -69,6 +73,7 @@ class TestEvaluator(unittest.TestCase):
             ["!!true", True],
             ["!!false", False],
             ["!!5", True],
+            ["let f = fn(x) { return!x; }; f(true)", False],
         ]
 
         for tt in tests:
@@ -101,6 +106,43 @@ class TestEvaluator(unittest.TestCase):
         actual = self.eval(test)
         self.assert_integer_object(0, actual)
 
+    def test_for_expressions(self):
+        tests = [
+            ["let s = 0; for (x in [1, 2, 3]) { let s = s + x }; s", 6],
+            ["let s = 0; for (i in range(5)) { let s = s + i }; s", 10],
+            ["let s = 0; for (i in int_array([4])) { let s = s + i }; s", 4],
+            [
+                'let s = ""; for (c in "abc") { let s = c + s }; s',
+                "cba",
+            ],
+            [
+                'let h = {"a": 1, "b": 2}; let s = 0;'
+                "for (k in h) { let s = s + h[k] }; s",
+                3,
+            ],
+            [
+                "let f = fn(a) { let n = 0; for (x in a) { let n = n + x };"
+                "n }; f(map([1, 2], fn(x) { x * 10 }))",
+                30,
+            ],
+            [
+                "let a = [1, 2]; for (x in a) { append!(a, x) }; len(a)",
+                4,
+            ],
+            ["let x = 5; for (x in []) { x }; x", 5],
+            ["for (x in 1) { x }", "iteration not supported: INTEGER"],
+            ["for (x in [1]) { y }", "identifier not found: y"],
+        ]
+
+        for tt in tests:
+            actual = self.eval(tt[0])
+            if isinstance(tt[1], int):
+                self.assert_integer_object(tt[1], actual)
+            elif isinstance(actual, Error):
+                self.assertEqual(tt[1], actual.message)
+            else:
+                self.assert_string_object(tt[1], actual)
+
     def test_return_statements(self):
         tests = [
             ["return 10;", 10],
@@ -123,6 +165,38 @@ class TestEvaluator(unittest.TestCase):
             expected = tt[1]
             self.assert_integer_object(expected, actual)
 
+    def test_nested_return_exits_function(self):
+        tests = [
+            [
+                "let f = fn(n) {"
+                "  let x = if (n > 0) { return n } else { 1 };"
+                "  0"
+                "};"
+                "let i = 0; let s = 0;"
+                "while (i < 60) { let i = i + 1; let s = s + f(i) };"
+                "s",
+                1830,
+            ],
+            [
+                "let f = fn(n) {"
+                "  let t = [0];"
+                "  for (x in [1, 2, 3]) {"
+                "    t[0] = t[0] + if (x == n) { return 0 } else { x }"
+                "  };"
+                "  t[0]"
+                "};"
+                "let i = 0; let s = 0;"
+                "while (i < 60) { let i = i + 1; let s = s + f(2) + i };"
+                "s",
+                2070,
+            ],
+            ["let f = fn() { [1, if (true) { return 2 }, 3] }; f()", 2],
+            ["1 + if (true) { return 5 } else { 1 }; 9", 5],
+        ]
+
+        for tt in tests:
+            self.assert_integer_object(tt[1], self.eval(tt[0]))
+
     def test_error_handling(self):
         tests = [
             ["5 + true;", "type mismatch: INTEGER + BOOLEAN"],
@@ -147,6 +221,22 @@ class TestEvaluator(unittest.TestCase):
                 '{"name": "Monkey"}[fn(x) { x }];',
                 "unusable as hash key: FUNCTION",
             ],
+            [
+                "map([1, 2], fn(x, y) { x })",
+                "wrong number of arguments: want=2, got=1",
+            ],
+            [
+                "to_array(filter(range(3), fn(x, y) { x }))",
+                "wrong number of arguments: want=2, got=1",
+            ],
+            [
+                "reduce([1], 0, fn(a, x, i) { a })",
+                "wrong number of arguments: want=3, got=2",
+            ],
+            [
+                "let f = fn(x, y) { x }; f(1)",
+                "wrong number of arguments: want=2, got=1",
+            ],
         ]
 
         for tt in tests:
@@ -324,6 +414,25 @@ class TestEvaluator(unittest.TestCase):
             else:
                 self.assertIsInstance(actual, Null)
 
+    def test_memo_builtin(self):
+        tests = [
+            ["let f = memo(fn(x) { puts(x); x }); f(1) + f(1)", 2, "1\n"],
+            [
+                "let f = memo(fn(x) { puts(x); x });"
+                "reduce([2, 2, 3], 0, fn(a, x) { a + f(x) })",
+                7,
+                "2\n3\n",
+            ],
+        ]
+
+        for tt in tests:
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                evaluated = self.eval(tt[0])
+
+            self.assert_integer_object(tt[1], evaluated)
+            self.assertEqual(tt[2], out.getvalue())
+
     def assert_integer_object(self, expected_value, int_obj):
         self.assertIsInstance(int_obj, Integer)
         self.assertEqual(expected_value, int_obj.value)
@@ -344,5 +453,563 @@ class TestEvaluator(unittest.TestCase):
         return evaluate(program, Environment())
 
 
+class TestTailCalls(unittest.TestCase):
+    def test_tail_calls_run_in_constant_stack(self):
+        tests = [
+            [
+                "let iter = fn(n, acc) {"
+                "  if (n == 0) { acc } else { iter(n - 1, acc + 1) }"
+                "};"
+                "iter(5000, 0)",
+                5000,
+            ],
+            [
+                "let even = fn(n) {"
+                "  if (n == 0) { return 1; }"
+                "  return odd(n - 1)"
+                "};"
+                "let odd = fn(n) { if (n == 0) { 0 } else { even(n - 1) } };"
+                "even(5001)",
+                0,
+            ],
+            [
+                "let iter = fn(arr, acc) {"
+                "  if (len(arr) == 0) { acc }"
+                "  else { iter(rest(arr), push(acc, first(arr) * 2)) }"
+                "};"
+                "len(iter(iter(range, []), []))",
+                3000,
+            ],
+        ]
+
+        env = Environment()
+        range_ = Array([Integer(i) for i in range(3000)])
+        env.set("range", range_)
+
+        for tt in tests:
+            lexer = Lexer(tt[0])
+            parser = Parser(lexer)
+            program = parser.parse_program()
+            evaluated = evaluate(program, env)
+            self.assertEqual(tt[1], evaluated.value)
+
+    def test_tail_call_frames_do_not_leak_into_closures(self):
+        test = """
+        let collect = fn(n, acc) {
+            let get = fn() { n };
+            if (n == 0) { acc } else { collect(n - 1, push(acc, get)) }
+        };
+        let fns = collect(3, []);
+        fns[0]() * 100 + fns[1]() * 10 + fns[2]()
+        """
+
+        lexer = Lexer(test)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        evaluated = evaluate(program, Environment())
+        self.assertEqual(321, evaluated.value)
+
+
+class TestPropagation(unittest.TestCase):
+    def test_early_returns(self):
+        tests = [
+            ["let f = fn(x) { if (x) { if (x) { return 1; } }; 2 }; f(5)", 1],
+            ["let f = fn(x) { if (x) { return 1; }; 2 }; f(false)", 2],
+            ["let f = fn() { let x = fn() { return 1; 2 }(); x * 3 }; f()", 3],
+            ["let f = fn() { [1, if (true) { return 3; }, 2] }; f()", 3],
+            ["let f = fn() { while (true) { return 1; } }; 5", 5],
+            ["if (true) { return 4; }; 5", 4],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            self.assertEqual(tt[1], evaluated.value)
+
+    def test_errors_abort_evaluation(self):
+        test = """
+        let f = fn(x) { puts(x); x + true };
+        let g = fn() { f(1); f(2) };
+        [g(), f(3)]
+        """
+
+        output = []
+        env = Environment()
+        env.set("puts", BuiltIn(lambda args: output.append(args[0].value)))
+        evaluated = evaluate(self.parse(test), env)
+
+        self.assertIsInstance(evaluated, Error)
+        self.assertEqual("type mismatch: INTEGER + BOOLEAN", evaluated.message)
+        self.assertEqual([1], output)
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
+class TestArrays(unittest.TestCase):
+    def test_array_builtins(self):
+        tests = [
+            ["first([1, 2, 3])", 1],
+            ["last([1, 2, 3])", 3],
+            ["last(rest([1, 2, 3]))", 3],
+            ["len(rest(rest([1, 2, 3])))", 1],
+            ["push(rest([1, 2]), 3)[1]", 3],
+            ["let a = [1]; let b = push(a, 2); len(a) + len(b)", 3],
+            ["first([])", None],
+            ["last([])", None],
+            ["rest([])", None],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_large_arrays(self):
+        test = (
+            "let build = fn(arr, n) {"
+            "  if (n == 0) { arr } else { build(push(arr, n), n - 1) }"
+            "};"
+            "let total = fn(arr, acc) {"
+            "  if (len(arr) == 0) { acc }"
+            "  else { total(rest(arr), acc + first(arr)) }"
+            "};"
+            "let arr = build([], 20000);"
+            "total(arr, 0) + arr[0] + last(arr)"
+        )
+
+        evaluated = evaluate(self.parse(test), Environment())
+        self.assertEqual(200010000 + 20000 + 1, evaluated.value)
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
+class TestStrings(unittest.TestCase):
+    def test_join(self):
+        tests = [
+            ['join(["a", "b", "c"], ", ")', "a, b, c"],
+            ['join([], ", ")', ""],
+            ['join([1, true, "x"], "-")', "1-true-x"],
+            ['join(1, "")', "argument to 'join' must be ARRAY, got INTEGER"],
+            ["join([], 1)", "separator to 'join' must be STRING, got INTEGER"],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if isinstance(evaluated, Error):
+                self.assertEqual(tt[1], evaluated.message)
+            else:
+                self.assertIsInstance(evaluated, String)
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_report_in_loop(self):
+        test = (
+            "let report = \"\";"
+            "let i = 0;"
+            "while (i < 20000) {"
+            "  let report = report + \"row \" + \"value\" + \".\";"
+            "  let i = i + 1;"
+            "};"
+            "len(report)"
+        )
+
+        evaluated = evaluate(self.parse(test), Environment())
+        self.assertEqual(20000 * 10, evaluated.value)
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
+class TestHashes(unittest.TestCase):
+    def test_hash_builtins(self):
+        tests = [
+            ['set({}, "a", 1)["a"]', 1],
+            ['let h = {"a": 1}; let g = set(h, "a", 2); h["a"] + g["a"]', 3],
+            ['delete({"a": 1, "b": 2}, "a")["a"]', None],
+            ['len(keys(delete({"a": 1, "b": 2}, "c")))', 2],
+            ['keys({"a": 1, 2: 2})[1]', 2],
+            ['values({"a": 1, "b": 2})[1]', 2],
+            ['merge({"a": 1, "b": 2}, {"b": 3})["b"]', 3],
+            ['merge({"a": 1}, {"b": 3})["a"]', 1],
+            ['set([], 1, 2)', "argument to 'set' must be HASH, got ARRAY"],
+            ["set({}, [], 2)", "unusable as hash key: ARRAY"],
+            ["merge({}, 1)", "argument to 'merge' must be HASH, got INTEGER"],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            elif isinstance(tt[1], str):
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(tt[1], evaluated.message)
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_count_table(self):
+        test = (
+            "let count = fn(table, n, key) {"
+            "  if (n == 0) { table }"
+            "  else {"
+            "    let seen = table[key];"
+            "    let total = if (seen) { seen + 1 } else { 1 };"
+            "    let next = if (key == 9) { 0 } else { key + 1 };"
+            "    count(set(table, key, total), n - 1, next)"
+            "  }"
+            "};"
+            "let table = count({}, 5000, 0);"
+            "len(keys(table)) * 10000 + table[3]"
+        )
+
+        evaluated = evaluate(self.parse(test), Environment())
+        self.assertEqual(10 * 10000 + 500, evaluated.value)
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
+class TestSequences(unittest.TestCase):
+    def test_sequence_builtins(self):
+        tests = [
+            ["to_array(range(4))", [0, 1, 2, 3]],
+            ["to_array(range(2, 10, 3))", [2, 5, 8]],
+            ["to_array(range(3, 0, -1))", [3, 2, 1]],
+            ["len(range(0, 1000000000))", 1000000000],
+            ["range(5, 10)[2]", 7],
+            ["range(5, 10)[5]", None],
+            ["first(range(5, 10))", 5],
+            ["first(range(0))", None],
+            ["to_array(map(range(4), fn(x) { x * x }))", [0, 1, 4, 9]],
+            ["map(range(0, 1000000000), fn(x) { x * 2 })[21]", 42],
+            ["len(filter(range(10), fn(x) { x > 6 }))", 3],
+            ["to_array(take(range(0, 1000000000), 3))", [0, 1, 2]],
+            ["len(take(filter(range(10), fn(x) { x > 6 }), 10))", 3],
+            [
+                "to_array(take(filter(range(10), fn(x) { x > 6 }), 10))",
+                [7, 8, 9],
+            ],
+            ["take(filter(range(10), fn(x) { x > 6 }), 10)[3]", None],
+            ["len(take(range(3), 10))", 3],
+            ["to_array(zip(range(2), [5, 6, 7]))[1][1]", 6],
+            ["map([1, 2, 3], fn(x) { x + 1 })", [2, 3, 4]],
+            ["filter([1, 2, 3, 4], fn(x) { x > 2 })", [3, 4]],
+            ["reduce([1, 2, 3], 10, fn(a, x) { a * x })", 60],
+            ["take([1, 2, 3], 2)", [1, 2]],
+            ["zip([1, 2, 3], [4])[0][1]", 4],
+            ["map([[1], [2, 3]], len)", [1, 2]],
+            ["range(1, 2, 0)", "step to 'range' must not be zero"],
+            ['range("a")', "argument to 'range' must be INTEGER, got STRING"],
+            [
+                "map(1, len)",
+                "argument to 'map' must be ARRAY or SEQUENCE, got INTEGER",
+            ],
+            ["to_array(map(range(3), 1))", "not a function: 1"],
+            [
+                "reduce(range(3), 0, fn(a, x) { a + y })",
+                "identifier not found: y",
+            ],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            elif isinstance(tt[1], str):
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(tt[1], evaluated.message)
+            elif isinstance(tt[1], list):
+                self.assertEqual(tt[1], [e.value for e in evaluated])
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_higher_order_builtins(self):
+        tests = [
+            ["sort([3, 1, 2])", [1, 2, 3]],
+            ['sort(["b", "c", "a"])', ["a", "b", "c"]],
+            ["sort([3, 1, 2], fn(a, b) { a > b })", [3, 2, 1]],
+            ["sort([3, 1, 2], fn(a, b) { b - a })", [3, 2, 1]],
+            ['sort(["ccc", "a", "bb"], len)', ["a", "bb", "ccc"]],
+            [
+                "let pairs = [[2, 0], [1, 1], [2, 2], [1, 3]];"
+                "map(sort(pairs, fn(p) { p[0] }), fn(p) { p[1] })",
+                [1, 3, 0, 2],
+            ],
+            [
+                "let pairs = [[2, 0], [1, 1], [2, 2], [1, 3]];"
+                "let cmp = fn(a, b) { a[0] - b[0] };"
+                "map(sort(pairs, cmp), fn(p) { p[1] })",
+                [1, 3, 0, 2],
+            ],
+            ["min([4, 2, 8])", 2],
+            ["max([4, 2, 8])", 8],
+            ["min([])", None],
+            ['max(["apple", "fig", "banana"], len)', "banana"],
+            ["sum(range(0, 100001))", 5000050000],
+            ["sum([])", 0],
+            ["any([false, 1])", True],
+            ["all([])", True],
+            ["all(range(10), fn(x) { x < 8 })", False],
+            ["reverse(range(3))", [2, 1, 0]],
+            ["slice([1, 2, 3, 4, 5], 1, 3)", [2, 3]],
+            ["slice([1, 2, 3, 4, 5], -2)", [4, 5]],
+            ['slice("hello", 1, -1)', "ell"],
+            ["to_array(slice(range(100), 5, 8))", [5, 6, 7]],
+            [
+                'sort([1, "a"])',
+                "cannot order INTEGER and STRING values in 'sort'",
+            ],
+            [
+                'sort([1, 2], fn(a, b) { "x" })',
+                "comparator to 'sort' must return INTEGER or BOOLEAN, "
+                "got STRING",
+            ],
+            ['sum([1, "a"])', "elements of 'sum' must be INTEGER, got STRING"],
+            ["sort()", "wrong number of arguments. got=0, want=1 or 2"],
+            ["max()", "wrong number of arguments. got=0, want=1 or 2"],
+            ["any()", "wrong number of arguments. got=0, want=1 or 2"],
+            ["slice([1])", "wrong number of arguments. got=1, want=2 or 3"],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            elif isinstance(tt[1], str) and isinstance(evaluated, Error):
+                self.assertEqual(tt[1], evaluated.message)
+            elif isinstance(tt[1], list):
+                self.assertEqual(tt[1], [e.value for e in evaluated])
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_native_map_handles_long_arrays(self):
+        test = "sum(map(to_array(range(50000)), fn(x) { x * 2 }))"
+
+        evaluated = evaluate(self.parse(test), Environment())
+        self.assertEqual(50000 * 49999, evaluated.value)
+
+    def test_int_arrays(self):
+        tests = [
+            ["vsum(int_array(range(0, 100001)))", 5000050000],
+            ["int_array([1, 2, 3]) + int_array([10, 20, 30])", [11, 22, 33]],
+            ["int_array([1, 2]) - int_array([3, 4])", [-2, -2]],
+            ["int_array([1, 2]) * int_array([3, 4])", [3, 8]],
+            ["vadd(int_array([1, 2, 3]), 5)", [6, 7, 8]],
+            ["vmul(int_array([1, 2]), int_array([3, 4]))", [3, 8]],
+            ["vdot(int_array([1, 2, 3]), int_array([4, 5, 6]))", 32],
+            ['vmap_scalar(int_array([1, 2, 3]), "*", 10)', [10, 20, 30]],
+            ["vfilter_gt(int_array([5, 1, 9, 3]), 3)", [5, 9]],
+            ["int_array([7, 8])[1]", 8],
+            ["int_array([7, 8])[2]", None],
+            ["len(int_array(range(10)))", 10],
+            [
+                "int_array([1, 2]) / int_array([3, 4])",
+                "unknown operator: INT_ARRAY / INT_ARRAY",
+            ],
+            [
+                "int_array([1, 2]) + int_array([3])",
+                "length mismatch in '+': 2 and 1",
+            ],
+            [
+                'int_array([1, "a"])',
+                "elements of 'int_array' must be INTEGER, got STRING",
+            ],
+            [
+                "int_array([9223372036854775807]) + int_array([1])",
+                "integer overflow in '+'",
+            ],
+            [
+                "vsum(int_array([9223372036854775807, 1]))",
+                9223372036854775808,
+            ],
+            [
+                "vdot(int_array([4611686018427387904]), int_array([2]))",
+                9223372036854775808,
+            ],
+            [
+                "vadd(int_array([9223372036854775806]), 1)",
+                [9223372036854775807],
+            ],
+            [
+                "vmul(int_array([1, 4611686018427387904]), 2)",
+                "integer overflow in 'vmul'",
+            ],
+            [
+                'vmap_scalar(int_array([-9223372036854775807]), "-", 2)',
+                "integer overflow in 'vmap_scalar'",
+            ],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            elif isinstance(tt[1], str):
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(tt[1], evaluated.message)
+            elif isinstance(tt[1], list):
+                self.assertEqual(tt[1], list(evaluated))
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_pipeline_is_lazy(self):
+        test = (
+            "let add = fn(a, b) { a + b };"
+            "let big = fn(x) { x > 2 };"
+            "let seq = map(filter(range(0, 1000000000), big), fn(x) {"
+            "  puts(x); x * 3"
+            "});"
+            "reduce(take(seq, 3), 0, add)"
+        )
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            evaluated = evaluate(self.parse(test), Environment())
+
+        self.assertEqual(36, evaluated.value)
+        self.assertEqual("3\n4\n5\n", output.getvalue())
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
+class TestMutation(unittest.TestCase):
+    def test_index_assignment(self):
+        tests = [
+            ["let a = [1, 2, 3]; a[0] = 10; a", [10, 2, 3]],
+            ["let a = [1, 2, 3]; a[2] = 7", 7],
+            ["let a = [1, 2]; let b = push(a, 3); a[0] = 9; b", [1, 2, 3]],
+            ["let a = [1, 2]; let b = a; b[0] = 9; a", [9, 2]],
+            ["let a = [1, 2, 3]; let r = rest(a); r[0] = 9; a", [1, 2, 3]],
+            ["let a = [0, 0]; a[0] = a[1] = 4; a", [4, 4]],
+            ["let f = fn(a) { a[0] = a[0] + 1 }; let a = [0]; f(a); f(a)", 2],
+            ['let h = {}; h["a"] = 1; h["a"] = h["a"] + 1; h["a"]', 2],
+            [
+                'let h = {"a": 1}; let g = set(h, "b", 2); h["c"] = 3; g["c"]',
+                None,
+            ],
+            ["let xs = [1]; append!(xs, 2); append!(xs, 3); xs", [1, 2, 3]],
+            ["let xs = [1, 2]; [pop!(xs), len(xs)]", [2, 1]],
+            ["pop!([])", None],
+            ["let a = [1, 2, 3]; a[3] = 1", "index out of range: 3"],
+            ["let a = [1, 2, 3]; a[-1] = 1", "index out of range: -1"],
+            ["let h = {}; h[[1]] = 1", "unusable as hash key: ARRAY"],
+            ['"abc"[0] = "x"', "index assignment not supported: STRING"],
+            [
+                "append!(1, 2)",
+                "argument to 'append!' must be ARRAY, got INTEGER",
+            ],
+            ["pop!({})", "argument to 'pop!' must be ARRAY, got HASH"],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            elif isinstance(tt[1], str):
+                self.assertIsInstance(evaluated, Error)
+                self.assertEqual(tt[1], evaluated.message)
+            elif isinstance(tt[1], list):
+                self.assertEqual(tt[1], [e.value for e in evaluated])
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    def test_dynamic_programming_table(self):
+        test = (
+            "let n = 5000;"
+            "let dp = to_array(range(n + 1));"
+            "let i = 2;"
+            "while (i < n + 1) {"
+            "  dp[i] = dp[i - 1] + dp[i - 2];"
+            "  let i = i + 1;"
+            "};"
+            "dp[90]"
+        )
+
+        evaluated = evaluate(self.parse(test), Environment())
+        self.assertEqual(2880067194370816120, evaluated.value)
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
+class TestQuickening(unittest.TestCase):
+    def test_specialize_and_deoptimize(self):
+        env = Environment()
+        program = self.parse("let f = fn(a, b) { a + b }; f(1, 2); f(3, 4)")
+        evaluate(program, env)
+
+        literal = program.statements[0].value
+        infix = literal.body.statements[0].expression
+        self.assertIs(nodevisitor.integer_add, infix.quick)
+
+        evaluated = evaluate(self.parse('f("a", "b")'), env)
+        self.assertEqual("ab", evaluated.value)
+        self.assertIsNone(infix.quick)
+        self.assertEqual(1, infix.deopts)
+
+        evaluated = evaluate(self.parse('f("c", "d")'), env)
+        self.assertEqual("cd", evaluated.value)
+        self.assertIs(nodevisitor.string_add, infix.quick)
+
+    def test_stop_specializing_after_max_deopts(self):
+        program = self.parse("fn(a, b) { a + b }")
+        literal = program.statements[0].expression
+        infix = literal.body.statements[0].expression
+        fn = evaluate(program, Environment(), memoize=False)
+
+        env = Environment()
+        env.set("f", fn)
+        for _ in range(nodevisitor.MAX_DEOPTS + 2):
+            for call in ["f(1, 2)", "f(1, 2)", 'f("a", "b")']:
+                evaluate(self.parse(call), env)
+
+        self.assertEqual(nodevisitor.MAX_DEOPTS, infix.deopts)
+        self.assertIsNone(infix.quick)
+        evaluated = evaluate(self.parse("f(20, 22)"), env)
+        self.assertEqual(42, evaluated.value)
+
+    def test_index_specializations(self):
+        tests = [
+            ["let f = fn(x, i) { x[i] }; f([1, 2], 0); f([1, 2], 1)", 2],
+            ["let f = fn(x, i) { x[i] }; f([1, 2], 0); f([1, 2], 2)", None],
+            ["let f = fn(x, i) { x[i] }; f({1: 2}, 1); f({1: 3}, 1)", 3],
+            ["let f = fn(x, i) { x[i] }; f({1: 2}, 1); f([4, 5], 1)", 5],
+            ['let f = fn(x, i) { x[i] }; f({"a": 2}, "a"); f({}, "a")', None],
+        ]
+
+        for tt in tests:
+            evaluated = evaluate(self.parse(tt[0]), Environment())
+            if tt[1] is None:
+                self.assertIs(NULL, evaluated)
+            else:
+                self.assertEqual(tt[1], evaluated.value)
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -1,6 +1,10 @@
+import io
+import mmap
+import tempfile
 import unittest
 
-from lexer.lexer import Lexer
+from lexer.lexer import CharLexer, Lexer, StreamLexer
+from parser.parser import Parser
 from tok.tok import Token
 
 
@@ -139,6 +143,161 @@ class TestLexer(unittest.TestCase):
             self.assertEqual(expected_token.token_type, actual.token_type)
             self.assertEqual(expected_token.literal, actual.literal)
 
+    def test_mutating_identifiers(self):
+        lexer = Lexer("append!(xs, 1); x!=y; !x")
+        expected_tokens = [
+            Token(Token.IDENT, "append!"),
+            Token(Token.LPAREN, "("),
+            Token(Token.IDENT, "xs"),
+            Token(Token.COMMA, ","),
+            Token(Token.INT, "1"),
+            Token(Token.RPAREN, ")"),
+            Token(Token.SEMICOLON, ";"),
+            Token(Token.IDENT, "x"),
+            Token(Token.NOT_EQ, "!="),
+            Token(Token.IDENT, "y"),
+            Token(Token.SEMICOLON, ";"),
+            Token(Token.BANG, "!"),
+            Token(Token.IDENT, "x"),
+            Token(Token.EOF, ""),
+        ]
+
+        for expected_token in expected_tokens:
+            actual = lexer.next_token()
+
+            self.assertEqual(expected_token.token_type, actual.token_type)
+            self.assertEqual(expected_token.literal, actual.literal)
+
+    def test_keywords_do_not_take_bang(self):
+        lexer = CharLexer("return!x; true!; pop!(xs)")
+        expected_tokens = [
+            Token(Token.RETURN, "return"),
+            Token(Token.BANG, "!"),
+            Token(Token.IDENT, "x"),
+            Token(Token.SEMICOLON, ";"),
+            Token(Token.TRUE, "true"),
+            Token(Token.BANG, "!"),
+            Token(Token.SEMICOLON, ";"),
+            Token(Token.IDENT, "pop!"),
+            Token(Token.LPAREN, "("),
+            Token(Token.IDENT, "xs"),
+            Token(Token.RPAREN, ")"),
+            Token(Token.EOF, ""),
+        ]
+
+        for expected_token in expected_tokens:
+            actual = lexer.next_token()
+
+            self.assertEqual(expected_token.token_type, actual.token_type)
+            self.assertEqual(expected_token.literal, actual.literal)
+
+    def test_token_kinds(self):
+        kinds = [
+            value
+            for name, value in vars(Token).items()
+            if name.isupper() and isinstance(value, int)
+        ]
+
+        self.assertEqual(list(range(len(Token.NAMES))), sorted(kinds))
+        self.assertEqual("==", Token.NAMES[Token.EQ])
+        self.assertEqual("IDENT", Token.NAMES[Token.IDENT])
+        self.assertFalse(hasattr(Token(Token.INT, "1"), "__dict__"))
+
+    def test_for_in(self):
+        lexer = Lexer("for (x in xs) {}")
+        expected_tokens = [
+            Token(Token.FOR, "for"),
+            Token(Token.LPAREN, "("),
+            Token(Token.IDENT, "x"),
+            Token(Token.IN, "in"),
+            Token(Token.IDENT, "xs"),
+            Token(Token.RPAREN, ")"),
+            Token(Token.LBRACE, "{"),
+            Token(Token.RBRACE, "}"),
+            Token(Token.EOF, ""),
+        ]
+
+        for expected_token in expected_tokens:
+            actual = lexer.next_token()
+
+            self.assertEqual(expected_token.token_type, actual.token_type)
+            self.assertEqual(expected_token.literal, actual.literal)
+
+    def test_matches_char_lexer(self):
+        tests = [
+            "let x = 5; x == 5 != !y;",
+            'puts("unterminated',
+            '"a\0b" c',
+            "a\0b",
+            "@ # & ~",
+            "x1 _a! b!= 12ab",
+            "return!x; else!x true! in!= fnord! a_in! 1if!",
+            "caf\u00e9 + \u00e9t\u00e9!",
+            "1\u00b2 \u00bd \u0663",
+            "\u00a0x\u2003y\x1cz",
+            "",
+        ]
+
+        for source in tests:
+            lexer = Lexer(source)
+            expected = CharLexer(source)
+            for _ in range(len(source) + 2):
+                actual = lexer.next_token()
+                token = expected.next_token()
+
+                self.assertEqual(token.token_type, actual.token_type, source)
+                self.assertEqual(token.literal, actual.literal, source)
+
+    def assert_same_tokens(self, source, lexer):
+        expected = CharLexer(source)
+        for _ in range(len(source) + 2):
+            actual = lexer.next_token()
+            token = expected.next_token()
+
+            self.assertEqual(token.token_type, actual.token_type, source)
+            self.assertEqual(token.literal, actual.literal, source)
+
+    def test_stream_chunk_boundaries(self):
+        tests = [
+            ["let ", "fi", "ve = 5", "5;"],
+            ["x =", "= y !", "= z"],
+            ['puts("hel', "lo ", 'world")'],
+            ["append", "!(a, 1); b!", "=c"],
+            ["x", "", "1 ", "caf", "\u00e9 + 1", "\u00b2"],
+            ['"unterminated', " string"],
+            ["a\0", "b"],
+            ["retu", "rn!x; tru", "e!"],
+        ]
+
+        for chunks in tests:
+            source = "".join(chunks)
+            self.assert_same_tokens(source, StreamLexer(chunks))
+
+    def test_stream_files(self):
+        source = 'let caf\u00e9 = "\u00e9t\u00e9";\nfor (x in [1, 2]) { x }'
+        data = source.encode()
+
+        for stream in [io.StringIO(source), io.BytesIO(data)]:
+            for chunk_size in [1, 2, 3, 7, 1 << 16]:
+                stream.seek(0)
+                lexer = StreamLexer(stream, chunk_size=chunk_size)
+                self.assert_same_tokens(source, lexer)
+
+        with tempfile.TemporaryFile() as f:
+            f.write(data)
+            f.flush()
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+                self.assert_same_tokens(source, StreamLexer(m, chunk_size=5))
+
+    def test_stream_parser(self):
+        source = "let add = fn(x, y) { x + y };\nadd(1, 2);"
+        stream = io.StringIO(source)
+
+        program = Parser(StreamLexer(stream, chunk_size=4)).parse_program()
+        expected = Parser(Lexer(source)).parse_program()
+
+        self.assertEqual(str(expected), str(program))
+
 
 if __name__ == "__main__":
     unittest.main()
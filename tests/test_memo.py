@@ -0,0 +1,183 @@
+import contextlib
+import io
+import unittest
+
+from evaluator.memo import MISSING, Memo
+from evaluator.nodevisitor import evaluate
+from lexer.lexer import Lexer
+from object.environment import Environment
+from object.object import Array, Error, Integer
+from parser.parser import Parser
+from resolver.resolver import Resolver
+
+
+class TestMemo(unittest.TestCase):
+    def test_purity_analysis(self):
+        tests = [
+            ["let f = fn(n) { if (n < 2) { n } else { f(n - 1) } };", True],
+            ["let f = fn(a) { let b = len(a); push(rest(a), b) };", True],
+            ["let f = fn(n) { puts(n); n };", False],
+            ["let f = fn(n) { let p = puts; n };", False],
+            ["let x = 1; let f = fn(n) { n + x };", False],
+            ["let f = fn(g, n) { g(n) };", False],
+            ["let f = fn(n) { fn() { n } };", False],
+            ["let f = fn(n) { n }; let f = fn(n) { f(n) };", False],
+            ["let g = fn(n) { n }; let f = fn(n) { g(n) };", False],
+            ["let f = fn(n) { while (n > 0) { let n = n - 1 } };", True],
+            ["let o = fn(x) { let f = fn(n) { f(n) }; f };", True],
+            ["let o = fn(x) { let f = fn(n) { x + n }; f };", False],
+            ["let f = fn(a) { a[0] = 1 };", False],
+            ["let f = fn(a) { append!(a, 1) };", False],
+        ]
+
+        for tt in tests:
+            program = Parser(Lexer(tt[0])).parse_program()
+            Resolver().resolve(program)
+            literal = program.statements[-1].value
+            if tt[0].startswith("let o"):
+                literal = literal.body.statements[0].value
+            self.assertEqual(tt[1], literal.pure, tt[0])
+            self.assertFalse(literal.memoize)
+
+    def test_memoized_calls(self):
+        test = """
+        let fib = fn(n) {
+            if (n < 2) { n } else { fib(n - 1) + fib(n - 2) }
+        };
+        fib(50)
+        """
+
+        evaluated = self.eval(test)
+        self.assertEqual(12586269025, evaluated.value)
+
+    def test_impure_functions_are_not_memoized(self):
+        test = 'let f = fn(n) { puts("hi"); n }; f(1); f(1)'
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            evaluated = self.eval(test)
+
+        self.assertEqual(1, evaluated.value)
+        self.assertEqual("hi\nhi\n", out.getvalue())
+
+    def test_unhashable_arguments_bypass_memo(self):
+        test = """
+        let sum = fn(a) {
+            if (len(a) == 0) { 0 } else { first(a) + sum(rest(a)) }
+        };
+        sum([1, 2, 3]) + sum([4])
+        """
+
+        self.assertEqual(10, self.eval(test).value)
+
+    def test_memo_builtin(self):
+        test = """
+        let count = fn(n) { puts(n); n * 2 };
+        let fast = memo(count);
+        fast(1) + fast(1) + fast(2) + count(1)
+        """
+
+        out = io.StringIO()
+        with contextlib.redirect_stdout(out):
+            evaluated = self.eval(test)
+
+        self.assertEqual(10, evaluated.value)
+        self.assertEqual("1\n2\n1\n", out.getvalue())
+
+        tests = [
+            ["memo(1)", "argument to 'memo' must be FUNCTION, got INTEGER"],
+            ["memo()", "wrong number of arguments. got=0, want=1"],
+        ]
+
+        for tt in tests:
+            evaluated = self.eval(tt[0])
+            self.assertIsInstance(evaluated, Error)
+            self.assertEqual(tt[1], evaluated.message)
+
+    def test_shadowed_builtins_disable_memo(self):
+        tests = [
+            [
+                'let len = fn(x) { puts("side"); 1 };',
+                "let f = fn(x) { len(x) };",
+                'f("ab") + f("ab")',
+            ],
+            [
+                "let f = fn(x) { len(x) };",
+                'f("ab");',
+                'let len = fn(x) { puts("side"); 1 };',
+                'f("ab") + f("ab")',
+            ],
+        ]
+
+        for lines in tests:
+            env = Environment()
+            out = io.StringIO()
+            with contextlib.redirect_stdout(out):
+                for line in lines:
+                    program = Parser(Lexer(line)).parse_program()
+                    evaluated = evaluate(program, env)
+
+            self.assertEqual(2, evaluated.value)
+            self.assertEqual("side\nside\n", out.getvalue())
+
+    def test_memoize_flag(self):
+        test = "let f = fn(n) { n }; f(1); f"
+        program = Parser(Lexer(test)).parse_program()
+
+        fn = evaluate(program, Environment(), memoize=False)
+        self.assertIsNone(fn.memo)
+
+        fn = evaluate(program, Environment())
+        self.assertEqual(1, fn.memo.misses)
+
+    def test_mutable_results_are_not_cached(self):
+        test = """
+        let make = fn(n) { [n, n] };
+        let a = make(1);
+        a[0] = 5;
+        make(1)
+        """
+
+        self.assertEqual([1, 1], [e.value for e in self.eval(test)])
+
+        memo = Memo()
+        memo.put("a", Array([]))
+        memo.put("b", Integer(1))
+        self.assertIs(MISSING, memo.get("a"))
+        self.assertEqual(1, memo.get("b").value)
+
+    def test_memo_builtin_does_not_cache_mutable_results(self):
+        tests = [
+            "let f = memo(fn(n) { [n, 1] }); let a = f(5); a[0] = 99; f(5)",
+            "let f = memo(fn(n) { [n, 1] }); append!(f(5), 2); f(5)",
+            "let f = memo(fn(n) { [n, 1] }); pop!(f(5)); pop!(f(5)); f(5)",
+        ]
+
+        for tt in tests:
+            evaluated = self.eval(tt)
+            self.assertEqual([5, 1], [e.value for e in evaluated], tt)
+
+        evaluated = self.eval(
+            'let f = memo(fn(k) { {k: 1} }); let h = f("a"); '
+            'h["a"] = 2; f("a")["a"]'
+        )
+        self.assertEqual(1, evaluated.value)
+
+    def test_lru_eviction(self):
+        memo = Memo(maxsize=2)
+        memo.put("a", Integer(1))
+        memo.put("b", Integer(2))
+        self.assertEqual(1, memo.get("a").value)
+
+        memo.put("c", Integer(3))
+        self.assertIs(MISSING, memo.get("b"))
+        self.assertEqual(1, memo.get("a").value)
+        self.assertEqual(3, memo.get("c").value)
+        self.assertEqual((3, 1), (memo.hits, memo.misses))
+
+    @staticmethod
+    def eval(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        return evaluate(program, Environment())
@@ -1,6 +1,13 @@
 import unittest
+from operator import add
 
-from object.object import String, Boolean, Integer
+from object import object as runtime
+from object.object import String, Boolean, Integer, Array, Sequence, NULL
+from object.object import IntArray
+from object import numeric
+from object.object import cache_small_ints, new_integer
+from object.hamt import PersistentHashMap, map_from_dict
+from object.vector import PersistentVector, vector_from_list
 
 
 class TestObject(unittest.TestCase):
@@ -34,6 +41,303 @@ class TestObject(unittest.TestCase):
         self.assertEqual(two1.hash_key(), two2.hash_key())
         self.assertNotEqual(one1.hash_key(), two1.hash_key())
 
+    def test_hash_key_caching(self):
+        hello = String("Hello World")
+
+        self.assertIs(hello.hash_key(), hello.hash_key())
+        self.assertIs(Integer(7).hash_key(), Integer(7).hash_key())
+
+        big1 = Integer(10**6).hash_key()
+        big2 = Integer(10**6).hash_key()
+        self.assertEqual(big1, big2)
+        self.assertEqual(hash(big1), hash(big2))
+
+    def test_hash_key_distinct_values(self):
+        self.assertNotEqual(Integer(-1).hash_key(), Integer(-2).hash_key())
+        self.assertNotEqual(Integer(1).hash_key(), String("1").hash_key())
+        self.assertNotEqual(Integer(1).hash_key(), Boolean(True).hash_key())
+        self.assertNotEqual(Integer(1).hash_key(), 1)
+
+
+class TestSmallInts(unittest.TestCase):
+    def tearDown(self):
+        cache_small_ints()
+
+    def test_new_integer(self):
+        self.assertIs(new_integer(-5), new_integer(-5))
+        self.assertIs(new_integer(1024), new_integer(1024))
+        self.assertIsNot(new_integer(1025), new_integer(1025))
+        self.assertEqual(1025, new_integer(1025).value)
+        self.assertEqual("2.0", str(new_integer(2.0)))
+
+    def test_cache_small_ints(self):
+        cache_small_ints(0, 10)
+
+        self.assertIs(new_integer(10), new_integer(10))
+        self.assertIsNot(new_integer(-1), new_integer(-1))
+        self.assertIs(Integer(10).hash_key(), Integer(10).hash_key())
+
+    def test_runtime_objects_use_slots(self):
+        for obj in vars(runtime).values():
+            if isinstance(obj, type) and obj.__module__ == runtime.__name__:
+                if obj is not runtime.ObjectType:
+                    self.assertIn("__slots__", vars(obj), obj.__name__)
+
+        self.assertFalse(hasattr(Integer(1), "__dict__"))
+        self.assertFalse(hasattr(String("a"), "__dict__"))
+
+
+class TestPersistentVector(unittest.TestCase):
+    def test_push_and_get(self):
+        for size in [0, 1, 32, 33, 1056, 1057, 33825]:
+            vector = PersistentVector()
+            for i in range(size):
+                vector = vector.push(i)
+
+            self.assertEqual(size, len(vector))
+            self.assertEqual(list(range(size)), list(vector))
+            for i in [0, size // 2, size - 1]:
+                if 0 <= i < size:
+                    self.assertEqual(i, vector.get(i))
+
+    def test_vector_from_list(self):
+        for size in [0, 31, 32, 33, 1056, 1057, 2000]:
+            vector = vector_from_list(list(range(size)))
+            pushed = vector.push(size)
+
+            self.assertEqual(list(range(size)), list(vector))
+            self.assertEqual(list(range(size + 1)), list(pushed))
+
+    def test_structural_sharing(self):
+        base = vector_from_list(list(range(100)))
+        left = base.push("left")
+        right = base.push("right")
+
+        self.assertEqual(100, len(base))
+        self.assertEqual("left", left.get(100))
+        self.assertEqual("right", right.get(100))
+        self.assertIs(left.root, right.root)
+
+    def test_set_and_pop(self):
+        for size in [1, 32, 33, 1056, 1057, 2000]:
+            base = vector_from_list(list(range(size)))
+            vector = base
+            for i in range(0, size, 7):
+                vector = vector.set(i, -i)
+
+            expected = [-i if i % 7 == 0 else i for i in range(size)]
+            self.assertEqual(expected, list(vector))
+            self.assertEqual(list(range(size)), list(base))
+
+            popped = vector
+            for _ in range(size):
+                popped = popped.pop()
+                expected.pop()
+                self.assertEqual(len(expected), len(popped))
+            self.assertEqual([], list(popped))
+            self.assertEqual([0], list(popped.push(0)))
+
+
+class TestArray(unittest.TestCase):
+    def test_first_last_rest(self):
+        arr = Array([Integer(1), Integer(2), Integer(3)])
+        rest = arr.rest()
+
+        self.assertEqual(1, arr.first().value)
+        self.assertEqual(3, arr.last().value)
+        self.assertEqual(2, len(rest))
+        self.assertEqual(2, rest.first().value)
+        self.assertEqual(3, rest.get(1).value)
+        self.assertIs(arr.vector, rest.vector)
+        self.assertEqual("[2, 3]", str(rest))
+
+    def test_empty(self):
+        arr = Array([])
+
+        self.assertEqual(0, len(arr))
+        self.assertIs(NULL, arr.first())
+        self.assertIs(NULL, arr.last())
+        self.assertIs(NULL, arr.rest())
+
+    def test_push_does_not_mutate(self):
+        arr = Array([Integer(1)])
+        pushed = arr.rest().push(Integer(2))
+
+        self.assertEqual("[1]", str(arr))
+        self.assertEqual("[2]", str(pushed))
+        self.assertEqual(2, pushed.last().value)
+
+    def test_assign_append_pop(self):
+        arr = Array([Integer(1), Integer(2), Integer(3)])
+        pushed = arr.push(Integer(4))
+        rest = arr.rest()
+
+        arr.assign(0, Integer(10))
+        arr.append(Integer(5))
+        rest.assign(0, Integer(20))
+
+        self.assertEqual("[10, 2, 3, 5]", str(arr))
+        self.assertEqual("[20, 3]", str(rest))
+        self.assertEqual("[1, 2, 3, 4]", str(pushed))
+        self.assertEqual(5, arr.pop().value)
+        self.assertEqual(3, arr.pop().value)
+        self.assertEqual("[10, 2]", str(arr))
+        self.assertIs(NULL, Array([]).pop())
+
+
+class TestSequence(unittest.TestCase):
+    def test_iterates_lazily_and_repeatably(self):
+        pulled = []
+
+        def source():
+            for i in range(3):
+                pulled.append(i)
+                yield i
+
+        seq = Sequence(source)
+        self.assertEqual([], pulled)
+        self.assertEqual(1, seq.get(1))
+        self.assertEqual([0, 1], pulled)
+        self.assertEqual([0, 1, 2], list(seq))
+        self.assertEqual([0, 1, 2], list(seq))
+        self.assertEqual(3, len(seq))
+
+    def test_get_and_first(self):
+        values = range(10, 20)
+        seq = Sequence(values.__iter__, len(values), values.__getitem__)
+
+        self.assertEqual(10, seq.first())
+        self.assertEqual(15, seq.get(5))
+        self.assertIsNone(seq.get(10))
+        self.assertIs(NULL, seq.get(-1, NULL))
+        self.assertIs(NULL, Sequence(lambda: iter(())).first(NULL))
+
+
+class TestIntArray(unittest.TestCase):
+    def test_compact_storage(self):
+        arr = IntArray(numeric.from_values(range(1000)))
+
+        self.assertEqual(1000, len(arr))
+        self.assertEqual(999, arr.get(999))
+        self.assertIs(int, type(arr.get(0)))
+        self.assertEqual(8, arr.data.itemsize)
+        self.assertEqual("int_array([1, 2])", str(IntArray([1, 2])))
+
+    def test_numeric_operations(self):
+        data = numeric.from_values([1, 2, 3])
+
+        self.assertEqual(6, numeric.total(data))
+        self.assertEqual(14, numeric.dot(data, data))
+        self.assertEqual([2, 4, 6], list(numeric.elementwise(add, data, data)))
+        self.assertEqual([3, 4, 5], list(numeric.broadcast(add, data, 2)))
+        self.assertEqual([2, 3], list(numeric.select_greater(data, 1)))
+
+    def test_numeric_overflow(self):
+        big = numeric.from_values([numeric.INT64_MAX, 1])
+        ones = numeric.from_values([1, 1])
+
+        self.assertEqual(numeric.INT64_MAX + 1, numeric.total(big))
+        self.assertEqual(numeric.INT64_MAX + 1, numeric.dot(big, ones))
+        with self.assertRaises(OverflowError):
+            numeric.elementwise(add, big, big)
+        with self.assertRaises(OverflowError):
+            numeric.broadcast(add, big, 1)
+
+
+class TestString(unittest.TestCase):
+    def test_short_concat_stays_flat(self):
+        joined = String("ab").concat(String("cd"))
+
+        self.assertEqual("abcd", joined.flat)
+        self.assertIs(joined, joined.concat(String("")))
+
+    def test_rope_flattens_lazily(self):
+        line = String("x" * 40)
+        rope = String("")
+        for _ in range(100000):
+            rope = rope.concat(line)
+
+        self.assertIsNone(rope.flat)
+        self.assertEqual(4000000, len(rope))
+        self.assertEqual("x" * 4000000, rope.value)
+        self.assertIsNone(rope.left)
+
+    def test_rope_hash_key(self):
+        left = String("a" * 50)
+        right = String("b" * 50)
+        rope = left.concat(right)
+
+        flat = String(left.value + right.value)
+
+        self.assertEqual(flat.hash_key(), rope.hash_key())
+        self.assertEqual(flat.value, str(rope))
+
+
+class CollidingKey:
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return isinstance(other, CollidingKey) and other.value == self.value
+
+    def __hash__(self):
+        return 42
+
+
+class TestPersistentHashMap(unittest.TestCase):
+    def test_set_get_delete(self):
+        hash_map = PersistentHashMap()
+        for i in range(5000):
+            hash_map = hash_map.set(i, i * 2)
+
+        self.assertEqual(5000, len(hash_map))
+        self.assertEqual(84, hash_map.get(42))
+        self.assertIsNone(hash_map.get(5000))
+
+        for i in range(0, 5000, 2):
+            hash_map = hash_map.delete(i)
+
+        self.assertEqual(2500, len(hash_map))
+        self.assertIsNone(hash_map.get(42))
+        self.assertEqual(86, hash_map.get(43))
+        self.assertEqual(list(range(1, 5000, 2)), list(hash_map))
+
+    def test_insertion_order(self):
+        hash_map = map_from_dict({"b": 1, "a": 2, "c": 3})
+        hash_map = hash_map.set("a", 4).delete("b").set("d", 5)
+
+        self.assertEqual(
+            [("a", 4), ("c", 3), ("d", 5)], list(hash_map.items())
+        )
+        self.assertIs(hash_map.items(), hash_map.items())
+
+    def test_collisions(self):
+        keys = [CollidingKey(i) for i in range(3)]
+        hash_map = PersistentHashMap()
+        for key in keys:
+            hash_map = hash_map.set(key, key.value)
+        hash_map = hash_map.set(7, "seven")
+
+        self.assertEqual(4, len(hash_map))
+        self.assertEqual(1, hash_map.get(CollidingKey(1)))
+        self.assertEqual("seven", hash_map.get(7))
+
+        hash_map = hash_map.delete(CollidingKey(1))
+        self.assertEqual(3, len(hash_map))
+        self.assertIsNone(hash_map.get(CollidingKey(1)))
+        self.assertEqual(2, hash_map.get(CollidingKey(2)))
+
+    def test_structural_sharing(self):
+        base = map_from_dict({i: i for i in range(100)})
+        updated = base.set(1, "one")
+        deleted = base.delete(2)
+
+        self.assertEqual(1, base.get(1))
+        self.assertEqual(2, base.get(2))
+        self.assertEqual("one", updated.get(1))
+        self.assertIsNone(deleted.get(2))
+        self.assertIs(base, base.delete(1000))
+
 
 if __name__ == "__main__":
     unittest.main()
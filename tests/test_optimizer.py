@@ -0,0 +1,88 @@
+import unittest
+
+from evaluator.nodevisitor import evaluate
+from lexer.lexer import Lexer
+from object.environment import Environment
+from optimizer.optimizer import optimize
+from parser.parser import Parser
+
+
+class TestOptimizer(unittest.TestCase):
+    def test_constant_folding(self):
+        tests = [
+            ["60 * 60 * 24", "86400"],
+            ['"a" + "b"', "ab"],
+            ["-(3 - 5)", "2"],
+            ["!true", "false"],
+            ["1 < 2 == true", "true"],
+            ["x * (2 + 3)", "(x * 5)"],
+            ["1 + 2 + x", "(3 + x)"],
+            ["x + 1 + 2", "((x + 1) + 2)"],
+            ["10 / 4", "2.5"],
+            ["fn(x) { x + 2 * 3 }", "fn(x)(x + 6)"],
+            ["[1 + 1, {2 * 2: 3 - 3}][0]", "([2, {4: 0}][0])"],
+        ]
+
+        for tt in tests:
+            self.assertEqual(tt[1], str(self.optimize(tt[0])))
+
+    def test_does_not_fold_errors(self):
+        tests = [
+            ["5 + true", "(5 + true)"],
+            ['"a" - "b"', "(a - b)"],
+            ["1 / 0", "(1 / 0)"],
+            ["-true", "(-true)"],
+        ]
+
+        for tt in tests:
+            self.assertEqual(tt[1], str(self.optimize(tt[0])))
+
+    def test_prune_constant_branches(self):
+        tests = [
+            ["if (1 < 2) { a } else { b }", "a"],
+            ["if (false) { a } else { b }; c", "bc"],
+            ["if (false) { a }; c", "c"],
+            ["if (false) { a }", "if false { a }"],
+            ["if (true) { }", "if true {  }"],
+            ["if (true) { a } else { b }", "a"],
+            ["let x = if (true) { a } else { b };", "let x = if true { a };"],
+            ["if (x) { a } else { b }", "if x { a } else { b }"],
+        ]
+
+        for tt in tests:
+            self.assertEqual(tt[1], str(self.optimize(tt[0])))
+
+    def test_drop_unreachable_statements(self):
+        tests = [
+            ["return 1; a; b", "return 1;"],
+            ["fn() { a; return b; c }", "fn()areturn b;"],
+            ["fn() { if (true) { return a; }; b }", "fn()return a;"],
+            ["fn() { if (x) { return a; }; b }", "fn()if x { return a; }b"],
+        ]
+
+        for tt in tests:
+            self.assertEqual(tt[1], str(self.optimize(tt[0])))
+
+    def test_optimized_programs_evaluate_the_same(self):
+        tests = [
+            "let f = fn(x) { x * (60 * 60 * 24) }; f(2)",
+            "let f = fn() { if (true) { let x = 4 }; x }; f()",
+            "let f = fn() { return 1; puts(2); 3 }; f()",
+            "let f = fn() { 5; if (true) { }; }; f()",
+            'let f = fn() { if ("s") { 7 } else { 8 } }; f()',
+            "let x = if (true) { return 5 }; x",
+        ]
+
+        for tt in tests:
+            expected = evaluate(self.parse(tt), Environment())
+            actual = evaluate(optimize(self.parse(tt)), Environment())
+            self.assertEqual(str(expected), str(actual))
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+    def optimize(self, input):
+        return optimize(self.parse(input))
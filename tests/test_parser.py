@@ -9,7 +9,9 @@ from ast.ast import (
     StringLiteral,
     ArrayLiteral,
     IndexExpression,
+    IndexAssignment,
     HashLiteral,
+    ForExpression,
 )
 from lexer.lexer import Lexer
 from parser.parser import Parser
@@ -262,6 +264,28 @@ class TestParser(unittest.TestCase):
         consequence = exp.consequence.statements[0]
         self.assert_identifier("x", consequence.expression)
 
+    def test_for_expression(self):
+        lexer = Lexer("for (x in range(3)) { x }")
+        parser = Parser(lexer)
+        program = parser.parse_program()
+
+        self.assert_parser_errors(parser)
+        self.assertEqual(1, len(program.statements))
+
+        exp = program.statements[0].expression
+        self.assertIsInstance(exp, ForExpression)
+        self.assert_identifier("x", exp.name)
+        self.assertEqual("range(3)", str(exp.iterable))
+        self.assertEqual(1, len(exp.body.statements))
+
+        body = exp.body.statements[0]
+        self.assert_identifier("x", body.expression)
+
+        for source in ["for x in y { x }", "for (x y) { x }"]:
+            parser = Parser(Lexer(source))
+            parser.parse_program()
+            self.assertTrue(parser.errors)
+
     def test_function_literal_parsing(self):
         lexer = Lexer("fn(x, y) { x + y; }")
         parser = Parser(lexer)
@@ -362,6 +386,45 @@ class TestParser(unittest.TestCase):
         self.assert_identifier("myArray", index_exp.left)
         self.assert_infix_expression(1, "+", 1, index_exp.index)
 
+    def test_parsing_index_assignment(self):
+        tests = [
+            ["a[0] = 1", "a[0] = 1"],
+            ["a[i + 1] = b[i] * 2", "a[(i + 1)] = ((b[i]) * 2)"],
+            ["a[0] = b[1] = 2", "a[0] = b[1] = 2"],
+            ["h[\"k\"] = x == y", "h[k] = (x == y)"],
+        ]
+
+        for source, expected in tests:
+            parser = Parser(Lexer(source))
+            program = parser.parse_program()
+
+            self.assert_parser_errors(parser)
+            self.assertIsInstance(
+                program.statements[0].expression, IndexAssignment
+            )
+            self.assertEqual(expected, str(program))
+
+    def test_invalid_assignment_target(self):
+        parser = Parser(Lexer("x = 1"))
+        parser.parse_program()
+
+        self.assertIn("Cannot assign to 'x'", parser.errors)
+
+    def test_error_messages(self):
+        tests = [
+            ["let = 5;", "Expected 'IDENT', got '='"],
+            ["let x 5;", "Expected '=', got 'INT'"],
+            ["fn(x { x }", "Expected ')', got '{'"],
+            ["}", "No prefix parse function for '}' found"],
+            ["let x = @;", "No prefix parse function for 'ILLEGAL' found"],
+        ]
+
+        for source, expected in tests:
+            parser = Parser(Lexer(source))
+            parser.parse_program()
+
+            self.assertEqual(expected, parser.errors[0])
+
     def test_parsing_empty_hash_literal(self):
         lexer = Lexer("{}")
         parser = Parser(lexer)
@@ -0,0 +1,129 @@
+import unittest
+
+from evaluator.nodevisitor import evaluate
+from lexer.lexer import Lexer
+from object.environment import Environment
+from parser.parser import Parser
+from resolver.resolver import Resolver, SymbolScope
+
+
+class TestResolver(unittest.TestCase):
+    def test_resolve_function_slots(self):
+        program = self.resolve("fn(a, b) { let c = a + b; c }")
+        literal = program.statements[0].expression
+        let, expression = literal.body.statements
+
+        self.assertEqual(3, literal.frame_size)
+        self.assertEqual(SymbolScope.LOCAL, let.scope)
+        self.assertEqual(2, let.slot)
+
+        a, b = let.value.left, let.value.right
+        self.assertEqual((SymbolScope.LOCAL, 0), (a.scope, a.slot))
+        self.assertEqual((SymbolScope.LOCAL, 1), (b.scope, b.slot))
+
+        c = expression.expression
+        self.assertEqual((SymbolScope.LOCAL, 2), (c.scope, c.slot))
+
+    def test_resolve_free_variables(self):
+        program = self.resolve("fn(x) { fn(y) { fn() { x + y } } }")
+        outer = program.statements[0].expression
+        middle = outer.body.statements[0].expression
+        inner = middle.body.statements[0].expression
+        infix = inner.body.statements[0].expression
+
+        x, y = infix.left, infix.right
+        self.assertEqual((SymbolScope.FREE, 2, 0), (x.scope, x.depth, x.slot))
+        self.assertEqual((SymbolScope.FREE, 1, 0), (y.scope, y.depth, y.slot))
+        self.assertEqual(0, inner.frame_size)
+
+    def test_resolve_globals_and_builtins(self):
+        program = self.resolve("let a = 1; a; len; let len = 2; b")
+        let, a, length, _, b = program.statements
+
+        self.assertEqual(SymbolScope.GLOBAL, let.scope)
+        self.assertEqual(SymbolScope.GLOBAL, a.expression.scope)
+        self.assertEqual(SymbolScope.GLOBAL, length.expression.scope)
+        self.assertEqual(SymbolScope.GLOBAL, b.expression.scope)
+
+        program = self.resolve("len; puts")
+        for stmt in program.statements:
+            self.assertEqual(SymbolScope.BUILTIN, stmt.expression.scope)
+
+    def test_resolve_fallbacks(self):
+        program = self.resolve("fn(x) { fn() { let x = x; x } }")
+        outer = program.statements[0].expression
+        inner = outer.body.statements[0].expression
+        let = inner.body.statements[0]
+
+        self.assertEqual((SymbolScope.LOCAL, 0), (let.value.scope, let.slot))
+        self.assertEqual(((1, 0),), let.value.fallbacks)
+
+    def test_mark_tail_calls(self):
+        program = self.resolve(
+            "fn(n) { f(n); if (n) { return g(n) } else { h(n) }; k(n) + 1 }"
+        )
+        literal = program.statements[0].expression
+        first, branch, last = literal.body.statements
+
+        self.assertFalse(first.expression.tail)
+        returned = branch.expression.consequence.statements[0].return_value
+        self.assertTrue(returned.tail)
+        call = branch.expression.alternative.statements[0].expression
+        self.assertFalse(call.tail)
+        self.assertFalse(last.expression.left.tail)
+        self.assertFalse(literal.has_closures)
+
+        program = self.resolve("fn(n) { if (n) { f(n) } else { g(n) } }")
+        literal = program.statements[0].expression
+        expression = literal.body.statements[0].expression
+        self.assertTrue(expression.consequence.statements[0].expression.tail)
+        self.assertTrue(expression.alternative.statements[0].expression.tail)
+
+        program = self.resolve("f(1); fn() { while (true) { return f() } }")
+        self.assertFalse(program.statements[0].expression.tail)
+        literal = program.statements[1].expression
+        loop = literal.body.statements[0].expression
+        self.assertFalse(loop.consequence.statements[0].return_value.tail)
+
+        program = self.resolve("fn() { fn() { 1 } }")
+        self.assertTrue(program.statements[0].expression.has_closures)
+
+    def test_mark_tail_returns(self):
+        program = self.resolve(
+            "fn(n) { if (n) { return 1; }; if (n) { return 2 } else { 3 } }"
+        )
+        literal = program.statements[0].expression
+        early, last = literal.body.statements
+
+        self.assertFalse(early.expression.consequence.statements[0].tail)
+        self.assertTrue(last.expression.consequence.statements[0].tail)
+
+        program = self.resolve("return 1; fn() { while (true) { return 2 } }")
+        self.assertFalse(program.statements[0].tail)
+        loop = program.statements[1].expression.body.statements[0]
+        self.assertFalse(loop.expression.consequence.statements[0].tail)
+
+    def test_eval_shadowed_bindings(self):
+        tests = [
+            ["let x = 1; let f = fn() { let x = x + 1; x }; f()", 2],
+            ["let f = fn(x) { fn() { let x = x * 2; x } }; f(3)()", 6],
+            [
+                "let x = 5; let f = fn() { if (false) { let x = 1; } x }; f()",
+                5,
+            ],
+            ["let f = fn(n) { fn(m) { n * m } }; f(2)(3) + f(4)(5)", 26],
+        ]
+
+        for tt in tests:
+            lexer = Lexer(tt[0])
+            parser = Parser(lexer)
+            program = parser.parse_program()
+            evaluated = evaluate(program, Environment())
+            self.assertEqual(tt[1], evaluated.value)
+
+    @staticmethod
+    def resolve(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        return Resolver().resolve(program)
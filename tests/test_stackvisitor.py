@@ -0,0 +1,101 @@
+import unittest
+
+import test_evaluator
+from evaluator.stackvisitor import evaluate
+from lexer.lexer import Lexer
+from object.environment import Environment
+from object.object import Error
+from parser.parser import Parser
+
+
+class TestStackVisitor(test_evaluator.TestEvaluator):
+    def test_deep_recursion(self):
+        tests = [
+            [
+                "let count = fn(n) {"
+                "  if (n == 0) { 0 } else { 1 + count(n - 1) }"
+                "};"
+                "count(20000)",
+                20000,
+            ],
+            [
+                "let build = fn(n, acc) {"
+                "  if (n == 0) { acc } else { build(n - 1, push(acc, n)) }"
+                "};"
+                "let sum = fn(arr) {"
+                "  if (len(arr) == 0) { 0 }"
+                "  else { first(arr) + sum(rest(arr)) }"
+                "};"
+                "sum(build(2000, []))",
+                2001000,
+            ],
+        ]
+
+        for tt in tests:
+            self.assert_integer_object(tt[1], self.eval(tt[0]))
+
+    def test_max_depth(self):
+        test = "let f = fn(n) { if (n == 0) { 0 } else { f(n - 1) } }; f(50)"
+        program = Parser(Lexer(test)).parse_program()
+
+        evaluated = evaluate(program, Environment(), max_depth=10)
+        self.assertIsInstance(evaluated, Error)
+        self.assertEqual("maximum call depth exceeded: 10", evaluated.message)
+
+        evaluated = evaluate(program, Environment(), max_depth=51)
+        self.assert_integer_object(0, evaluated)
+
+    def test_recursion_through_callbacks(self):
+        test = """
+        let f = fn(n) {
+            if (n == 0) { 0 }
+            else { reduce([n], 1, fn(a, x) { a + f(x - 1) }) }
+        };
+        f(%d)
+        """
+        program = Parser(Lexer(test % 50)).parse_program()
+
+        self.assert_integer_object(50, self.eval(test % 50))
+
+        evaluated = evaluate(program, Environment(), max_depth=10)
+        self.assertIsInstance(evaluated, Error)
+        self.assertEqual("maximum call depth exceeded: 10", evaluated.message)
+
+        evaluated = self.eval(test % 5000)
+        self.assertIsInstance(evaluated, Error)
+        self.assertTrue(
+            evaluated.message.startswith("maximum callback depth exceeded")
+        )
+
+    def test_memoize_flag(self):
+        test = "let f = fn(n) { n }; f(1); f(1); f"
+        program = Parser(Lexer(test)).parse_program()
+
+        fn = evaluate(program, Environment(), memoize=False)
+        self.assertIsNone(fn.memo)
+
+        fn = evaluate(program, Environment())
+        self.assertEqual((1, 1), (fn.memo.hits, fn.memo.misses))
+
+    def test_return_inside_while_ends_iteration(self):
+        test = """
+        let f = fn() {
+            let i = 0;
+            while (i < 3) { let i = i + 1; return i; };
+            i
+        };
+        f();
+        """
+
+        self.assert_integer_object(3, self.eval(test))
+
+    @staticmethod
+    def eval(test_input):
+        lexer = Lexer(test_input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        return evaluate(program, Environment())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,101 @@
+import unittest
+
+import test_evaluator
+from evaluator.nodevisitor import evaluate
+from evaluator.tiering import CALL_THRESHOLD, Tiering
+from lexer.lexer import Lexer
+from object.environment import Environment
+from parser.parser import Parser
+
+
+class TestTiering(test_evaluator.TestEvaluator):
+    def test_promote_hot_functions(self):
+        tiering = Tiering(call_threshold=3, loop_threshold=1000)
+        program = self.parse(
+            "let double = fn(x) { x * 2 }; double(1); double(2); double(3)"
+        )
+        literal = program.statements[0].value
+
+        evaluated = evaluate(program, Environment(), tiering)
+        self.assert_integer_object(6, evaluated)
+        self.assertIsNotNone(literal.compiled)
+        self.assertEqual(
+            {"functions": [{"name": "double", "calls": 3}], "loops": []},
+            tiering.stats(),
+        )
+
+    def test_cold_functions_stay_interpreted(self):
+        tiering = Tiering(call_threshold=3, loop_threshold=1000)
+        program = self.parse("let f = fn(x) { x }; f(1); f(2)")
+        literal = program.statements[0].value
+
+        evaluate(program, Environment(), tiering)
+        self.assertIsNone(literal.compiled)
+        self.assertEqual([], tiering.stats()["functions"])
+
+    def test_promote_hot_loops(self):
+        tiering = Tiering(call_threshold=1000, loop_threshold=10)
+        program = self.parse(
+            "let i = 0; let s = 0;"
+            "while (i < 100) { let s = s + i; let i = i + 1 };"
+            "s"
+        )
+        loop = program.statements[2].expression
+
+        evaluated = evaluate(program, Environment(), tiering)
+        self.assert_integer_object(4950, evaluated)
+        self.assertEqual(10, loop.iterations)
+        self.assertEqual(
+            [{"condition": "(i < 100)", "iterations": 10}],
+            tiering.stats()["loops"],
+        )
+
+    def test_errors_and_tail_calls_after_promotion(self):
+        tests = [
+            ["let f = fn(x) { x + true }; f(1); f(2); f(3)", None],
+            [
+                "let iter = fn(n, acc) {"
+                "  if (n == 0) { acc } else { iter(n - 1, acc + 1) }"
+                "};"
+                "iter(3000, 0)",
+                3000,
+            ],
+        ]
+
+        for tt in tests:
+            tiering = Tiering(call_threshold=2, loop_threshold=2)
+            evaluated = evaluate(self.parse(tt[0]), Environment(), tiering)
+            if tt[1] is None:
+                self.assertEqual(
+                    "type mismatch: INTEGER + BOOLEAN", evaluated.message
+                )
+            else:
+                self.assert_integer_object(tt[1], evaluated)
+
+    def test_nested_return_after_promotion(self):
+        program = self.parse(
+            "let f = fn(c) { let x = if (c) { return 3 } else { 1 }; 4 };"
+            "let results = []; let i = 0;"
+            f"while (i < {CALL_THRESHOLD + 10}) {{"
+            "  append!(results, f(true)); let i = i + 1"
+            "};"
+            "[first(results), last(results)]"
+        )
+
+        evaluated = evaluate(program, Environment(), Tiering(), False)
+        self.assertEqual([3, 3], [e.value for e in evaluated.elements])
+
+    @staticmethod
+    def parse(input):
+        lexer = Lexer(input)
+        parser = Parser(lexer)
+        return parser.parse_program()
+
+    @staticmethod
+    def eval(test_input):
+        tiering = Tiering(call_threshold=1, loop_threshold=1)
+        return evaluate(TestTiering.parse(test_input), Environment(), tiering)
+
+
+if __name__ == "__main__":
+    unittest.main()
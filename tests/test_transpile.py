@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import test_evaluator
+from lexer.lexer import Lexer
+from object.environment import Environment
+from object.object import Integer
+from parser.parser import Parser
+from transpile.transpile import CodeCache, transpile
+
+
+class TestTranspile(test_evaluator.TestEvaluator):
+    def test_transpile_produces_python_source(self):
+        program = Parser(Lexer("let x = 1 + 2; x")).parse_program()
+        source = transpile(program)
+
+        self.assertIn("def main(env):", source)
+        self.assertIn("store['x'] = ", source)
+        compile(source, "<test>", "exec")
+
+    def test_same_source_reuses_compiled_script(self):
+        cache = CodeCache()
+
+        first = cache.load("let a = 5; a * 2")
+        second = cache.load("let a = 5; a * 2")
+
+        self.assertIs(first, second)
+        actual = cache.run("let a = 5; a * 2", Environment())
+        self.assert_integer_object(10, actual)
+
+    def test_cache_dir_round_trip(self):
+        source = "let f = fn(x) { x * x }; f(9)"
+
+        with tempfile.TemporaryDirectory() as cache_dir:
+            CodeCache(cache_dir).load(source)
+            self.assertEqual(1, len(os.listdir(cache_dir)))
+
+            cache = CodeCache(cache_dir)
+            key = os.listdir(cache_dir)[0].split(".")[0]
+            self.assertIsNotNone(cache.read(key))
+
+            actual = cache.run(source, Environment())
+            self.assertIsInstance(actual, Integer)
+            self.assertEqual(81, actual.value)
+
+    def test_parser_errors_are_reported(self):
+        cache = CodeCache()
+
+        self.assertIsNone(cache.load("let = 5;"))
+        self.assertNotEqual([], cache.errors)
+
+    def test_closures_share_environment(self):
+        test = """
+        let x = 1;
+        let f = fn() { x };
+        let x = 2;
+        f();
+        """
+
+        self.assert_integer_object(2, self.eval(test))
+
+    @staticmethod
+    def eval(test_input):
+        return CodeCache().run(test_input, Environment())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+
+import test_evaluator
+from evaluator.unboxed import NOTHING, UnboxedCompiler, evaluate
+from lexer.lexer import Lexer
+from object.environment import Environment
+from object.object import Array, Error, Hash, String, TRUE, Integer
+from parser.parser import Parser
+
+
+class TestUnboxed(test_evaluator.TestEvaluator):
+    def test_array_literals(self):
+        evaluated = self.eval("[1, 2 * 2, 3 + 3, true, if (false) { 1 }]")
+
+        self.assertIsInstance(evaluated, Array)
+        self.assertEqual([1, 4, 6, True, None], evaluated.elements)
+        self.assertEqual("[1, 4, 6, true, null]", str(evaluated))
+
+    def test_hash_literals(self):
+        test = '{"one": 10 - 9, "thr" + "ee": 6 / 2, 4: 4, true: 5}'
+        actual = self.eval(test)
+
+        self.assertIsInstance(actual, Hash)
+
+        expected = {
+            String("one").hash_key(): 1,
+            String("three").hash_key(): 3,
+            Integer(4).hash_key(): 4,
+            TRUE.hash_key(): 5,
+        }
+
+        self.assertEqual(len(expected), len(actual))
+        for expected_key, expected_value in expected.items():
+            self.assertEqual(expected_value, actual.pairs[expected_key].value)
+
+    def test_values_are_native(self):
+        tests = [
+            ["1 + 2", 3],
+            ['"a" + "b"', "ab"],
+            ["1 < 2", True],
+            ["!5", False],
+            ["if (false) { 1 }", None],
+            ["let x = 1;", NOTHING],
+            ["[1, 2][1]", 2],
+            ['{"a": 1}["b"]', None],
+            ["first([])", None],
+            ["10 / 4", 2.5],
+            ["range(3, 9)[2]", 5],
+            ["first(range(0))", None],
+            ["reduce(range(4), 0, fn(a, x) { a + x })", 6],
+            ["sum([1, 2, 3])", 6],
+            ["any([false, 1])", True],
+            ["max([])", None],
+            ["vsum(int_array([1, 2, 3]))", 6],
+            ["int_array([4, 5])[1]", 5],
+            ['len("abc")', 3],
+            ['join([1, true, "a"], "-")', "1-true-a"],
+            ['keys(set({}, "a", 1))[0]', "a"],
+            ['values(delete({"a": 1, 2: 3}, "a"))[0]', 3],
+        ]
+
+        for tt in tests:
+            program = Parser(Lexer(tt[0])).parse_program()
+            actual = UnboxedCompiler().compile(program)(Environment())
+            self.assertIs(type(tt[1]), type(actual))
+            self.assertEqual(tt[1], actual)
+
+    def test_null_bindings_do_not_fall_back(self):
+        test = """
+        let x = 1;
+        let f = fn() { let x = if (false) { 2 }; x };
+        f();
+        """
+
+        self.assertEqual("null", str(self.eval(test)))
+
+    def test_builtin_errors(self):
+        tests = [
+            ["len(1)", "argument to 'len' not supported, got INTEGER"],
+            ["first(true)", "argument to 'first' must be ARRAY, got BOOLEAN"],
+            ["set({}, [], 1)", "unusable as hash key: ARRAY"],
+            ["join([], 1)", "separator to 'join' must be STRING, got INTEGER"],
+        ]
+
+        for tt in tests:
+            actual = self.eval(tt[0])
+            self.assertIsInstance(actual, Error)
+            self.assertEqual(tt[1], actual.message)
+
+    @staticmethod
+    def eval(test_input):
+        lexer = Lexer(test_input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        return evaluate(program, Environment())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,328 @@
+import io
+import unittest
+from contextlib import redirect_stdout
+
+from compiler.compiler import Compiler
+from lexer.lexer import Lexer
+from main import VMState, run_program
+from object.object import Integer, Boolean, String, Error, Array, Hash, NULL
+from parser.parser import Parser
+from vm.vm import VM
+
+
+class TestVM(unittest.TestCase):
+    def test_integer_arithmetic(self):
+        tests = [
+            ["1", 1],
+            ["1 + 2", 3],
+            ["-50 + 100 + -50", 0],
+            ["50 / 2 * 2 + 10", 60],
+            ["(5 + 10 * 2 + 15 / 3) * 2 + -10", 50],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_boolean_expressions(self):
+        tests = [
+            ["1 < 2", True],
+            ["1 > 2", False],
+            ["1 != 2", True],
+            ["true == false", False],
+            ["(1 < 2) == true", True],
+            ["!5", False],
+            ["!!true", True],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_conditionals(self):
+        tests = [
+            ["if (true) { 10 }", 10],
+            ["if (1 < 2) { 10 } else { 20 }", 10],
+            ["if (1 > 2) { 10 } else { 20 }", 20],
+            ["if (false) { 10 }", NULL],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_while_expressions(self):
+        tests = [
+            ["let x = 10; while (x > 0) { let x = x - 1; }; x;", 0],
+            [
+                """
+                let f = fn() {
+                    let i = 0;
+                    while (i < 10) {
+                        let i = i + 1;
+                        if (i == 5) { return i; }
+                    };
+                    i
+                };
+                f();
+                """,
+                10,
+            ],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_let_and_return_statements(self):
+        tests = [
+            ["let a = 5; let b = a; let c = a + b + 5; c", 15],
+            ["9; return 2 * 5; 9;", 10],
+            ["if (10 > 1) { if (10 > 1) { return 10; } return 1; }", 10],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_strings_arrays_and_hashes(self):
+        tests = [
+            ['"mon" + "key"', "monkey"],
+            ["[1, 2 * 2, 3 + 3]", [1, 4, 6]],
+            ["[1, 2, 3][1 + 1]", 3],
+            ["[1, 2, 3][3]", NULL],
+            ['{"one": 1, "two": 2}["two"]', 2],
+            ['{"one": 1}["two"]', NULL],
+            ["{true: 5}[true]", 5],
+        ]
+
+        self.run_vm_tests(tests)
+
+        hsh = self.run_vm('{"one": 10 - 9, 2: 1 + 1}')
+        self.assertIsInstance(hsh, Hash)
+        self.assertEqual(1, hsh.pairs[String("one").hash_key()].value.value)
+        self.assertEqual(2, hsh.pairs[Integer(2).hash_key()].value.value)
+
+    def test_functions_and_closures(self):
+        tests = [
+            ["let add = fn(x, y) { x + y; }; add(5 + 5, add(5, 5));", 20],
+            ["fn(x) { x; }(5)", 5],
+            ["let f = fn() { }; f()", None],
+            [
+                "let newAdder = fn(x) { fn(y) { x + y }; }; newAdder(2)(2);",
+                4,
+            ],
+            [
+                """
+                let counter = fn() {
+                    let c = 0;
+                    fn() { let c = c + 1; c }
+                };
+                let next = counter();
+                next();
+                next();
+                """,
+                1,
+            ],
+            [
+                """
+                let wrapper = fn() {
+                    let countDown = fn(x) {
+                        if (x == 0) { 0 } else { countDown(x - 1) }
+                    };
+                    countDown(1);
+                };
+                wrapper();
+                """,
+                0,
+            ],
+            ["fn() { let x = 1; let f = fn() { x }; let x = 2; f() }()", 2],
+            ["let x = 5; fn() { let x = x + 1; x }()", 6],
+            ["fn(a) { fn() { let a = a + 1; a }() }(10)", 11],
+            ["let len = fn(x) { 42 }; len([1])", 42],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_deep_recursion(self):
+        test = """
+        let count = fn(n) { if (n == 0) { 0 } else { 1 + count(n - 1) } };
+        count(5000);
+        """
+
+        self.assert_object(5000, self.run_vm(test))
+
+    def test_builtin_functions(self):
+        tests = [
+            ['len("four")', 4],
+            ["len([1, 2, 3])", 3],
+            ["first([1, 2, 3])", 1],
+            ["rest([1, 2, 3])", [2, 3]],
+            ["push([], 1)", [1]],
+            ["fn() { len([1, 2]) }()", 2],
+        ]
+
+        self.run_vm_tests(tests)
+
+    def test_builtin_callbacks(self):
+        tests = [
+            ["map([1, 2, 3], fn(x) { x * 2 })", [2, 4, 6]],
+            ["to_array(filter(range(6), fn(x) { x > 3 }))", [4, 5]],
+            ["let k = 10; reduce(range(4), 0, fn(a, x) { a + x * k })", 60],
+            [
+                "let sum = fn(n) { reduce(range(n), 0, fn(a, x) { a + x }) };"
+                "map([3, 4], sum)",
+                [3, 6],
+            ],
+            ["sort([3, 1, 2], fn(a, b) { b - a })", [3, 2, 1]],
+            ["max([[1], [1, 2]], len)", [1, 2]],
+        ]
+
+        self.run_vm_tests(tests)
+
+        actual = self.run_vm("to_array(map(range(3), fn(x) { x + y }))")
+        self.assertIsInstance(actual, Error)
+        self.assertEqual("identifier not found: y", actual.message)
+
+    def test_memo_builtin(self):
+        tests = [
+            ["let f = memo(fn(x) { x + 100 }); f(1) + f(1)", 202],
+            [
+                "let fib = memo(fn(n) {"
+                " if (n < 2) { n } else { fib(n - 1) + fib(n - 2) } });"
+                "fib(80)",
+                23416728348467685,
+            ],
+            ["let f = memo(fn(n) { [n] }); let a = f(1); a[0] = 9; f(1)", [1]],
+            ["map([2, 2], memo(fn(x) { x * 3 }))", [6, 6]],
+        ]
+
+        self.run_vm_tests(tests)
+
+        tests = [
+            ["memo(1)", "argument to 'memo' must be FUNCTION, got INTEGER"],
+            ["memo(len)", "argument to 'memo' must be FUNCTION, got BUILTIN"],
+            [
+                "memo(fn(x) { x })()",
+                "wrong number of arguments: want=1, got=0",
+            ],
+        ]
+
+        for tt in tests:
+            actual = self.run_vm(tt[0])
+            self.assertIsInstance(actual, Error)
+            self.assertEqual(tt[1], actual.message)
+
+    def test_index_assignment(self):
+        tests = [
+            ["let a = [1, 2, 3]; a[1] = 5; a", [1, 5, 3]],
+            ["let a = [1, 2]; let b = push(a, 3); a[0] = 9; b", [1, 2, 3]],
+            ['let h = {}; h["a"] = 1; h["a"] = h["a"] + 1; h["a"]', 2],
+            ["let xs = []; append!(xs, 1); append!(xs, 2); pop!(xs)", 2],
+        ]
+
+        self.run_vm_tests(tests)
+
+        actual = self.run_vm("let a = [1]; a[1] = 2")
+        self.assertIsInstance(actual, Error)
+        self.assertEqual("index out of range: 1", actual.message)
+
+    def test_for_expressions(self):
+        tests = [
+            ["let s = 0; for (x in [1, 2, 3]) { let s = s + x }; s", 6],
+            [
+                "let f = fn(n) { let s = 0; for (i in range(n)) {"
+                "for (j in range(i)) { let s = s + j } }; s }; f(10)",
+                120,
+            ],
+            [
+                "let fs = []; for (x in [1, 2]) { append!(fs, fn() { x }) };"
+                "fs[0]()",
+                2,
+            ],
+            ["let f = fn() { for (x in [1]) { return 2 }; 3 }; f()", 3],
+            [
+                "let f = fn() { let s = 0; for (x in [1, 2, 3]) {"
+                "let s = s + if (x == 2) { return 5 } else { x } }; s };"
+                "f()",
+                4,
+            ],
+            [
+                "let i = 0;"
+                "let f = fn() { [10, while (i < 3) { let i = i + 1;"
+                "[i, if (i == 2) { return 5 } else { i }] }][0] };"
+                "f()",
+                10,
+            ],
+        ]
+
+        self.run_vm_tests(tests)
+
+        actual = self.run_vm('for (x in map("ab", len)) { x }')
+        self.assertIsInstance(actual, Error)
+        self.assertEqual(
+            "argument to 'map' must be ARRAY or SEQUENCE, got STRING",
+            actual.message,
+        )
+
+    def test_error_handling(self):
+        tests = [
+            ["5 + true;", "type mismatch: INTEGER + BOOLEAN"],
+            ["5 + true; 5;", "type mismatch: INTEGER + BOOLEAN"],
+            ["-true;", "unknown operator: -BOOLEAN"],
+            ["true + false;", "unknown operator: BOOLEAN + BOOLEAN"],
+            ["foobar", "identifier not found: foobar"],
+            ['"Hello" - "World"', "unknown operator: STRING - STRING"],
+            [
+                '{"name": "Monkey"}[fn(x) { x }];',
+                "unusable as hash key: FUNCTION",
+            ],
+            ["len(1)", "argument to 'len' not supported, got INTEGER"],
+            ["1(2)", "not a function: 1"],
+        ]
+
+        for tt in tests:
+            actual = self.run_vm(tt[0])
+            self.assertIsInstance(actual, Error)
+            self.assertEqual(tt[1], actual.message)
+
+    def test_repl_session(self):
+        tests = [
+            [["let f = fn(x) { x + 100 }", "f(1)"], "101"],
+            [["let s = \"a\"", "let g = fn() { s + \"b\" }", "g()"], "ab"],
+            [["let h = fn(y) { [y, 7] }", "h(3)"], "[3, 7]"],
+        ]
+
+        for lines, expected in tests:
+            env = VMState()
+            out = io.StringIO()
+            with redirect_stdout(out):
+                for line in lines:
+                    run_program(line, env, "vm")
+            self.assertEqual(expected, out.getvalue().splitlines()[-1])
+
+    def run_vm_tests(self, tests):
+        for tt in tests:
+            self.assert_object(tt[1], self.run_vm(tt[0]))
+
+    def assert_object(self, expected, actual):
+        if isinstance(expected, bool):
+            self.assertIsInstance(actual, Boolean)
+            self.assertEqual(expected, actual.value)
+        elif isinstance(expected, int):
+            self.assertIsInstance(actual, Integer)
+            self.assertEqual(expected, actual.value)
+        elif isinstance(expected, str):
+            self.assertIsInstance(actual, String)
+            self.assertEqual(expected, actual.value)
+        elif isinstance(expected, list):
+            self.assertIsInstance(actual, Array)
+            self.assertEqual(len(expected), len(actual.elements))
+            for exp, act in zip(expected, actual.elements):
+                self.assert_object(exp, act)
+        else:
+            self.assertIs(expected, actual)
+
+    @staticmethod
+    def run_vm(test_input):
+        lexer = Lexer(test_input)
+        parser = Parser(lexer)
+        program = parser.parse_program()
+        compiler = Compiler()
+        compiler.compile(program)
+        vm = VM(compiler.bytecode(), compiler.symbol_table)
+        return vm.run()
+
+
+if __name__ == "__main__":
+    unittest.main()